@@ -0,0 +1,46 @@
+"""
+Bytes per second and CPU per stream for each wire encoding.
+
+Pushes a speech-like test signal through StreamEncoder in capture-sized
+chunks and reports the wire bitrate and the CPU time spent per second of
+audio (percent of one core) for one stream.
+
+    python bench_codecs.py --seconds 30
+"""
+import argparse
+import time
+
+from capture import speech_like
+from wire_codecs import ENCODINGS, StreamEncoder
+
+RATE = 44100
+CHUNK = 1024
+
+
+def run(encoding, out_rate, chunks, seconds):
+    encoder = StreamEncoder(encoding, in_rate=RATE, out_rate=out_rate)
+    sent = 0
+    start = time.process_time()
+    for chunk in chunks:
+        sent += len(encoder.encode(chunk))
+    cpu = time.process_time() - start
+    return sent / seconds, 100 * cpu / seconds
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--seconds", type=float, default=30.0)
+    args = ap.parse_args()
+
+    samples = speech_like(args.seconds)
+    chunks = [samples[i:i + CHUNK].tobytes() for i in range(0, len(samples), CHUNK)]
+
+    print(f"{'encoding':10s} {'rate':>6s} {'bytes/s':>10s} {'kbit/s':>8s} {'CPU %/stream':>13s}")
+    for out_rate in (RATE, 16000, 8000):
+        for encoding in ENCODINGS:
+            bps, cpu = run(encoding, out_rate, chunks, args.seconds)
+            print(f"{encoding:10s} {out_rate:6d} {bps:10.0f} {bps * 8 / 1000:8.1f} {cpu:13.3f}")
+
+
+if __name__ == "__main__":
+    main()
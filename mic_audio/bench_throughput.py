@@ -0,0 +1,82 @@
+"""
+Throughput of the capture -> hub -> per-client encode pipeline.
+
+Runs the same path as /ws/audio (shared CaptureHub, one subscriber and
+StreamEncoder per client) in-process, fed by a file or synthetic source
+instead of a microphone, so it works on a headless box.
+
+  * fast mode: the source runs as fast as possible and the delivered
+    frames per second is the pipeline's ceiling.
+  * real-time mode: the source is paced like a microphone and CPU use
+    is turned into an estimate of clients per core.
+
+    python bench_throughput.py --clients 1 8 32 --encoding mulaw --rate 16000
+    python bench_throughput.py --source file:talk.wav
+"""
+import argparse
+import asyncio
+import time
+
+from capture import make_source
+from hub import CaptureHub, DROP_NEWEST, SubscriberClosed
+from wire_codecs import ENCODINGS, StreamEncoder
+
+
+async def client(hub, name, encoding, rate, counts):
+    sub = hub.subscribe(name, maxsize=64, policy=DROP_NEWEST, loop=asyncio.get_running_loop())
+    encoder = StreamEncoder(encoding, in_rate=hub.rate, out_rate=min(rate, hub.rate))
+    try:
+        while True:
+            frame = await sub.aget()
+            counts[0] += 1
+            counts[1] += len(encoder.encode(frame.data))
+    except (SubscriberClosed, asyncio.CancelledError):
+        pass
+    finally:
+        counts[2] += sub.dropped
+        hub.unsubscribe(sub)
+
+
+async def run(spec, clients, seconds, encoding, rate):
+    hub = CaptureHub(make_source(spec))
+    counts = [0, 0, 0]  # frames delivered, bytes encoded, frames dropped
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    tasks = [asyncio.create_task(client(hub, f"bench:{i}", encoding, rate, counts))
+             for i in range(clients)]
+    await asyncio.sleep(seconds)
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - wall
+    cpu = time.process_time() - cpu
+    return {
+        "fps": counts[0] / wall,
+        "source_fps": hub.frames / wall,
+        "kbps": counts[1] * 8 / 1000 / wall,
+        "dropped": counts[2],
+        "cpu": cpu / wall,
+    }
+
+
+async def main(args):
+    fast = args.source if ":fast" in args.source else args.source + ":fast"
+    print(f"Source: {args.source}, encoding: {args.encoding} @ {args.rate} Hz")
+    print(f"{'mode':9s} {'clients':>7s} {'frames/s':>10s} {'src fps':>8s} {'dropped':>8s} "
+          f"{'kbit/s':>9s} {'CPU %':>6s} {'clients/core':>12s}")
+    for mode, spec in (("fast", fast), ("realtime", args.source.replace(":fast", ""))):
+        for n in args.clients:
+            r = await run(spec, n, args.seconds, args.encoding, args.rate)
+            per_core = n / r["cpu"] if r["cpu"] and mode == "realtime" else float("nan")
+            print(f"{mode:9s} {n:7d} {r['fps']:10.0f} {r['source_fps']:8.0f} {r['dropped']:8d} "
+                  f"{r['kbps']:9.0f} {100 * r['cpu']:6.1f} {per_core:12.0f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--source", default="synthetic:speech")
+    ap.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    ap.add_argument("--seconds", type=float, default=5.0)
+    ap.add_argument("--encoding", choices=ENCODINGS, default="mulaw")
+    ap.add_argument("--rate", type=int, default=16000)
+    asyncio.run(main(ap.parse_args()))
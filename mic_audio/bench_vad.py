@@ -0,0 +1,129 @@
+"""
+Suppression ratio and per-chunk latency of the streaming VAD.
+
+Runs StreamingVAD over 16-bit mono WAV recordings chunk by chunk and
+reports how much audio was gated out and how long each chunk took. With
+no arguments, labelled fixtures (speech-like bursts over room noise) are
+written to a temp dir first, which also allows recall and onset delay to
+be reported.
+
+    python bench_vad.py                  # generated fixtures
+    python bench_vad.py talk1.wav ...    # your own recordings
+"""
+import argparse
+import os
+import tempfile
+import time
+import wave
+
+import numpy as np
+
+from capture import speech_like
+from vad import AUDIO, SPEECH_START, StreamingVAD
+
+CHUNK = 1024
+
+
+def write_fixture(path, seconds, rate=44100, seed=0, noise_db=-60.0):
+    """Speech bursts of 0.4-2.5 s separated by 0.5-4 s of room noise. Returns per-sample labels."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * rate)
+    noise = 32768 * 10 ** (noise_db / 20) * rng.standard_normal(total)
+    labels = np.zeros(total, dtype=bool)
+    signal = noise.copy()
+    pos = int(rng.uniform(0.5, 4.0) * rate)
+    while pos < total:
+        length = min(int(rng.uniform(0.4, 2.5) * rate), total - pos)
+        burst = speech_like((length + 1) / rate, rate, seed=int(rng.integers(1 << 30))).astype(np.float64)
+        signal[pos:pos + length] += burst[:length] * rng.uniform(0.3, 1.0)
+        labels[pos:pos + length] = True
+        pos += length + int(rng.uniform(0.5, 4.0) * rate)
+    with wave.open(path, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(np.clip(signal, -32768, 32767).astype("<i2").tobytes())
+    return labels
+
+
+def read_wav(path):
+    with wave.open(path, "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError(f"{path}: expected 16-bit mono PCM")
+        return wf.getframerate(), wf.readframes(wf.getnframes())
+
+
+def run(path, labels=None):
+    rate, pcm = read_wav(path)
+    vad = StreamingVAD(rate=rate, chunk=CHUNK)
+    step = CHUNK * 2
+    chunk_speech = []
+    passed = []
+    timings = []
+    starts = []
+    for i, offset in enumerate(range(0, len(pcm) - step + 1, step)):
+        chunk = pcm[offset:offset + step]
+        t0 = time.perf_counter()
+        events = vad.process(chunk)
+        timings.append(time.perf_counter() - t0)
+        passed.extend([False] * (i + 1 - len(passed)))
+        n_audio = sum(1 for kind, _ in events if kind == AUDIO)
+        for back in range(n_audio):
+            passed[i - back] = True
+        starts.extend(i for kind, _ in events if kind == SPEECH_START)
+        if labels is not None:
+            chunk_speech.append(labels[offset // 2:offset // 2 + CHUNK].mean() > 0.5)
+
+    us = np.array(timings) * 1e6
+    result = {
+        "file": os.path.basename(path),
+        "seconds": len(pcm) / 2 / rate,
+        "suppression": vad.suppression(),
+        "us_mean": us.mean(),
+        "us_p99": np.percentile(us, 99),
+        "segments": len(starts),
+    }
+    if labels is not None:
+        truth = np.array(chunk_speech)
+        got = np.array(passed[:len(truth)])
+        result["recall"] = (truth & got).sum() / max(1, truth.sum())
+        # Onsets: first chunk of each labelled burst vs the detected start event
+        onsets = np.flatnonzero(truth[1:] & ~truth[:-1]) + 1
+        delays = []
+        for onset in onsets:
+            later = [s for s in starts if s >= onset]
+            if later:
+                delays.append(later[0] - onset)
+        chunk_ms = 1000 * CHUNK / rate
+        result["onset_ms"] = chunk_ms * np.mean(delays) if delays else float("nan")
+    return result
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("wavs", nargs="*")
+    ap.add_argument("--seconds", type=float, default=60.0)
+    args = ap.parse_args()
+
+    results = []
+    if args.wavs:
+        results = [run(path) for path in args.wavs]
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            for seed in range(3):
+                path = os.path.join(tmp, f"fixture_{seed}.wav")
+                labels = write_fixture(path, args.seconds, seed=seed)
+                results.append(run(path, labels))
+
+    for r in results:
+        line = (f"{r['file']:20s} {r['seconds']:6.1f}s  suppressed={100 * r['suppression']:5.1f}%  "
+                f"segments={r['segments']:3d}  chunk mean={r['us_mean']:6.1f} us  p99={r['us_p99']:6.1f} us")
+        if "recall" in r:
+            line += f"  speech recall={100 * r['recall']:5.1f}%  detect delay={r['onset_ms']:5.1f} ms"
+        print(line)
+    print("Onset audio is replayed from the pre-roll, so the detect delay is added to "
+          "the first packet of a segment but no speech is lost.")
+
+
+if __name__ == "__main__":
+    main()
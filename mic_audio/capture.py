@@ -0,0 +1,288 @@
+import threading
+import time
+import wave
+
+import numpy as np
+
+# Every source delivers little-endian Int16 chunks
+SAMPLE_WIDTH = 2
+
+
+class AudioSource:
+    """
+    Something that produces fixed-size Int16 chunks. `start(on_frame)`
+    begins delivery, calling `on_frame(data)` from the source's own thread
+    for every chunk, and `stop()` ends it. Sources can be restarted.
+    """
+
+    def __init__(self, rate=44100, channels=1, chunk=1024):
+        self.rate = rate
+        self.channels = channels
+        self.chunk = chunk
+
+    def start(self, on_frame):
+        raise NotImplementedError
+
+    def stop(self):
+        raise NotImplementedError
+
+    def describe(self):
+        return f"{type(self).__name__}({self.rate} Hz, {self.channels} ch, {self.chunk} frames)"
+
+
+class MicSource(AudioSource):
+    """
+    Microphone input in PyAudio callback mode. PortAudio calls the
+    callback from its own thread for every chunk, so nothing ever blocks
+    on `stream.read()`.
+    """
+
+    def __init__(self, rate=44100, channels=1, chunk=1024, device=None):
+        super().__init__(rate, channels, chunk)
+        self.device = device
+        self.on_frame = None
+        self.pa_continue = None
+        self.p = None
+        self.stream = None
+
+    def _callback(self, in_data, frame_count, time_info, status):
+        self.on_frame(in_data)
+        return (None, self.pa_continue)
+
+    def start(self, on_frame):
+        import pyaudio
+        self.on_frame = on_frame
+        self.pa_continue = pyaudio.paContinue
+        self.p = pyaudio.PyAudio()
+        self.stream = self.p.open(format=self.p.get_format_from_width(SAMPLE_WIDTH),
+                                  channels=self.channels,
+                                  rate=self.rate,
+                                  input=True,
+                                  input_device_index=self.device,
+                                  frames_per_buffer=self.chunk,
+                                  stream_callback=self._callback)
+        self.stream.start_stream()
+
+    def stop(self):
+        if self.stream:
+            self.stream.stop_stream()
+            self.stream.close()
+            self.stream = None
+        if self.p:
+            self.p.terminate()
+            self.p = None
+
+
+class _ThreadedSource(AudioSource):
+    """Base for sources that generate chunks on a thread, optionally paced to real time."""
+
+    def __init__(self, rate=44100, channels=1, chunk=1024, realtime=True):
+        super().__init__(rate, channels, chunk)
+        self.realtime = realtime
+        self.running = threading.Event()
+        self.thread = None
+
+    def start(self, on_frame):
+        self.running.set()
+        self.thread = threading.Thread(target=self._run, args=(on_frame,), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.running.clear()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join()
+        self.thread = None
+
+    def _next_chunk(self):
+        """Return the next chunk of Int16 bytes, or None when exhausted."""
+        raise NotImplementedError
+
+    def _run(self, on_frame):
+        period = self.chunk / self.rate
+        deadline = time.perf_counter()
+        while self.running.is_set():
+            data = self._next_chunk()
+            if data is None:
+                break
+            if self.realtime:
+                # Pace against an absolute schedule so sleep jitter doesn't accumulate
+                deadline += period
+                delay = deadline - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            on_frame(data)
+        self.running.clear()
+
+
+class FileSource(_ThreadedSource):
+    """
+    Replays a 16-bit WAV file, or headerless PCM at `rate`/`channels`,
+    either in real time or as fast as the consumers allow.
+    """
+
+    def __init__(self, path, chunk=1024, realtime=True, loop=False, rate=44100, channels=1):
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as wf:
+                if wf.getsampwidth() != SAMPLE_WIDTH:
+                    raise ValueError(f"{path}: expected 16-bit PCM, got {8 * wf.getsampwidth()}-bit")
+                rate = wf.getframerate()
+                channels = wf.getnchannels()
+                pcm = wf.readframes(wf.getnframes())
+        else:
+            with open(path, "rb") as f:
+                pcm = f.read()
+        super().__init__(rate, channels, chunk, realtime)
+        self.path = path
+        self.loop = loop
+        self.pcm = pcm
+        self.pos = 0
+
+    def _next_chunk(self):
+        size = self.chunk * self.channels * SAMPLE_WIDTH
+        if self.pos + size > len(self.pcm):
+            if not self.loop or len(self.pcm) < size:
+                return None
+            self.pos = 0
+        data = self.pcm[self.pos:self.pos + size]
+        self.pos += size
+        return data
+
+    def describe(self):
+        return f"FileSource({self.path}, {self.rate} Hz, {'real time' if self.realtime else 'max speed'})"
+
+
+class PushSource(_ThreadedSource):
+    """
+    Plays out audio handed to it with `feed()` (synthesized speech, say) as
+    a real-time stream of chunks, and silence whenever nothing is queued,
+    so listeners see one continuous stream.
+    """
+
+    def __init__(self, rate=44100, channels=1, chunk=1024):
+        super().__init__(rate, channels, chunk, realtime=True)
+        self.lock = threading.Lock()
+        self.pending = bytearray()
+        self.silence = bytes(chunk * channels * SAMPLE_WIDTH)
+
+    def feed(self, pcm):
+        """Queue Int16 PCM at the source's rate and channel count."""
+        with self.lock:
+            self.pending += pcm
+
+    def clear(self):
+        """Drop everything not yet played, e.g. when the speaker is interrupted."""
+        with self.lock:
+            self.pending.clear()
+
+    def pending_seconds(self):
+        return len(self.pending) / (self.rate * self.channels * SAMPLE_WIDTH)
+
+    def _next_chunk(self):
+        size = len(self.silence)
+        with self.lock:
+            if not self.pending:
+                return self.silence
+            data = bytes(self.pending[:size])
+            del self.pending[:size]
+        # A partial last chunk is padded so every frame has the same length
+        return data + self.silence[len(data):]
+
+
+def speech_like(seconds, rate=44100, seed=0):
+    """Voiced harmonics with a ~4 Hz syllable envelope plus a little noise, as Int16."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum(np.sin(k * phase) / k for k in range(1, 12))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) ** 2
+    signal = 6000 * voiced * envelope + 200 * rng.standard_normal(len(t))
+    return np.clip(signal, -32768, 32767).astype("<i2")
+
+
+# --- Kinds of synthetic signal ---
+TONE = "tone"
+NOISE = "noise"
+SPEECH = "speech"
+SYNTHETIC_KINDS = (TONE, NOISE, SPEECH)
+
+
+class SyntheticSource(_ThreadedSource):
+    """
+    Deterministic test signal: a sine `tone`, white `noise`, or `speech`-like
+    bursts of 0.4-2.5 s separated by 0.5-4 s of quiet room noise.
+    """
+
+    def __init__(self, kind=SPEECH, rate=44100, chunk=1024, realtime=True,
+                 frequency=440.0, level_db=-12.0, seed=0):
+        if kind not in SYNTHETIC_KINDS:
+            raise ValueError(f"Unknown synthetic signal {kind!r}, expected one of {SYNTHETIC_KINDS}")
+        super().__init__(rate, 1, chunk, realtime)
+        self.kind = kind
+        self.frequency = frequency
+        self.amplitude = 32767 * 10 ** (level_db / 20)
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.sample = 0
+        self.pending = np.zeros(0, dtype=np.float64)
+
+    def _next_chunk(self):
+        n = self.chunk
+        if self.kind == TONE:
+            t = (self.sample + np.arange(n)) / self.rate
+            x = self.amplitude * np.sin(2 * np.pi * self.frequency * t)
+        elif self.kind == NOISE:
+            x = self.amplitude / 3 * self.rng.standard_normal(n)
+        else:
+            while len(self.pending) < n:
+                self.pending = np.concatenate((self.pending, self._speech_segment()))
+            x, self.pending = self.pending[:n], self.pending[n:]
+        self.sample += n
+        return np.clip(x, -32768, 32767).astype("<i2").tobytes()
+
+    def _speech_segment(self):
+        """One pause of room noise followed by one burst of speech-like signal."""
+        pause = int(self.rng.uniform(0.5, 4.0) * self.rate)
+        burst = int(self.rng.uniform(0.4, 2.5) * self.rate)
+        noise = 32768 * 10 ** (-60 / 20) * self.rng.standard_normal(pause + burst)
+        voiced = speech_like((burst + 1) / self.rate, self.rate, seed=int(self.rng.integers(1 << 30)))
+        noise[pause:] += voiced[:burst] * self.rng.uniform(0.3, 1.0)
+        return noise
+
+    def describe(self):
+        return f"SyntheticSource({self.kind}, {self.rate} Hz, {'real time' if self.realtime else 'max speed'})"
+
+
+def make_source(spec, rate=44100, channels=1, chunk=1024):
+    """
+    Build a source from a config string:
+
+        mic                     default input device
+        mic:<index>             a specific PyAudio input device
+        file:<path>[:fast][:loop]
+        synthetic[:tone|noise|speech][:fast]
+        push                    audio fed in by the application
+    """
+    kind, _, rest = spec.partition(":")
+    # Flags are peeled off the end so file paths may contain ':' (C:\\talk.wav)
+    options = []
+    while rest.rsplit(":", 1)[-1] in ("fast", "loop") and ":" in rest:
+        rest, flag = rest.rsplit(":", 1)
+        options.append(flag)
+    if rest in ("fast", "loop"):
+        options.append(rest)
+        rest = ""
+    realtime = "fast" not in options
+    if kind == "mic":
+        device = int(rest) if rest else None
+        return MicSource(rate=rate, channels=channels, chunk=chunk, device=device)
+    if kind == "file":
+        if not rest:
+            raise ValueError("file source needs a path, e.g. file:talk.wav")
+        return FileSource(rest, chunk=chunk, realtime=realtime, loop="loop" in options,
+                          rate=rate, channels=channels)
+    if kind == "synthetic":
+        return SyntheticSource(rest or SPEECH, rate=rate, chunk=chunk, realtime=realtime)
+    if kind == "push":
+        return PushSource(rate=rate, channels=channels, chunk=chunk)
+    raise ValueError(f"Unknown audio source {spec!r}, expected mic, file:<path>, synthetic or push")
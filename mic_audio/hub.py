@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+
+from capture import MicSource
+
+# --- Overflow policies for a full subscriber queue ---
+DROP_OLDEST = "drop-oldest"
+DROP_NEWEST = "drop-newest"
+DISCONNECT = "disconnect"
+POLICIES = (DROP_OLDEST, DROP_NEWEST, DISCONNECT)
+
+
+# What subscribers receive: a sequence number, the wall-clock capture
+# time (time.time()) and the raw Int16 chunk.
+Frame = namedtuple("Frame", ["seq", "captured", "data"])
+
+
+class SubscriberClosed(Exception):
+    """Raised to a consumer whose subscription was closed or kicked."""
+
+
+class Subscriber:
+    """
+    One consumer of the shared capture. Frames are offered from the capture
+    thread; they can be taken either from a plain thread with `get()` or from
+    asyncio with `aget()` (pass the event loop when subscribing).
+    """
+
+    def __init__(self, name, maxsize=32, policy=DROP_OLDEST, loop=None):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown overflow policy {policy!r}, expected one of {POLICIES}")
+        self.name = name
+        self.maxsize = maxsize
+        self.policy = policy
+        self.loop = loop
+        self.frames = deque()
+        self.cond = threading.Condition()
+        self.event = asyncio.Event() if loop else None
+        self.closed = False
+        self.delivered = 0
+        self.dropped = 0
+
+    def offer(self, frame):
+        with self.cond:
+            if self.closed:
+                return
+            if len(self.frames) >= self.maxsize:
+                self.dropped += 1
+                if self.policy == DROP_NEWEST:
+                    return
+                if self.policy == DISCONNECT:
+                    self.closed = True
+                    self.frames.clear()
+                    self.cond.notify_all()
+                    self._wake()
+                    return
+                self.frames.popleft()
+            self.frames.append(frame)
+            self.cond.notify()
+        self._wake()
+
+    def _wake(self):
+        if self.loop:
+            self.loop.call_soon_threadsafe(self.event.set)
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self._wake()
+
+    def get(self, timeout=None):
+        """Blocking get for thread consumers. Returns None on timeout."""
+        with self.cond:
+            if not self.frames and not self.closed:
+                self.cond.wait(timeout)
+            if self.frames:
+                self.delivered += 1
+                return self.frames.popleft()
+            if self.closed:
+                raise SubscriberClosed(self.name)
+            return None
+
+    async def aget(self):
+        """Awaitable get for asyncio consumers."""
+        while True:
+            with self.cond:
+                if self.frames:
+                    self.delivered += 1
+                    return self.frames.popleft()
+                if self.closed:
+                    raise SubscriberClosed(self.name)
+                # Cleared under the lock, so a concurrent offer() always
+                # schedules its set() after this point.
+                self.event.clear()
+            await self.event.wait()
+
+    def qsize(self):
+        return len(self.frames)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "policy": self.policy,
+            "queued": len(self.frames),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "closed": self.closed,
+        }
+
+
+class CaptureHub:
+    """
+    A single shared capture source broadcast to any number of subscribers.
+    The source is started when the first subscriber joins and stopped when
+    the last one leaves, so only one input stream is ever open.
+    """
+
+    def __init__(self, source=None):
+        self.source = source if source is not None else MicSource()
+        self.lock = threading.Lock()
+        self.subscribers = ()
+        self.capturing = False
+        self.frames = 0
+
+    @property
+    def rate(self):
+        return self.source.rate
+
+    @property
+    def chunk(self):
+        return self.source.chunk
+
+    def subscribe(self, name, maxsize=32, policy=DROP_OLDEST, loop=None):
+        sub = Subscriber(name, maxsize=maxsize, policy=policy, loop=loop)
+        with self.lock:
+            if not self.capturing:
+                self._start_capture()
+            self.subscribers = self.subscribers + (sub,)
+        return sub
+
+    def unsubscribe(self, sub):
+        sub.close()
+        with self.lock:
+            self.subscribers = tuple(s for s in self.subscribers if s is not sub)
+            if not self.subscribers and self.capturing:
+                self._stop_capture()
+
+    def _start_capture(self):
+        try:
+            self.source.start(self._broadcast)
+        except Exception:
+            self.source.stop()
+            raise
+        self.capturing = True
+        print(f"* Shared capture started: {self.source.describe()}")
+
+    def _stop_capture(self):
+        self.source.stop()
+        self.capturing = False
+        print("* Shared capture stopped.")
+
+    def _broadcast(self, data):
+        frame = Frame(self.frames, time.time(), data)
+        self.frames += 1
+        # The tuple is swapped, never mutated, so no lock is needed here
+        for sub in self.subscribers:
+            sub.offer(frame)
+
+    def stats(self):
+        return {
+            "source": self.source.describe(),
+            "capturing": self.capturing,
+            "frames": self.frames,
+            "subscribers": [s.stats() for s in self.subscribers],
+        }
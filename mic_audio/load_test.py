@@ -0,0 +1,86 @@
+"""
+Load test for the audio server.
+
+Opens several /ws/audio sockets against a running recorder.py and, while
+they stream, keeps hitting the plain HTTP route to check that the event
+loop still answers promptly. Reports p50/p99 handler latency and the frame
+rate each socket received.
+
+    python recorder.py                      # in one terminal
+    python load_test.py --sockets 8         # in another
+
+On a machine without a microphone, start the server with
+`python recorder.py --source synthetic:speech` (or `file:<wav>`).
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import requests
+import websockets
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+async def listen(url, duration, counts, idx):
+    async with websockets.connect(url, max_size=None) as ws:
+        end = time.perf_counter() + duration
+        while time.perf_counter() < end:
+            try:
+                await asyncio.wait_for(ws.recv(), timeout=end - time.perf_counter())
+            except asyncio.TimeoutError:
+                break
+            counts[idx] += 1
+
+
+async def probe(http_url, duration, interval, latencies):
+    end = time.perf_counter() + duration
+    session = requests.Session()
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        await asyncio.to_thread(session.get, http_url, timeout=5)
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+async def main(args):
+    ws_url = f"ws://{args.host}:{args.port}/ws/audio"
+    http_url = f"http://{args.host}:{args.port}/"
+
+    # Baseline with no sockets open
+    idle = []
+    await probe(http_url, 2, args.interval, idle)
+
+    counts = [0] * args.sockets
+    loaded = []
+    await asyncio.gather(
+        *(listen(ws_url, args.duration, counts, i) for i in range(args.sockets)),
+        probe(http_url, args.duration, args.interval, loaded),
+    )
+
+    print(f"Sockets: {args.sockets}, duration: {args.duration}s")
+    for name, values in (("idle", idle), ("loaded", loaded)):
+        ms = [v * 1000 for v in values]
+        print(f"  GET / {name:7s} n={len(ms):4d}  "
+              f"p50={percentile(ms, 50):6.2f} ms  p99={percentile(ms, 99):6.2f} ms  "
+              f"max={max(ms, default=0):6.2f} ms")
+    rates = [c / args.duration for c in counts]
+    print(f"  frames/s per socket: mean={statistics.mean(rates):.1f} "
+          f"min={min(rates):.1f} max={max(rates):.1f}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8000)
+    ap.add_argument("--sockets", type=int, default=8)
+    ap.add_argument("--duration", type=float, default=10.0)
+    ap.add_argument("--interval", type=float, default=0.02)
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,181 @@
+import itertools
+
+# Quantiles exported for every histogram
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+
+class LogHistogram:
+    """
+    HDR-style histogram of non-negative integers. Values below 2**sub_bits
+    get their own bucket; above that each power of two is split into
+    2**(sub_bits-1) linear sub-buckets, so every recorded value is kept to
+    within 1 / 2**(sub_bits-1) relative error in O(log range) memory.
+
+    Recording is a couple of integer ops and a list increment. Each
+    histogram is only written from one thread (the event loop), so there
+    are no locks; readers may see a count that is one sample stale.
+    """
+
+    def __init__(self, sub_bits=6):
+        self.sub_bits = sub_bits
+        self.sub_count = 1 << sub_bits
+        self.half = self.sub_count >> 1
+        self.counts = [0] * self.sub_count
+        self.total = 0
+        self.sum = 0
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.sub_bits
+        return self.sub_count + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def _bucket_high(self, index):
+        """Largest value that lands in bucket `index`."""
+        if index < self.sub_count:
+            return index
+        shift = (index - self.sub_count) // self.half + 1
+        top = (index - self.sub_count) % self.half + self.half
+        return ((top + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        idx = self._index(value)
+        if idx >= len(self.counts):
+            self.counts.extend([0] * (idx + 1 - len(self.counts)))
+        self.counts[idx] += 1
+        self.total += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.total += other.total
+        self.sum += other.sum
+        self.max = max(self.max, other.max)
+
+    def percentile(self, pct):
+        if not self.total:
+            return 0
+        rank = max(1, round(pct / 100 * self.total))
+        seen = 0
+        for idx, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self._bucket_high(idx), self.max)
+        return self.max
+
+
+class ConnectionMetrics:
+    """Per-connection series for one /ws/audio client."""
+
+    def __init__(self, conn_id, encoding, rate):
+        self.conn_id = conn_id
+        self.encoding = encoding
+        self.rate = rate
+        # Latencies in microseconds, depth in frames
+        self.capture_to_send = LogHistogram()
+        self.send_duration = LogHistogram()
+        self.queue_depth = LogHistogram()
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.frames_dropped = 0
+        # Reported back by the playback client
+        self.client_latency = LogHistogram()
+        self.client_underruns = 0
+
+    def observe_client(self, report):
+        self.client_latency.record(float(report["latency_ms"]) * 1e3)
+        self.client_underruns = int(report["underruns"])
+
+    def observe_send(self, captured, sent_start, sent_end, depth, nbytes):
+        self.capture_to_send.record((sent_start - captured) * 1e6)
+        self.send_duration.record((sent_end - sent_start) * 1e6)
+        self.queue_depth.record(depth)
+        self.frames_sent += 1
+        self.bytes_sent += nbytes
+
+
+class MetricsRegistry:
+    """
+    Live per-connection metrics plus totals that survive disconnects,
+    rendered in the Prometheus text exposition format.
+    """
+
+    def __init__(self, prefix="maya_audio"):
+        self.prefix = prefix
+        self.ids = itertools.count(1)
+        self.connections = {}
+        self.closed = ConnectionMetrics("closed", "", 0)
+
+    def open(self, encoding, rate):
+        conn = ConnectionMetrics(str(next(self.ids)), encoding, rate)
+        self.connections[conn.conn_id] = conn
+        return conn
+
+    def close(self, conn):
+        self.connections.pop(conn.conn_id, None)
+        closed = self.closed
+        closed.capture_to_send.merge(conn.capture_to_send)
+        closed.send_duration.merge(conn.send_duration)
+        closed.queue_depth.merge(conn.queue_depth)
+        closed.client_latency.merge(conn.client_latency)
+        closed.client_underruns += conn.client_underruns
+        closed.frames_sent += conn.frames_sent
+        closed.bytes_sent += conn.bytes_sent
+        closed.frames_dropped += conn.frames_dropped
+
+    def render(self, hub_stats=None):
+        lines = []
+        p = self.prefix
+        conns = list(self.connections.values()) + [self.closed]
+
+        def labels(conn, extra=""):
+            base = f'conn="{conn.conn_id}"'
+            if conn.encoding:
+                base += f',encoding="{conn.encoding}",rate="{conn.rate}"'
+            return "{" + base + extra + "}"
+
+        def summary(name, help_text, attr, scale):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} summary")
+            for conn in conns:
+                hist = getattr(conn, attr)
+                for q in QUANTILES:
+                    value = hist.percentile(q * 100) * scale
+                    quantile = f',quantile="{q}"'
+                    lines.append(f"{p}_{name}{labels(conn, quantile)} {value:.6g}")
+                lines.append(f"{p}_{name}_sum{labels(conn)} {hist.sum * scale:.6g}")
+                lines.append(f"{p}_{name}_count{labels(conn)} {hist.total}")
+
+        def counter(name, help_text, attr):
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} counter")
+            for conn in conns:
+                lines.append(f"{p}_{name}{labels(conn)} {getattr(conn, attr)}")
+
+        summary("capture_to_send_seconds", "Time from capture to the start of the WebSocket send.",
+                "capture_to_send", 1e-6)
+        summary("send_duration_seconds", "Time spent in one WebSocket send.", "send_duration", 1e-6)
+        summary("queue_depth_frames", "Subscriber queue depth seen when a frame is taken.", "queue_depth", 1)
+        summary("client_latency_seconds", "Glass-to-glass latency reported by the playback client.",
+                "client_latency", 1e-6)
+        counter("frames_sent_total", "Audio packets sent.", "frames_sent")
+        counter("bytes_sent_total", "Audio payload bytes sent, headers included.", "bytes_sent")
+        counter("frames_dropped_total", "Frames dropped by the subscriber overflow policy.", "frames_dropped")
+        counter("client_underruns_total", "Jitter buffer underruns reported by the playback client.",
+                "client_underruns")
+
+        lines.append(f"# HELP {p}_connections Open /ws/audio connections.")
+        lines.append(f"# TYPE {p}_connections gauge")
+        lines.append(f"{p}_connections {len(self.connections)}")
+        if hub_stats is not None:
+            lines.append(f"# HELP {p}_frames_captured_total Frames produced by the shared capture source.")
+            lines.append(f"# TYPE {p}_frames_captured_total counter")
+            lines.append(f"{p}_frames_captured_total {hub_stats['frames']}")
+        return "\n".join(lines) + "\n"
@@ -1,11 +1,22 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
-import pyaudio
+from fastapi import APIRouter, FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+import argparse
+import asyncio
+import os
 import threading
-import uvicorn
+import time
+import numpy as np
+from capture import SAMPLE_WIDTH, PushSource, make_source
+from hub import CaptureHub, DROP_OLDEST, POLICIES, SubscriberClosed
+from metrics import MetricsRegistry
+from resample import PolyphaseResampler
+from vad import AUDIO, StreamingVAD
+from wire_codecs import FRAME_HEADER, PCM16, StreamEncoder
 
-# Create a FastAPI app instance
+# Create a FastAPI app instance; the audio routes live on `router` so the
+# orchestrator can serve them from its own app
 app = FastAPI()
+router = APIRouter()
 
 # --- HTML for the client page ---
 html = """
@@ -17,27 +28,68 @@ html = """
     <body>
         <h1>Real-Time Audio Stream</h1>
         <p>Status: <span id="status">Idle</span></p>
+        <label>Encoding
+            <select id="encoding">
+                <option value="pcm16">PCM16</option>
+                <option value="mulaw" selected>mu-law</option>
+                <option value="adpcm">IMA-ADPCM</option>
+            </select>
+        </label>
+        <label>Rate
+            <select id="rate">
+                <option value="8000">8 kHz</option>
+                <option value="16000" selected>16 kHz</option>
+                <option value="44100">44.1 kHz</option>
+            </select>
+        </label>
+        <label>Target latency (ms) <input type="number" id="targetMs" value="80" min="20" max="1000" step="10"></label>
+        <label>Stream
+            <select id="stream">
+                <option value="mic" selected>Microphone</option>
+                <option value="speech">Co-presenter speech</option>
+            </select>
+        </label>
+        <label><input type="checkbox" id="vad"> Speech only (VAD)</label>
         <button id="connectButton">Connect and Listen</button>
         <button id="disconnectButton" disabled>Disconnect</button>
+        <p>Latency: <span id="latency">-</span> | Buffer: <span id="buffer">-</span> | Underruns: <span id="underruns">0</span></p>
         <script>
             let websocket;
             let audioContext;
-            let audioQueue = [];
-            let isPlaying = false;
-            let nextStartTime = 0;
-            const sampleRate = 44100;
+            let playbackNode = null;
+            let lastSeq = null;
+            // Capture time and local arrival time of the newest packet, for latency estimates
+            let newestCaptured = 0;
+            let newestArrival = 0;
 
             const statusElem = document.getElementById("status");
             const connectButton = document.getElementById("connectButton");
             const disconnectButton = document.getElementById("disconnectButton");
 
-            connectButton.onclick = function(event) {
-                // Initialize AudioContext on user gesture
-                if (!audioContext) {
-                    audioContext = new (window.AudioContext || window.webkitAudioContext)({sampleRate: sampleRate});
+            connectButton.onclick = async function(event) {
+                const encoding = document.getElementById("encoding").value;
+                const rate = Number(document.getElementById("rate").value);
+                const vad = document.getElementById("vad").checked;
+                const stream = document.getElementById("stream").value;
+                const targetMs = Number(document.getElementById("targetMs").value);
+
+                // Initialize AudioContext on user gesture, at the stream rate when the browser allows it
+                if (!audioContext || audioContext.sampleRate !== rate) {
+                    if (audioContext) {
+                        audioContext.close();
+                    }
+                    try {
+                        audioContext = new AudioContext({sampleRate: rate, latencyHint: "interactive"});
+                    } catch (e) {
+                        audioContext = new AudioContext({latencyHint: "interactive"});
+                    }
+                    await audioContext.audioWorklet.addModule("/playback-worklet.js");
                 }
-                
-                websocket = new WebSocket("ws://192.168.122.67:8000/ws/audio");
+                await audioContext.resume();
+
+                websocket = new WebSocket(`ws://${location.host}/ws/audio?stream=${stream}&encoding=${encoding}&rate=${rate}&vad=${vad}`);
+                // Raw ArrayBuffers can be handed straight to the worklet, no FileReader round trip
+                websocket.binaryType = "arraybuffer";
                 statusElem.textContent = "Connecting...";
 
                 websocket.onopen = function(event) {
@@ -50,108 +102,335 @@ html = """
                     statusElem.textContent = "Disconnected.";
                     connectButton.disabled = false;
                     disconnectButton.disabled = true;
-                    isPlaying = false;
-                    audioQueue = [];
+                    if (playbackNode) {
+                        playbackNode.disconnect();
+                        playbackNode = null;
+                    }
                 };
-                
+
                 websocket.onerror = function(event) {
                     statusElem.textContent = "Error connecting.";
                     console.error("WebSocket error:", event);
                 };
 
                 websocket.onmessage = function(event) {
-                    // event.data is a Blob containing the raw audio data
-                    const reader = new FileReader();
-                    reader.onload = function() {
-                        const arrayBuffer = reader.result;
-                        // The server sends Int16, so 2 bytes per sample
-                        const int16Array = new Int16Array(arrayBuffer);
-                        // Convert to Float32Array for Web Audio API (-1.0 to 1.0)
-                        const float32Array = new Float32Array(int16Array.length);
-                        for (let i = 0; i < int16Array.length; i++) {
-                            float32Array[i] = int16Array[i] / 32768.0;
-                        }
-                        
-                        const audioBuffer = audioContext.createBuffer(1, float32Array.length, sampleRate);
-                        audioBuffer.copyToChannel(float32Array, 0);
-                        
-                        audioQueue.push(audioBuffer);
-                        if (!isPlaying) {
-                            isPlaying = true;
-                            schedulePlayback();
+                    if (typeof event.data === "string") {
+                        // The server announces the negotiated format before any audio
+                        const message = JSON.parse(event.data);
+                        if (message.type === "format") {
+                            startPlayback(message, targetMs);
+                        } else if (message.type === "speech-start") {
+                            statusElem.textContent = "Connected. Speech detected.";
+                        } else if (message.type === "speech-end") {
+                            statusElem.textContent = "Connected. Waiting for speech...";
+                            if (playbackNode) {
+                                playbackNode.port.postMessage({drain: true});
+                            }
                         }
-                    };
-                    reader.readAsArrayBuffer(event.data);
+                        return;
+                    }
+                    // Every packet starts with sequence number (uint32) and capture time (float64)
+                    const view = new DataView(event.data);
+                    const seq = view.getUint32(0, true);
+                    if (lastSeq !== null && seq !== lastSeq + 1) {
+                        console.warn(`Audio frames ${lastSeq + 1}..${seq - 1} missing or gated`);
+                    }
+                    lastSeq = seq;
+                    newestCaptured = view.getFloat64(4, true);
+                    newestArrival = Date.now() / 1000;
+                    if (playbackNode) {
+                        // Decoding happens in the worklet; transfer the buffer instead of copying it
+                        playbackNode.port.postMessage({packet: event.data, arrival: performance.now() / 1000},
+                                                      [event.data]);
+                    }
                 };
             };
-            
+
             disconnectButton.onclick = function(event) {
                 if (websocket) {
                     websocket.close();
                 }
             };
 
-            function schedulePlayback() {
-                if (audioQueue.length === 0) {
-                    isPlaying = false;
-                    return;
+            function startPlayback(format, targetMs) {
+                if (playbackNode) {
+                    playbackNode.disconnect();
                 }
+                lastSeq = null;
+                playbackNode = new AudioWorkletNode(audioContext, "playback-processor", {
+                    outputChannelCount: [1],
+                    processorOptions: {
+                        encoding: format.encoding,
+                        rate: format.rate,
+                        headerBytes: format.header_bytes,
+                        targetMs: targetMs,
+                        maxTargetMs: 500
+                    }
+                });
+                playbackNode.connect(audioContext.destination);
+                playbackNode.port.onmessage = function(event) {
+                    reportStats(event.data);
+                };
+            }
 
-                const buffer = audioQueue.shift();
-                const source = audioContext.createBufferSource();
-                source.buffer = buffer;
-                source.connect(audioContext.destination);
-
-                const currentTime = audioContext.currentTime;
-                if (nextStartTime < currentTime) {
-                    nextStartTime = currentTime;
+            function reportStats(stats) {
+                // Sample now playing was captured `behind` seconds before the newest one
+                const outputLatency = (audioContext.outputLatency || 0) + (audioContext.baseLatency || 0);
+                const latency = newestArrival - newestCaptured + stats.behind + outputLatency;
+                document.getElementById("latency").textContent = `${(latency * 1000).toFixed(0)} ms`;
+                document.getElementById("buffer").textContent =
+                    `${(stats.behind * 1000).toFixed(0)} / ${(stats.target * 1000).toFixed(0)} ms`;
+                document.getElementById("underruns").textContent = stats.underruns;
+                if (websocket && websocket.readyState === WebSocket.OPEN && newestCaptured) {
+                    websocket.send(JSON.stringify({
+                        type: "client-stats",
+                        latency_ms: latency * 1000,
+                        buffer_ms: stats.behind * 1000,
+                        target_ms: stats.target * 1000,
+                        jitter_ms: stats.jitter * 1000,
+                        underruns: stats.underruns,
+                        skipped_ms: stats.skipped * 1000
+                    }));
                 }
-                
-                source.start(nextStartTime);
-                nextStartTime += buffer.duration;
-                
-                source.onended = schedulePlayback;
             }
         </script>
     </body>
 </html>
 """
 
-# --- PyAudio Parameters ---
+# --- AudioWorklet that decodes packets and plays them through a jitter buffer ---
+playback_worklet_js = """
+const IMA_INDEX = [-1, -1, -1, -1, 2, 4, 6, 8, -1, -1, -1, -1, 2, 4, 6, 8];
+const IMA_STEP = [
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41,
+    45, 50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190,
+    209, 230, 253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724,
+    796, 876, 963, 1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272,
+    2499, 2749, 3024, 3327, 3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132,
+    7845, 8630, 9493, 10442, 11487, 12635, 13899, 15289, 16818, 18500,
+    20350, 22385, 24623, 27086, 29794, 32767
+];
+
+// Each decoder writes straight into the ring via `put(sample)`
+function decodePCM16(buffer, offset, put) {
+    const int16Array = new Int16Array(buffer, offset, (buffer.byteLength - offset) >> 1);
+    for (let i = 0; i < int16Array.length; i++) {
+        put(int16Array[i] / 32768.0);
+    }
+}
+
+function decodeMulaw(buffer, offset, put) {
+    const codes = new Uint8Array(buffer, offset);
+    for (let i = 0; i < codes.length; i++) {
+        const u = ~codes[i] & 0xFF;
+        const exponent = (u >> 4) & 0x07;
+        const mag = ((((u & 0x0F) << 3) + 0x84) << exponent) - 0x84;
+        put(((u & 0x80) ? -mag : mag) / 32768.0);
+    }
+}
+
+function decodeAdpcm(buffer, offset, put) {
+    // Header: predictor (int16), step index (uint8), padding flag (uint8)
+    const view = new DataView(buffer, offset);
+    let predictor = view.getInt16(0, true);
+    let index = view.getUint8(2);
+    const pad = view.getUint8(3);
+    const bytes = new Uint8Array(buffer, offset + 4);
+    const count = bytes.length * 2 - pad;
+    let n = 0;
+    for (let i = 0; i < bytes.length; i++) {
+        for (let half = 0; half < 2; half++) {
+            const nibble = half ? bytes[i] >> 4 : bytes[i] & 0x0F;
+            const step = IMA_STEP[index];
+            let vpdiff = step >> 3;
+            if (nibble & 4) vpdiff += step;
+            if (nibble & 2) vpdiff += step >> 1;
+            if (nibble & 1) vpdiff += step >> 2;
+            predictor = (nibble & 8) ? Math.max(-32768, predictor - vpdiff)
+                                     : Math.min(32767, predictor + vpdiff);
+            index = Math.min(88, Math.max(0, index + IMA_INDEX[nibble]));
+            if (n++ < count) put(predictor / 32768.0);
+        }
+    }
+}
+
+const decoders = {pcm16: decodePCM16, mulaw: decodeMulaw, adpcm: decodeAdpcm};
+
+class PlaybackProcessor extends AudioWorkletProcessor {
+    constructor(options) {
+        super();
+        const o = options.processorOptions;
+        this.decode = decoders[o.encoding];
+        this.rate = o.rate;
+        this.headerBytes = o.headerBytes;
+        this.baseTarget = o.targetMs / 1000;
+        this.maxTarget = o.maxTargetMs / 1000;
+        this.target = this.baseTarget;
+        // Stream samples consumed per output sample when the context runs at another rate
+        this.ratio = this.rate / sampleRate;
+
+        // Ring buffer with absolute write/read positions (in stream samples)
+        this.capacity = Math.ceil(this.rate * 4);
+        this.ring = new Float32Array(this.capacity);
+        this.written = 0;
+        this.readPos = 0;
+        this.playing = false;
+
+        this.underruns = 0;
+        this.skipped = 0;
+        this.jitter = 0;
+        this.lastArrival = null;
+        this.lastDuration = 0;
+        this.lastReport = 0;
+
+        this.put = (sample) => {
+            this.ring[this.written % this.capacity] = sample;
+            this.written++;
+        };
+        // Set at speech-end so the expected dry-out after it isn't counted as an underrun
+        this.draining = false;
+        this.port.onmessage = (event) => {
+            if (event.data.drain) {
+                this.draining = true;
+            } else {
+                this.push(event.data.packet, event.data.arrival);
+            }
+        };
+    }
+
+    push(packet, arrival) {
+        this.draining = false;
+        const before = this.written;
+        this.decode(packet, this.headerBytes, this.put);
+        const duration = (this.written - before) / this.rate;
+
+        // RFC 3550 style inter-arrival jitter, and a target that follows it
+        if (this.lastArrival !== null) {
+            const deviation = Math.abs((arrival - this.lastArrival) - this.lastDuration);
+            this.jitter += (deviation - this.jitter) / 16;
+        }
+        this.lastArrival = arrival;
+        this.lastDuration = duration;
+        this.target = Math.min(this.maxTarget, Math.max(this.baseTarget, 3 * this.jitter + duration));
+
+        // Never let the writer lap the reader; drop the oldest audio instead
+        if (this.written - this.readPos > this.capacity) {
+            this.skipped += (this.written - this.capacity - this.readPos) / this.rate;
+            this.readPos = this.written - this.capacity;
+        }
+    }
+
+    process(inputs, outputs) {
+        const channels = outputs[0];
+        const out = channels[0];
+        const available = this.written - this.readPos;
+
+        if (!this.playing && available >= this.target * this.rate) {
+            this.playing = true;
+        }
+        if (!this.playing) {
+            out.fill(0);
+        } else {
+            // A burst left us far behind: jump to the target depth instead of lagging forever
+            if (available > (this.target * 2 + 0.1) * this.rate) {
+                const jump = available - this.target * this.rate;
+                this.readPos += jump;
+                this.skipped += jump / this.rate;
+            }
+            // Otherwise steer the fill towards the target by playing up to 2% fast or slow
+            const error = ((this.written - this.readPos) / this.rate - this.target) / this.target;
+            const step = this.ratio * (1 + Math.max(-0.02, Math.min(0.02, 0.02 * error)));
+            for (let i = 0; i < out.length; i++) {
+                if (this.readPos + 1 >= this.written) {
+                    out.fill(0, i);
+                    this.playing = false;
+                    if (!this.draining) {
+                        this.underruns++;
+                    }
+                    break;
+                }
+                const idx = Math.floor(this.readPos);
+                const frac = this.readPos - idx;
+                const a = this.ring[idx % this.capacity];
+                const b = this.ring[(idx + 1) % this.capacity];
+                out[i] = a + (b - a) * frac;
+                this.readPos += step;
+            }
+        }
+        for (let c = 1; c < channels.length; c++) {
+            channels[c].set(out);
+        }
+
+        if (currentTime - this.lastReport >= 1) {
+            this.lastReport = currentTime;
+            this.port.postMessage({
+                behind: (this.written - this.readPos) / this.rate,
+                target: this.target,
+                jitter: this.jitter,
+                underruns: this.underruns,
+                skipped: this.skipped
+            });
+        }
+        return true;
+    }
+}
+
+registerProcessor("playback-processor", PlaybackProcessor);
+"""
+
+# --- Capture Parameters ---
 CHUNK = 1024
-FORMAT = pyaudio.paInt16
 CHANNELS = 1
 RATE = 44100
+# mic, mic:<device>, file:<path>[:fast][:loop] or synthetic[:tone|noise|speech][:fast]
+AUDIO_SOURCE = os.environ.get("MAYA_AUDIO_SOURCE", "mic")
+# Frames buffered per subscriber before its overflow policy kicks in
+QUEUE_SIZE = 32
+LOOPBACK_QUEUE_SIZE = 8
+
+# --- Shared capture, broadcast to every consumer ---
+hub = CaptureHub(make_source(AUDIO_SOURCE, rate=RATE, channels=CHANNELS, chunk=CHUNK))
+metrics = MetricsRegistry()
 
-# --- Global variables for managing the audio stream ---
-p_audio = None
-stream = None
+# --- Synthesized speech, played out through the same /ws/audio path ---
+speech_source = PushSource(rate=RATE, channels=CHANNELS, chunk=CHUNK)
+speech_hub = CaptureHub(speech_source)
+STREAMS = {"mic": hub, "speech": speech_hub}
+speech_resamplers = {}
+
+# --- Global variables for managing the loopback stream ---
 stream_thread = None
 # Use a thread-safe event to signal the streaming loop
 is_streaming = threading.Event()
 
 def audio_streaming_task():
     """
-    The main audio processing loop.
-    This function runs in a separate thread.
+    The loopback playback loop.
+    This function runs in a separate thread and plays frames from the shared capture.
     """
-    global p_audio, stream
     print("* Stream thread started.")
-    
+    p_audio = None
+    stream = None
+    sub = hub.subscribe("loopback", maxsize=LOOPBACK_QUEUE_SIZE, policy=DROP_OLDEST)
+
     try:
+        import pyaudio
         p_audio = pyaudio.PyAudio()
-        stream = p_audio.open(format=FORMAT,
-                            channels=CHANNELS,
-                            rate=RATE,
-                            input=True,
+        stream = p_audio.open(format=p_audio.get_format_from_width(SAMPLE_WIDTH),
+                            channels=hub.source.channels,
+                            rate=hub.rate,
                             output=True,
-                            frames_per_buffer=CHUNK)
+                            frames_per_buffer=hub.chunk)
 
         while is_streaming.is_set():
-            data = stream.read(CHUNK, exception_on_overflow=False)
-            stream.write(data)
+            frame = sub.get(timeout=0.1)
+            if frame is not None:
+                stream.write(frame.data)
 
+    except SubscriberClosed:
+        print("* Loopback fell behind and was disconnected.")
     finally:
+        hub.unsubscribe(sub)
         if stream:
             stream.stop_stream()
             stream.close()
@@ -163,34 +442,137 @@ def audio_streaming_task():
 async def get():
     return HTMLResponse(html)
 
-@app.websocket("/ws/audio")
-async def websocket_endpoint(websocket: WebSocket):
+@router.get("/playback-worklet.js")
+async def playback_worklet():
+    return Response(playback_worklet_js, media_type="application/javascript")
+
+async def receive_client_reports(websocket: WebSocket, conn, sub):
+    """
+    Reads playback stats the client sends back; ends the subscription on
+    disconnect. A malformed message (not JSON, binary, bad fields) is skipped.
+    """
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+                if isinstance(message, dict) and message.get("type") == "client-stats":
+                    conn.observe_client(message)
+            except (ValueError, KeyError, TypeError):
+                continue
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sub.close()
+
+@router.websocket("/ws/audio")
+async def websocket_endpoint(websocket: WebSocket, policy: str = DROP_OLDEST, queue: int = QUEUE_SIZE,
+                             encoding: str = PCM16, rate: int = RATE, vad: bool = False, stream: str = "mic"):
+    if stream not in STREAMS:
+        await websocket.close(code=1008, reason=f"Unknown stream {stream!r}, expected one of {tuple(STREAMS)}")
+        return
+    hub = STREAMS[stream]
+    if policy not in POLICIES:
+        await websocket.close(code=1008, reason=f"Unknown overflow policy {policy!r}")
+        return
+    try:
+        encoder = StreamEncoder(encoding, in_rate=hub.rate, out_rate=min(rate, hub.rate))
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
     await websocket.accept()
-    p = None
-    stream = None
+    await websocket.send_json(encoder.describe())
+    # Optional speech gate: only voiced audio is sent, bracketed by events
+    gate = StreamingVAD(rate=hub.rate, chunk=hub.chunk) if vad else None
+    # The capture thread feeds the subscriber queue, the handler only ever
+    # awaits it, so one listening client can't stall the event loop.
+    sub = hub.subscribe(f"ws:{websocket.client}", maxsize=max(1, queue),
+                        policy=policy, loop=asyncio.get_running_loop())
+    conn = metrics.open(encoding, encoder.out_rate)
+    receiver = asyncio.create_task(receive_client_reports(websocket, conn, sub))
     try:
-        p = pyaudio.PyAudio()
-        stream = p.open(format=FORMAT,
-                        channels=CHANNELS,
-                        rate=RATE,
-                        input=True,
-                        frames_per_buffer=CHUNK)
-        
         while True:
-            data = stream.read(CHUNK)
-            await websocket.send_bytes(data)
+            frame = await sub.aget()
+            depth = sub.qsize()
+            events = gate.process(frame.data, frame) if gate else ((AUDIO, frame),)
+            for kind, payload in events:
+                if kind != AUDIO:
+                    await websocket.send_json({"type": kind, **payload})
+                    continue
+                packet = encoder.encode(payload.data)
+                if not packet:
+                    continue
+                packet = FRAME_HEADER.pack(payload.seq & 0xFFFFFFFF, payload.captured) + packet
+                start = time.time()
+                await websocket.send_bytes(packet)
+                conn.observe_send(payload.captured, start, time.time(), depth, len(packet))
+            conn.frames_dropped = sub.dropped
 
     except WebSocketDisconnect:
         print("Client disconnected from WebSocket.")
+    except SubscriberClosed:
+        if receiver.done():
+            print("Client disconnected from WebSocket.")
+        else:
+            print("WebSocket client fell behind and was disconnected.")
+            await websocket.close(code=1013, reason="Client too slow")
     finally:
-        if stream:
-            stream.stop_stream()
-            stream.close()
-        if p:
-            p.terminate()
+        receiver.cancel()
+        hub.unsubscribe(sub)
+        conn.frames_dropped = sub.dropped
+        metrics.close(conn)
+        if gate:
+            print(f"VAD suppressed {100 * gate.suppression():.1f}% of chunks.")
+        if sub.dropped:
+            print(f"WebSocket client dropped {sub.dropped} frames.")
         print("WebSocket audio resources cleaned up.")
 
-@app.get("/start")
+@router.post("/speech")
+async def queue_speech(request: Request, rate: int = RATE):
+    """
+    Queue a segment of mono Int16 PCM (the request body, at `rate` Hz) for
+    the speech stream. Segments play back to back in arrival order.
+    """
+    try:
+        queued = feed_speech(await request.body(), rate)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"queued_seconds": queued}
+
+def feed_speech(pcm, rate=RATE):
+    """
+    Queue Int16 PCM at `rate` Hz on the speech stream, resampling it to the
+    capture rate; returns the seconds of speech now queued. In-process
+    callers use this directly, remote ones go through POST /speech.
+    """
+    if len(pcm) % SAMPLE_WIDTH or rate <= 0:
+        raise ValueError("Body must be 16-bit PCM at a positive rate.")
+    if rate != speech_source.rate:
+        samples = np.frombuffer(pcm, dtype="<i2")
+        # Segments play back to back, so one resampler per input rate keeps the joins seamless
+        if rate not in speech_resamplers:
+            speech_resamplers[rate] = PolyphaseResampler(rate, speech_source.rate)
+        resampled = speech_resamplers[rate].process(samples)
+        pcm = np.clip(resampled, -32768, 32767).astype("<i2").tobytes()
+    speech_source.feed(pcm)
+    return speech_source.pending_seconds()
+
+@router.delete("/speech")
+async def clear_speech():
+    """Stop the co-presenter mid-sentence: drop all speech not yet played."""
+    speech_source.clear()
+    return {"queued_seconds": 0.0}
+
+@router.get("/stats")
+async def stats():
+    """Per-subscriber delivery and drop counters for the shared capture."""
+    return hub.stats()
+
+@router.get("/metrics")
+async def prometheus_metrics():
+    """Latency, queue depth and throughput per connection, in Prometheus text format."""
+    return PlainTextResponse(metrics.render(hub.stats()), media_type="text/plain; version=0.0.4")
+
+@router.get("/start")
 async def start_streaming():
     """Starts the audio stream."""
     global stream_thread
@@ -204,7 +586,7 @@ async def start_streaming():
     return {"status": "Audio stream started"}
 
 
-@app.get("/stop")
+@router.get("/stop")
 async def stop_streaming():
     """Stops the audio stream."""
     global stream_thread
@@ -214,11 +596,23 @@ async def stop_streaming():
     print("* Stopping audio stream...")
     is_streaming.clear()  # Clear the event to signal the loop to stop
     if stream_thread:
-        stream_thread.join()  # Wait for the thread to complete
+        # Wait for the thread to complete without blocking the event loop
+        await asyncio.to_thread(stream_thread.join)
         stream_thread = None
     return {"status": "Audio stream stopped"}
 
+app.include_router(router)
+
 if __name__ == "__main__":
-    # Run the FastAPI server
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    ap = argparse.ArgumentParser(description="Real-time audio streaming server")
+    ap.add_argument("--source", default=AUDIO_SOURCE,
+                    help="mic, mic:<device>, file:<path>[:fast][:loop] or synthetic[:tone|noise|speech][:fast]")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+    hub.source = make_source(args.source, rate=RATE, channels=CHANNELS, chunk=CHUNK)
+
+    # Run the FastAPI server; uvicorn is only needed here, not when the routes are imported
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
 
@@ -0,0 +1,98 @@
+from collections import deque
+
+import numpy as np
+
+# --- Events emitted by the VAD, in stream order ---
+SPEECH_START = "speech-start"
+SPEECH_END = "speech-end"
+AUDIO = "audio"
+
+
+class StreamingVAD:
+    """
+    Incremental energy + zero-crossing voice-activity detector for Int16
+    chunks. Silent chunks are swallowed; speech is passed through as AUDIO
+    events bracketed by SPEECH_START / SPEECH_END.
+
+    The noise floor follows the quietest recent chunks, and a chunk counts
+    as speech when it is loud enough above that floor and its zero-crossing
+    rate is in the voiced range (broadband hiss crosses zero far more
+    often). `preroll_ms` of audio before the onset is replayed with the
+    start event so word onsets are not clipped, and `hangover_ms` keeps the
+    gate open through short pauses between words.
+    """
+
+    def __init__(self, rate=44100, chunk=1024, margin_db=12.0, min_db=-55.0,
+                 max_zcr=0.35, hangover_ms=300, preroll_ms=200, onset_chunks=2):
+        self.rate = rate
+        self.margin_db = margin_db
+        self.min_db = min_db
+        self.max_zcr = max_zcr
+        chunk_ms = 1000 * chunk / rate
+        self.hangover_chunks = max(1, round(hangover_ms / chunk_ms))
+        self.onset_chunks = max(1, onset_chunks)
+        self.preroll = deque(maxlen=max(self.onset_chunks, round(preroll_ms / chunk_ms)))
+
+        self.noise_db = None
+        self.active = False
+        self.voiced_run = 0
+        self.silent_run = 0
+        self.chunks = 0
+        self.passed = 0
+
+    @staticmethod
+    def features(samples):
+        """Energy in dBFS and zero-crossing rate of one chunk."""
+        x = np.asarray(samples, dtype=np.float32) / 32768.0
+        if len(x) == 0:
+            return -120.0, 0.0
+        energy = float(np.dot(x, x)) / len(x)
+        energy_db = 10 * np.log10(energy + 1e-12)
+        zcr = np.count_nonzero(np.signbit(x[1:]) != np.signbit(x[:-1])) / len(x)
+        return energy_db, zcr
+
+    def is_speech(self, energy_db, zcr):
+        if self.noise_db is None:
+            self.noise_db = energy_db
+        threshold = max(self.min_db, self.noise_db + self.margin_db)
+        speech = energy_db > threshold and zcr < self.max_zcr
+        # Track the floor quickly downwards, slowly upwards, never on speech
+        if not speech:
+            rate = 0.3 if energy_db < self.noise_db else 0.02
+            self.noise_db += rate * (energy_db - self.noise_db)
+        return speech
+
+    def process(self, data, item=None):
+        """
+        Feed one chunk of Int16 bytes, get a list of (event, payload) tuples.
+        AUDIO payloads are `item` when given (e.g. a frame carrying sequence
+        metadata), otherwise the chunk itself.
+        """
+        item = data if item is None else item
+        self.chunks += 1
+        speech = self.is_speech(*self.features(np.frombuffer(data, dtype="<i2")))
+        events = []
+
+        if not self.active:
+            self.preroll.append(item)
+            self.voiced_run = self.voiced_run + 1 if speech else 0
+            if self.voiced_run >= self.onset_chunks:
+                self.active = True
+                self.silent_run = 0
+                events.append((SPEECH_START, {"chunk": self.chunks - len(self.preroll) + 1}))
+                events.extend((AUDIO, frame) for frame in self.preroll)
+                self.preroll.clear()
+        else:
+            events.append((AUDIO, item))
+            self.silent_run = 0 if speech else self.silent_run + 1
+            if self.silent_run >= self.hangover_chunks:
+                self.active = False
+                self.voiced_run = 0
+                events.append((SPEECH_END, {"chunk": self.chunks}))
+
+        self.passed += sum(1 for kind, _ in events if kind == AUDIO)
+        return events
+
+    def suppression(self):
+        """Fraction of chunks seen so far that were gated out."""
+        return 1 - self.passed / self.chunks if self.chunks else 0.0
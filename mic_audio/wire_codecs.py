@@ -0,0 +1,177 @@
+import struct
+
+import numpy as np
+
+from resample import PolyphaseResampler
+
+# --- Wire encodings a client can ask for ---
+PCM16 = "pcm16"
+MULAW = "mulaw"
+ADPCM = "adpcm"
+ENCODINGS = (PCM16, MULAW, ADPCM)
+
+# Prepended to every audio packet: sequence number (uint32) and
+# wall-clock capture time in seconds (float64), little-endian
+FRAME_HEADER = struct.Struct("<Id")
+
+# --- G.711 mu-law ---
+MULAW_BIAS = 0x84
+MULAW_BIAS14 = 0x21
+MULAW_CLIP14 = 8159
+
+
+def mulaw_encode(samples):
+    """Int16 samples -> 8-bit mu-law codes (vectorized G.711, 14-bit path)."""
+    x = np.asarray(samples, dtype=np.int32) >> 2
+    neg = x < 0
+    mag = np.minimum(np.where(neg, -x, x), MULAW_CLIP14) + MULAW_BIAS14
+    # frexp gives the bit length of mag; the segment is bit_length - 6
+    seg = np.maximum(np.frexp(mag)[1] - 6, 0)
+    code = (np.minimum(seg, 7) << 4) | ((mag >> (seg + 1)) & 0x0F)
+    code = np.where(seg > 7, 0x7F, code)
+    return (code ^ np.where(neg, 0x7F, 0xFF)).astype(np.uint8)
+
+
+def mulaw_decode(codes):
+    """8-bit mu-law codes -> Int16 samples."""
+    u = ~np.asarray(codes, dtype=np.int32) & 0xFF
+    exponent = (u >> 4) & 0x07
+    mantissa = u & 0x0F
+    mag = (((mantissa << 3) + MULAW_BIAS) << exponent) - MULAW_BIAS
+    return np.where(u & 0x80, -mag, mag).astype(np.int16)
+
+
+# --- IMA-ADPCM ---
+IMA_INDEX_TABLE = (-1, -1, -1, -1, 2, 4, 6, 8,
+                   -1, -1, -1, -1, 2, 4, 6, 8)
+IMA_STEP_TABLE = (
+    7, 8, 9, 10, 11, 12, 13, 14, 16, 17, 19, 21, 23, 25, 28, 31, 34, 37, 41,
+    45, 50, 55, 60, 66, 73, 80, 88, 97, 107, 118, 130, 143, 157, 173, 190,
+    209, 230, 253, 279, 307, 337, 371, 408, 449, 494, 544, 598, 658, 724,
+    796, 876, 963, 1060, 1166, 1282, 1411, 1552, 1707, 1878, 2066, 2272,
+    2499, 2749, 3024, 3327, 3660, 4026, 4428, 4871, 5358, 5894, 6484, 7132,
+    7845, 8630, 9493, 10442, 11487, 12635, 13899, 15289, 16818, 18500,
+    20350, 22385, 24623, 27086, 29794, 32767,
+)
+# predictor (int16), step index (uint8), 1 if the last nibble is padding
+ADPCM_HEADER = struct.Struct("<hBB")
+
+
+class ImaAdpcmEncoder:
+    """
+    4-bit IMA-ADPCM. Every packet starts with the encoder state, so a
+    client can decode any packet on its own and recovers from drops.
+    The sample recurrence is inherently serial, so this one stays a plain
+    loop over Python ints.
+    """
+
+    def __init__(self):
+        self.predictor = 0
+        self.index = 0
+
+    def encode(self, samples):
+        samples = np.asarray(samples, dtype=np.int16).tolist()
+        pad = len(samples) & 1
+        header = ADPCM_HEADER.pack(self.predictor, self.index, pad)
+
+        predictor = self.predictor
+        index = self.index
+        nibbles = []
+        for sample in samples:
+            step = IMA_STEP_TABLE[index]
+            diff = sample - predictor
+            nibble = 0
+            if diff < 0:
+                nibble = 8
+                diff = -diff
+            vpdiff = step >> 3
+            if diff >= step:
+                nibble |= 4
+                diff -= step
+                vpdiff += step
+            step >>= 1
+            if diff >= step:
+                nibble |= 2
+                diff -= step
+                vpdiff += step
+            step >>= 1
+            if diff >= step:
+                nibble |= 1
+                vpdiff += step
+
+            if nibble & 8:
+                predictor = max(-32768, predictor - vpdiff)
+            else:
+                predictor = min(32767, predictor + vpdiff)
+            index = min(88, max(0, index + IMA_INDEX_TABLE[nibble]))
+            nibbles.append(nibble)
+
+        self.predictor = predictor
+        self.index = index
+        if pad:
+            nibbles.append(0)
+        packed = bytes(lo | (hi << 4) for lo, hi in zip(nibbles[0::2], nibbles[1::2]))
+        return header + packed
+
+
+def adpcm_decode(packet):
+    """Decode one self-contained IMA-ADPCM packet to Int16 samples."""
+    predictor, index, pad = ADPCM_HEADER.unpack_from(packet)
+    out = []
+    for byte in packet[ADPCM_HEADER.size:]:
+        for nibble in (byte & 0x0F, byte >> 4):
+            step = IMA_STEP_TABLE[index]
+            vpdiff = step >> 3
+            if nibble & 4:
+                vpdiff += step
+            if nibble & 2:
+                vpdiff += step >> 1
+            if nibble & 1:
+                vpdiff += step >> 2
+            if nibble & 8:
+                predictor = max(-32768, predictor - vpdiff)
+            else:
+                predictor = min(32767, predictor + vpdiff)
+            index = min(88, max(0, index + IMA_INDEX_TABLE[nibble]))
+            out.append(predictor)
+    if pad:
+        out.pop()
+    return np.array(out, dtype=np.int16)
+
+
+class StreamEncoder:
+    """
+    Per-connection pipeline from captured Int16 chunks to wire packets:
+    optional resampling to `out_rate`, then the selected encoding.
+    """
+
+    def __init__(self, encoding=PCM16, in_rate=44100, out_rate=16000):
+        if encoding not in ENCODINGS:
+            raise ValueError(f"Unknown encoding {encoding!r}, expected one of {ENCODINGS}")
+        if not 0 < out_rate <= in_rate:
+            raise ValueError(f"Output rate must be between 1 and {in_rate} Hz, got {out_rate}")
+        self.encoding = encoding
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        self.resampler = PolyphaseResampler(in_rate, out_rate) if out_rate != in_rate else None
+        self.adpcm = ImaAdpcmEncoder() if encoding == ADPCM else None
+
+    def describe(self):
+        """Format message sent to the client before the first packet."""
+        return {"type": "format", "encoding": self.encoding, "rate": self.out_rate, "channels": 1,
+                "header_bytes": FRAME_HEADER.size}
+
+    def encode(self, data):
+        if self.encoding == PCM16 and self.resampler is None:
+            return data
+
+        samples = np.frombuffer(data, dtype="<i2")
+        if self.resampler is not None:
+            y = self.resampler.process(samples)
+            samples = np.clip(np.rint(y), -32768, 32767).astype("<i2")
+
+        if self.encoding == MULAW:
+            return mulaw_encode(samples).tobytes()
+        if self.encoding == ADPCM:
+            return self.adpcm.encode(samples)
+        return samples.tobytes()
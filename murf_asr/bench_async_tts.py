@@ -0,0 +1,74 @@
+"""
+Batch synthesis: serial MurfTTSClient vs AsyncMurfTTSClient.generate_many.
+
+Both clients talk real HTTP to a local FakeMurfServer (so connection reuse
+is measured, not assumed), with the speech cache disabled so every line
+is a network round trip. Reports wall time, lines per second and the TCP
+connections each run opened.
+
+    python bench_async_tts.py --lines 48 --latency 0.3 --concurrency 1 4 8 16
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from murf import Murf
+
+from fake_murf import FakeMurfServer, local_environment
+from murf_asr import AsyncMurfTTSClient, MurfTTSClient
+
+# The fake server accepts any key
+os.environ.setdefault("MURF_API_KEY", "bench")
+
+
+def deck_lines(n):
+    return [dict(voice_id="en-US-natalie", style="Conversational",
+                 text=f"Slide {i + 1}: here is what this slide is about.",
+                 rate=0, multi_native_locale="en-IN") for i in range(n)]
+
+
+def run_serial(server, lines):
+    client = MurfTTSClient(cache=False, client=Murf(api_key="bench",
+                                                    environment=local_environment(server.url)))
+    start = time.perf_counter()
+    for line in lines:
+        client.generate_speech(**line)
+    return time.perf_counter() - start
+
+
+async def run_async(server, lines, concurrency):
+    async with AsyncMurfTTSClient(cache=False, environment=local_environment(server.url),
+                                  max_connections=concurrency) as client:
+        start = time.perf_counter()
+        audio = await client.generate_many(lines, concurrency=concurrency)
+        elapsed = time.perf_counter() - start
+    assert len(audio) == len(lines) and all(audio)
+    return elapsed
+
+
+def report(name, server, lines, elapsed):
+    print(f"  {name:22s} {elapsed:8.2f} s  {len(lines) / elapsed:7.1f} lines/s  "
+          f"connections={server.connections:3d}  peak in flight={server.peak_in_flight:3d}")
+    server.reset_counters()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--lines", type=int, default=48)
+    ap.add_argument("--latency", type=float, default=0.3, help="simulated Murf latency (s)")
+    ap.add_argument("--jitter", type=float, default=0.1)
+    ap.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = ap.parse_args()
+
+    lines = deck_lines(args.lines)
+    with FakeMurfServer(latency=args.latency, jitter=args.jitter) as server:
+        print(f"{args.lines} lines, simulated latency {args.latency * 1000:.0f} ms "
+              f"+ up to {args.jitter * 1000:.0f} ms jitter")
+        report("serial (sync client)", server, lines, run_serial(server, lines))
+        for n in args.concurrency:
+            report(f"async concurrency={n}", server, lines, asyncio.run(run_async(server, lines, n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Tail latency of the Murf client with and without hedged requests.
+
+A local FakeMurfServer answers most requests in `--latency` seconds but
+makes `--spike-rate` of them take `--spike-latency`. The same stream of
+(uncached) lines goes through the plain AsyncMurfTTSClient and through
+HedgedTTS at a few hedge percentiles; the extra load hedging costs is
+shown as requests per line. A last run simulates an outage to show the
+circuit breaker failing over to pre-rendered audio.
+
+    python bench_hedging.py --lines 300 --spike-rate 0.05 --spike-latency 2.5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from fake_murf import FakeMurfServer, local_environment
+from hedging import HedgedTTS, TTSUnavailable
+from murf_asr import AsyncMurfTTSClient
+
+# The fake server accepts any key
+os.environ.setdefault("MURF_API_KEY", "bench")
+
+VOICE = dict(voice_id="en-US-natalie", style="Conversational", rate=0, multi_native_locale="en-IN")
+
+
+def pct(sorted_ms, p):
+    return sorted_ms[min(len(sorted_ms) - 1, int(p / 100 * len(sorted_ms)))]
+
+
+async def run(speak, lines, concurrency):
+    """Speak `lines` with `concurrency` presenters in parallel; per-line latencies in ms."""
+    times = []
+    queue = list(lines)
+
+    async def presenter():
+        while queue:
+            text = queue.pop()
+            start = time.perf_counter()
+            await speak(text=text, **VOICE)
+            times.append(1000 * (time.perf_counter() - start))
+
+    await asyncio.gather(*(presenter() for _ in range(concurrency)))
+    return sorted(times)
+
+
+def report(name, times, server, lines):
+    print(f"  {name:18s} p50={pct(times, 50):6.0f}  p95={pct(times, 95):6.0f}  p99={pct(times, 99):6.0f}  "
+          f"max={times[-1]:6.0f} ms   requests/line={server.requests / lines:.2f}")
+    server.reset_counters()
+
+
+async def main(args):
+    server = FakeMurfServer(latency=args.latency, jitter=args.latency / 3, spike_rate=args.spike_rate,
+                            spike_latency=args.spike_latency).start()
+    env = local_environment(server.url)
+    print(f"Latency {args.latency * 1000:.0f} ms (+jitter), {100 * args.spike_rate:.0f}% spikes "
+          f"of {args.spike_latency * 1000:.0f} ms, {args.lines} lines")
+    try:
+        async with AsyncMurfTTSClient(cache=False, environment=env) as tts:
+            lines = [f"Plain line {i}." for i in range(args.lines)]
+            report("plain", await run(tts.generate_speech, lines, args.concurrency), server, args.lines)
+            for p in args.percentiles:
+                hedged = HedgedTTS(tts, deadline=args.deadline, hedge_percentile=p)
+                lines = [f"Hedged p{p} line {i}." for i in range(args.lines)]
+                times = await run(hedged.generate_speech, lines, args.concurrency)
+                report(f"hedged at p{p}", times, server, args.lines)
+                print(f"  {'':18s} {hedged.stats()}")
+
+            # Outage: every request is slow; the breaker should trip and fail over
+            server.latency, server.spike_rate = 10.0, 0.0
+            hedged = HedgedTTS(tts, deadline=0.5, fallback=lambda text: b"pre-rendered")
+            start = time.perf_counter()
+            served = 0
+            for i in range(20):
+                try:
+                    await hedged.generate_speech(text=f"Outage line {i}.", **VOICE)
+                    served += 1
+                except TTSUnavailable:
+                    pass
+            print(f"  outage: 20 lines in {time.perf_counter() - start:.2f} s, {served} served, "
+                  f"{hedged.stats()}")
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--lines", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=8)
+    ap.add_argument("--latency", type=float, default=0.3, help="typical Murf latency (s)")
+    ap.add_argument("--spike-rate", type=float, default=0.05)
+    ap.add_argument("--spike-latency", type=float, default=2.5)
+    ap.add_argument("--deadline", type=float, default=4.0)
+    ap.add_argument("--percentiles", type=float, nargs="+", default=[90, 95])
+    asyncio.run(main(ap.parse_args()))
@@ -0,0 +1,117 @@
+"""
+Hit rate and perceived latency of slide narration with and without prefetch.
+
+Replays a seeded navigation trace (mostly "next", some "back", some skips
+ahead) over a deck. On every slide the co-presenter says the slide's
+lines in order; the time until each line's audio is ready is what the
+audience waits for. Synthesis goes to a local FakeMurfServer.
+
+    python bench_prefetch.py --slides 30 --steps 25 --ahead 0 1 3
+    python bench_prefetch.py --deck ../pptx_module/test.json   # PPTParser output
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import time
+
+from fake_murf import FakeMurfServer, local_environment
+from murf_asr import AsyncMurfTTSClient
+from prefetch import SlidePrefetcher, slide_lines
+from tts_cache import TTSCache, cache_key
+
+# The fake server accepts any key
+os.environ.setdefault("MURF_API_KEY", "bench")
+
+VOICE = dict(voice_id="en-US-natalie", style="Conversational", rate=0, multi_native_locale="en-IN")
+
+
+def synthetic_deck(n, seed=0):
+    rng = random.Random(seed)
+    topics = ["revenue", "latency", "architecture", "roadmap", "hiring", "security", "costs", "customers"]
+    deck = [{"file_name": "synthetic"}]
+    for i in range(1, n + 1):
+        topic = rng.choice(topics)
+        deck.append({"slide_number": i, "title": f"{topic.title()} update, part {i}", "shapes": [
+            {"type": "Shape", "text": f"Our {topic} numbers moved {rng.randint(2, 40)} percent this quarter."},
+            {"type": "Shape", "text": f"Next we look at what drives {topic} on slide {i + 1}."},
+        ]})
+    return deck
+
+
+def navigation_trace(slides, steps, seed=0):
+    """[(slide number, dwell seconds)]: 80% next, 10% back, 10% skip 2-5 ahead."""
+    rng = random.Random(seed)
+    current, trace = 1, []
+    for _ in range(steps):
+        trace.append((current, rng.uniform(1.0, 2.5)))
+        r = rng.random()
+        if r < 0.8:
+            current += 1
+        elif r < 0.9:
+            current -= 1
+        else:
+            current += rng.randint(2, 5)
+        current = min(max(current, 1), slides)
+    return trace
+
+
+async def replay(server, deck, trace, ahead, speed):
+    cache = TTSCache()
+    async with AsyncMurfTTSClient(cache=cache, environment=local_environment(server.url)) as tts:
+        prefetcher = None
+        if ahead:
+            prefetcher = SlidePrefetcher(tts, deck, VOICE, ahead=ahead)
+            prefetcher.start(trace[0][0])
+        lines = {s["slide_number"]: slide_lines(s) for s in deck if "slide_number" in s}
+        first, rest = [], []  # (hit, seconds)
+        for slide, dwell in trace:
+            arrived = time.perf_counter()
+            if prefetcher:
+                prefetcher.set_current(slide)
+            for rank, text in enumerate(lines[slide]):
+                hit = cache_key(text=text, **VOICE) in cache
+                start = time.perf_counter()
+                await tts.generate_speech(text=text, **VOICE)
+                (rest if rank else first).append((hit, time.perf_counter() - start))
+            await asyncio.sleep(max(0.0, dwell / speed - (time.perf_counter() - arrived)))
+        stats = prefetcher.stats() if prefetcher else {}
+        if prefetcher:
+            await prefetcher.stop()
+    return first, rest, stats
+
+
+def summarize(samples):
+    hits = sum(1 for hit, _ in samples if hit) / len(samples)
+    ms = sorted(1000 * s for _, s in samples)
+    return hits, statistics.mean(ms), ms[int(0.95 * (len(ms) - 1))]
+
+
+async def main(args):
+    deck = json.load(open(args.deck)) if args.deck else synthetic_deck(args.slides)
+    count = sum(1 for s in deck if "slide_number" in s)
+    trace = navigation_trace(count, args.steps)
+    with FakeMurfServer(latency=args.latency, jitter=args.latency / 4) as server:
+        print(f"{count} slides, {len(trace)} navigation steps, simulated latency {args.latency * 1000:.0f} ms")
+        print(f"{'ahead':>5s} {'1st-line hits':>13s} {'1st mean':>9s} {'1st p95':>8s} "
+              f"{'all hits':>9s} {'all mean':>9s} {'requests':>9s} {'cancelled':>9s}")
+        for ahead in args.ahead:
+            server.reset_counters()
+            first, rest, stats = await replay(server, deck, trace, ahead, args.speed)
+            f_hits, f_mean, f_p95 = summarize(first)
+            a_hits, a_mean, _ = summarize(first + rest)
+            print(f"{ahead:5d} {100 * f_hits:12.0f}% {f_mean:6.0f} ms {f_p95:5.0f} ms "
+                  f"{100 * a_hits:8.0f}% {a_mean:6.0f} ms {server.requests:9d} {stats.get('cancelled', 0):9d}")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--deck", help="JSON written by PPTParser (default: a synthetic deck)")
+    ap.add_argument("--slides", type=int, default=30)
+    ap.add_argument("--steps", type=int, default=25)
+    ap.add_argument("--ahead", type=int, nargs="+", default=[0, 1, 3])
+    ap.add_argument("--latency", type=float, default=0.4, help="simulated Murf latency (s)")
+    ap.add_argument("--speed", type=float, default=1.0, help="replay the trace this many times faster")
+    asyncio.run(main(ap.parse_args()))
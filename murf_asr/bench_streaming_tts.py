@@ -0,0 +1,94 @@
+"""
+Time to first audio: whole-utterance synthesis vs sentence-chunked streaming.
+
+Against a local FakeMurfServer whose response time grows with the length
+of the text, each reply is synthesized once as a single generate_speech
+call and once through stream_speech(). For the stream it also plays the
+segments back on a simulated clock and reports any gaps where the next
+segment was not ready when the previous one finished.
+
+    python bench_streaming_tts.py --latency 0.25 --per-char 0.004
+    python bench_streaming_tts.py --play http://127.0.0.1:8000   # also send to the audio server
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from fake_murf import FakeMurfServer, local_environment
+from murf_asr import AsyncMurfTTSClient
+from speech_stream import PLAYBACK_FORMAT, play_segments, split_for_speech, wav_pcm
+
+# The fake server accepts any key
+os.environ.setdefault("MURF_API_KEY", "bench")
+
+VOICE = dict(voice_id="en-US-natalie", style="Conversational", rate=0, multi_native_locale="en-IN")
+
+REPLIES = {
+    "short": "Sure, moving to the next slide.",
+    "medium": ("This slide shows the quarterly results. Revenue grew by twelve percent, "
+               "mostly from the new enterprise plan. Costs stayed flat, so margins improved."),
+    "long": ("Let me walk you through the architecture. On the left, the capture service records "
+             "the presenter's voice and streams it over a WebSocket. In the middle, the speech "
+             "recognizer turns it into text, which the intent matcher maps to slide commands. "
+             "When the co-presenter needs to speak, its reply is synthesized sentence by sentence "
+             "and played through the same audio path, so listeners hear it almost immediately. "
+             "Finally, the controller drives PowerPoint, and every slide change is pushed back "
+             "to the browser. Any questions before we move on?"),
+}
+
+
+async def whole(client, text):
+    start = time.perf_counter()
+    await client.generate_speech(text=text, **VOICE, **PLAYBACK_FORMAT)
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed, 0.0
+
+
+async def streamed(client, text, lookahead):
+    start = time.perf_counter()
+    first = None
+    playing_until = 0.0  # simulated playback clock, seconds since start
+    gaps = 0.0
+    async for segment in client.stream_speech(text=text, lookahead=lookahead, **VOICE, **PLAYBACK_FORMAT):
+        now = time.perf_counter() - start
+        if first is None:
+            first = now
+        elif now > playing_until:
+            gaps += now - playing_until
+        pcm, rate = wav_pcm(segment)
+        playing_until = max(now, playing_until) + len(pcm) / 2 / rate
+    return first, time.perf_counter() - start, gaps
+
+
+async def run(args, server):
+    async with AsyncMurfTTSClient(cache=False, environment=local_environment(server.url)) as client:
+        print(f"{'reply':7s} {'chars':>5s} {'chunks':>6s} {'whole TTFB':>11s} {'stream TTFB':>12s} "
+              f"{'stream total':>13s} {'gaps':>7s}")
+        for name, text in REPLIES.items():
+            chunks = len(split_for_speech(text))
+            w_first, _, _ = await whole(client, text)
+            s_first, s_total, gaps = await streamed(client, text, args.lookahead)
+            print(f"{name:7s} {len(text):5d} {chunks:6d} {w_first * 1000:8.0f} ms {s_first * 1000:9.0f} ms "
+                  f"{s_total * 1000:10.0f} ms {gaps * 1000:4.0f} ms")
+        if args.play:
+            segments = client.stream_speech(text=REPLIES["long"], lookahead=args.lookahead,
+                                            **VOICE, **PLAYBACK_FORMAT)
+            queued = await play_segments(segments, args.play)
+            print(f"Sent the long reply to {args.play}; {queued:.1f} s still queued for playback")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--latency", type=float, default=0.25, help="simulated base latency (s)")
+    ap.add_argument("--per-char", type=float, default=0.004, help="simulated latency per character (s)")
+    ap.add_argument("--lookahead", type=int, default=3)
+    ap.add_argument("--play", metavar="URL", help="also stream the long reply to this audio server")
+    args = ap.parse_args()
+    with FakeMurfServer(latency=args.latency, per_char=args.per_char) as server:
+        print(f"Simulated latency {args.latency * 1000:.0f} ms + {args.per_char * 1000:.1f} ms/char")
+        asyncio.run(run(args, server))
+
+
+if __name__ == "__main__":
+    main()
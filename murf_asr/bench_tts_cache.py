@@ -0,0 +1,80 @@
+"""
+Cold vs warm latency of MurfTTSClient.generate_speech with the speech cache.
+
+A stand-in Murf client answers after a fixed delay, so this runs offline.
+Three passes over the same co-presenter lines: cold (every call goes to
+the "network"), warm in-memory, and warm from disk in a fresh client
+(memory tier empty, as after a restart).
+
+    python bench_tts_cache.py --latency 0.4
+"""
+import argparse
+import base64
+import os
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+
+from murf_asr import MurfTTSClient
+from tts_cache import TTSCache
+
+PHRASES = [
+    "Moving to the next slide.",
+    "Let's go back to the previous slide.",
+    "Here is the architecture overview.",
+    "Any questions so far?",
+    "As you can see in this chart, latency stays below one second.",
+    "Thank you for your attention.",
+]
+
+
+class FakeTextToSpeech:
+    def __init__(self, latency, audio_bytes):
+        self.latency = latency
+        self.audio_bytes = audio_bytes
+
+    def generate(self, **kwargs):
+        time.sleep(self.latency)
+        return SimpleNamespace(encoded_audio=base64.b64encode(os.urandom(self.audio_bytes)).decode("ascii"))
+
+
+def timed_pass(client, repeat):
+    times = []
+    for _ in range(repeat):
+        for text in PHRASES:
+            start = time.perf_counter()
+            client.generate_speech(voice_id="en-US-natalie", style="Conversational", text=text,
+                                   rate=0, multi_native_locale="en-IN")
+            times.append(time.perf_counter() - start)
+    return times
+
+
+def report(name, times):
+    ms = sorted(t * 1000 for t in times)
+    print(f"  {name:12s} n={len(ms):3d}  median={statistics.median(ms):9.3f} ms  "
+          f"max={ms[-1]:9.3f} ms")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--latency", type=float, default=0.4, help="simulated Murf latency (s)")
+    ap.add_argument("--audio-kb", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    fake = SimpleNamespace(text_to_speech=FakeTextToSpeech(args.latency, args.audio_kb * 1024))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = MurfTTSClient(cache=TTSCache(cache_dir), client=fake)
+        print(f"Simulated latency {args.latency * 1000:.0f} ms, {args.audio_kb} KB per line")
+        report("cold", timed_pass(client, 1))
+        report("warm memory", timed_pass(client, args.repeat))
+
+        restarted = MurfTTSClient(cache=TTSCache(cache_dir), client=fake)
+        report("warm disk", timed_pass(restarted, 1))
+        print(f"  first client:  {client.cache_stats()}")
+        print(f"  after restart: {restarted.cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
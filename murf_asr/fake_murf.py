@@ -0,0 +1,189 @@
+"""
+Local stand-in for the Murf speech API, for benchmarks and offline runs.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to answer
+POST /v1/speech/generate with a GenerateSpeechResponse-shaped JSON body
+after a configurable delay. It runs its own event loop in a background
+thread, so both the sync and the async Murf clients can be pointed at it
+with `local_environment(server.url)`.
+"""
+import asyncio
+import base64
+import inspect
+import io
+import json
+import math
+import random
+import struct
+import threading
+import wave
+
+from murf import MurfEnvironment
+
+
+def local_environment(url):
+    """A MurfEnvironment whose every region resolves to `url`."""
+    fields = inspect.signature(MurfEnvironment.__init__).parameters
+    return MurfEnvironment(**{name: url for name in fields if name != "self"})
+
+
+def tone_wav(seconds, rate):
+    """Base64 of a quiet 220 Hz mono 16-bit WAV, `seconds` long."""
+    n = int(seconds * rate)
+    samples = (int(3000 * math.sin(2 * math.pi * 220 * i / rate)) for i in range(n))
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wf:
+        wf.setnchannels(1)
+        wf.setsampwidth(2)
+        wf.setframerate(rate)
+        wf.writeframes(struct.pack(f"<{n}h", *samples))
+    return base64.b64encode(out.getvalue()).decode("ascii")
+
+
+class FakeMurfServer:
+    """
+    latency: base response time in seconds, plus uniform `jitter`, plus
+        `per_char` seconds for every character of text.
+    spike_rate / spike_latency: fraction of requests that take
+        `spike_latency` instead, to imitate a slow tail.
+    audio_bytes: size of the (random) audio returned per request. Requests
+        for WAV get a tone as long as the text would take to say instead.
+    """
+
+    def __init__(self, latency=0.3, jitter=0.0, spike_rate=0.0, spike_latency=2.0,
+                 audio_bytes=32 * 1024, host="127.0.0.1", port=0, seed=0, per_char=0.0):
+        self.latency = latency
+        self.per_char = per_char
+        self.jitter = jitter
+        self.spike_rate = spike_rate
+        self.spike_latency = spike_latency
+        self.audio = base64.b64encode(random.Random(seed).randbytes(audio_bytes)).decode("ascii")
+        self.random = random.Random(seed)
+        self.host = host
+        self.port = port
+        self.loop = None
+        self.server = None
+        self.thread = None
+        self.writers = set()
+        self.connections = 0
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def delay(self, text=""):
+        if self.spike_rate and self.random.random() < self.spike_rate:
+            return self.spike_latency
+        return self.latency + self.per_char * len(text) + self.random.uniform(0, self.jitter)
+
+    # --- Lifecycle ---
+    def start(self):
+        ready = threading.Event()
+
+        def run():
+            self.loop = asyncio.new_event_loop()
+            self.server = self.loop.run_until_complete(
+                asyncio.start_server(self.handle, self.host, self.port))
+            self.port = self.server.sockets[0].getsockname()[1]
+            ready.set()
+            self.loop.run_forever()
+
+        self.thread = threading.Thread(target=run, daemon=True)
+        self.thread.start()
+        ready.wait()
+        return self
+
+    def stop(self):
+        if self.loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.shutdown(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+        self.loop = None
+
+    async def shutdown(self):
+        # Idle keep-alive connections are parked in handle(); end them too
+        self.server.close()
+        for writer in list(self.writers):
+            writer.close()
+        tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_counters(self):
+        self.connections = self.requests = self.peak_in_flight = 0
+
+    # --- HTTP ---
+    async def handle(self, reader, writer):
+        self.connections += 1
+        self.writers.add(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                status, payload = await self.respond(method, path, body)
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    async def respond(self, method, path, body):
+        if method != "POST" or not path.startswith("/v1/speech/generate"):
+            return "404 Not Found", {"errorMessage": f"no route {method} {path}"}
+        request = json.loads(body or b"{}")
+        text = request.get("text", "")
+        self.requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay(text))
+        finally:
+            self.in_flight -= 1
+        audio = self.audio
+        if request.get("format") == "WAV":
+            audio = tone_wav(len(text) / 15, int(request.get("sampleRate") or 44100))
+        return "200 OK", {
+            "audioFile": f"{self.url}/audio/{self.requests}.wav",
+            "encodedAudio": audio if request.get("encodeAsBase64") else None,
+            "audioLengthInSeconds": len(text) / 15,
+            "remainingCharacterCount": 100000,
+            "wordDurations": [],
+        }
+
+
+if __name__ == "__main__":
+    import time
+    with FakeMurfServer() as server:
+        print(f"Fake Murf API on {server.url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,234 @@
+import asyncio
+import time
+from collections import deque
+
+from murf_asr import audio_bytes
+from tts_cache import cache_key
+
+# --- Circuit breaker states ---
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class TTSUnavailable(Exception):
+    """Raised when speech can't be produced in time and there is nothing to fall back to."""
+
+
+class RollingLatency:
+    """The last `size` request latencies, for percentile-based hedge delays."""
+
+    def __init__(self, size=256):
+        self.samples = deque(maxlen=size)
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def __len__(self):
+        return len(self.samples)
+
+    def percentile(self, pct):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive failures, so callers go straight to
+    their fallback instead of waiting out a deadline on every line. After
+    `reset_after` seconds one trial call is let through (half-open); its
+    success closes the breaker again, its failure re-opens it.
+    """
+
+    def __init__(self, threshold=3, reset_after=10.0):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return HALF_OPEN
+        return OPEN
+
+    def allow(self):
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self.trial:
+            self.trial = True
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+
+    def failure(self):
+        self.failures += 1
+        if self.trial or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+        self.trial = False
+
+    def abandon(self):
+        """The call let through was cancelled before it got an answer; let the next one try."""
+        self.trial = False
+
+
+class HedgedTTS:
+    """
+    Tail-latency control around an AsyncMurfTTSClient.
+
+    Every call gets a deadline. If the first attempt is still running once
+    it has taken longer than the `hedge_percentile` of recent latencies, a
+    duplicate request is fired and whichever answers first wins; the other
+    is cancelled. A failed attempt is replaced right away while time
+    remains. Calls that still miss the deadline, or arrive while the
+    circuit breaker is open, are answered from the cache or from
+    `fallback` (a dict of pre-rendered text -> audio, or a callable
+    returning audio or None), else TTSUnavailable is raised.
+    """
+
+    def __init__(self, tts, deadline=3.0, hedge_percentile=95, max_hedges=1, min_hedge_delay=0.05,
+                 initial_hedge_delay=1.0, min_samples=20, breaker=None, fallback=None, window=256):
+        self.tts = tts
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.max_hedges = max_hedges
+        self.min_hedge_delay = min_hedge_delay
+        self.initial_hedge_delay = initial_hedge_delay
+        self.min_samples = min_samples
+        self.breaker = breaker or CircuitBreaker()
+        self.fallback = fallback
+        self.latency = RollingLatency(window)
+        self.calls = 0
+        self.attempts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.timeouts = 0
+        self.fallbacks = 0
+
+    def hedge_delay(self):
+        """How long the first attempt may run before a duplicate is fired."""
+        if len(self.latency) < self.min_samples:
+            return self.initial_hedge_delay
+        return max(self.min_hedge_delay, self.latency.percentile(self.hedge_percentile))
+
+    async def _attempt(self, request):
+        start = time.monotonic()
+        response = await self.tts.client.text_to_speech.generate(**request)
+        self.latency.record(time.monotonic() - start)
+        return audio_bytes(response)
+
+    async def generate_speech(self, voice_id: str, style: str, text: str, rate: int, multi_native_locale: str,
+                              deadline=None, **kwargs):
+        self.calls += 1
+        key = cache_key(voice_id, style, text, rate, multi_native_locale, **kwargs)
+        cache = self.tts.cache
+        if cache is not None:
+            audio = cache.get(key)
+            if audio is not None:
+                return audio
+        if not self.breaker.allow():
+            return self._fall_back(text, "circuit open")
+
+        kwargs.setdefault("encode_as_base_64", True)
+        # Hedging replaces the SDK's own retries
+        kwargs.setdefault("request_options", {"max_retries": 0})
+        request = dict(voice_id=voice_id, style=style, text=text, rate=rate,
+                       multi_native_locale=multi_native_locale, **kwargs)
+        give_up = time.monotonic() + (deadline or self.deadline)
+        hedge_at = time.monotonic() + self.hedge_delay()
+        tasks = []
+        started = []
+        error = None
+
+        def launch():
+            self.attempts += 1
+            started.append(time.monotonic())
+            tasks.append(asyncio.ensure_future(self._attempt(request)))
+
+        def censored(task, start, end):
+            # An attempt cut short took at least this long; leaving it out
+            # would bias the percentile low
+            if not task.done():
+                self.latency.record(end - start)
+
+        launch()
+        try:
+            while True:
+                pending = [t for t in tasks if not t.done()]
+                can_hedge = len(tasks) <= self.max_hedges
+                if not pending:
+                    if not can_hedge:
+                        break
+                    launch()  # the previous attempt failed; retry at once
+                    continue
+                now = time.monotonic()
+                wake = min(give_up, hedge_at) if can_hedge else give_up
+                if now >= give_up:
+                    self.timeouts += 1
+                    for task, start in zip(tasks, started):
+                        censored(task, start, give_up)
+                    break
+                if can_hedge and now >= hedge_at:
+                    self.hedges += 1
+                    launch()
+                    continue
+                done, _ = await asyncio.wait(pending, timeout=wake - now,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    audio = task.result()
+                    if task is not tasks[0]:
+                        self.hedge_wins += 1
+                        censored(tasks[0], started[0], time.monotonic())
+                    # A losing hedge is not kept: cut short early, it would
+                    # pull hedge_delay() down and fire ever more hedges
+                    self.breaker.success()
+                    if cache is not None:
+                        cache.put(key, audio)
+                    return audio
+        except BaseException:
+            # Cancelled by the caller (or broken): a half-open trial must not stay claimed
+            self.breaker.abandon()
+            raise
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        self.breaker.failure()
+        return self._fall_back(text, f"no answer within the deadline ({error!r})" if error else
+                               "no answer within the deadline")
+
+    def _fall_back(self, text, reason):
+        audio = None
+        if callable(self.fallback):
+            audio = self.fallback(text)
+        elif self.fallback is not None:
+            audio = self.fallback.get(text)
+        if audio is None:
+            raise TTSUnavailable(f"Murf TTS unavailable: {reason}")
+        self.fallbacks += 1
+        return audio
+
+    def stats(self):
+        return {
+            "calls": self.calls,
+            "attempts": self.attempts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "timeouts": self.timeouts,
+            "fallbacks": self.fallbacks,
+            "breaker": self.breaker.state,
+            "hedge_delay": self.hedge_delay(),
+        }
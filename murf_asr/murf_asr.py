@@ -1,13 +1,53 @@
-from murf import Murf, MurfRegion
+import asyncio
+import base64
+import functools
+import itertools
+import os
+from collections import deque
+import httpx
+from murf import AsyncMurf, Murf, MurfRegion
 from dotenv import load_dotenv, dotenv_values
+from speech_stream import split_for_speech
+from tts_cache import TTSCache, cache_key
 load_dotenv()
 
+# Where synthesized audio is persisted between runs
+TTS_CACHE_DIR = os.environ.get("MURF_TTS_CACHE_DIR", ".tts_cache")
+
+@functools.lru_cache(maxsize=1)
+def murf_api_key():
+    """The Murf API key, read from the environment / .env once per process."""
+    return os.environ.get("MURF_API_KEY") or dotenv_values()['MURF_API_KEY']
+
+def audio_bytes(response):
+    """Audio from a generate response; requests ask for it inline as base64."""
+    encoded = getattr(response, "encoded_audio", None)
+    if not encoded:
+        raise RuntimeError("Murf response has no encoded_audio; was encode_as_base_64 turned off?")
+    return base64.b64decode(encoded)
+
 class MurfTTSClient:
-    def __init__(self):
-        self.client = Murf(api_key=dotenv_values()['MURF_API_KEY'],
+    def __init__(self, cache=None, client=None):
+        """
+        cache: a TTSCache, False to disable caching, or None for the default
+               (64 MB in memory in front of TTS_CACHE_DIR on disk).
+        client: a ready-made Murf client, mostly for tests and benchmarks.
+        """
+        self.client = client or Murf(api_key=murf_api_key(),
         region=MurfRegion.IN)
+        if cache is None:
+            cache = TTSCache(TTS_CACHE_DIR)
+        self.cache = cache or None
 
     def generate_speech(self, voice_id: str, style: str, text: str, rate: int, multi_native_locale: str, **kwargs):
+        key = None
+        if self.cache is not None:
+            key = cache_key(voice_id, style, text, rate, multi_native_locale, **kwargs)
+            audio = self.cache.get(key)
+            if audio is not None:
+                return audio
+
+        kwargs.setdefault("encode_as_base_64", True)
         response = self.client.text_to_speech.generate(
             voice_id=voice_id,
             style=style,
@@ -18,8 +58,154 @@ class MurfTTSClient:
         )
         # print(f"Generated speech response: {response.status_code}")
         # print(response.content)
-        print(response)
-        return response.content
+        audio = audio_bytes(response)
+        if key is not None:
+            self.cache.put(key, audio)
+        return audio
+
+    def cache_stats(self):
+        """Hit/miss counters and sizes of the speech cache."""
+        return self.cache.stats() if self.cache is not None else {}
+
+class AsyncMurfTTSClient:
+    """
+    asyncio counterpart of MurfTTSClient. All requests go through one pooled
+    httpx.AsyncClient, so a whole deck's narration reuses a handful of
+    keep-alive connections instead of reconnecting per line. Use one
+    instance per process and close it with `aclose()` (or `async with`).
+    """
+
+    def __init__(self, cache=None, client=None, max_connections=16, concurrency=8,
+                 timeout=60.0, environment=None):
+        """
+        cache: as for MurfTTSClient.
+        client: a ready-made AsyncMurf client; otherwise one is built on a
+                shared connection pool of `max_connections`.
+        concurrency: default limit for generate_many().
+        environment: a MurfEnvironment to talk to instead of the India region.
+        """
+        self.http = None
+        if client is None:
+            self.http = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(max_connections=max_connections,
+                                    max_keepalive_connections=max_connections),
+            )
+            region_args = {"environment": environment} if environment else {"region": MurfRegion.IN}
+            client = AsyncMurf(api_key=murf_api_key(), httpx_client=self.http, **region_args)
+        self.client = client
+        if cache is None:
+            cache = TTSCache(TTS_CACHE_DIR)
+        self.cache = cache or None
+        self.concurrency = concurrency
+        # Identical requests already on the wire share one result:
+        # key -> [future, number of callers waiting on it]
+        self.in_flight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        if self.http is not None:
+            await self.http.aclose()
+
+    async def generate_speech(self, voice_id: str, style: str, text: str, rate: int, multi_native_locale: str,
+                              timeout=None, **kwargs):
+        """Synthesize one line. `timeout` (seconds) bounds this call only."""
+        key = cache_key(voice_id, style, text, rate, multi_native_locale, **kwargs)
+        if self.cache is not None:
+            audio = self.cache.get(key)
+            if audio is not None:
+                return audio
+
+        entry = self.in_flight.get(key)
+        if entry is None or entry[0].cancelled():
+            kwargs.setdefault("encode_as_base_64", True)
+            pending = asyncio.ensure_future(self._fetch(key, dict(
+                voice_id=voice_id, style=style, text=text, rate=rate,
+                multi_native_locale=multi_native_locale, **kwargs)))
+            entry = self.in_flight[key] = [pending, 0]
+            pending.add_done_callback(functools.partial(self._forget, key))
+        pending = entry[0]
+        # shield: one caller timing out or being cancelled must not kill the
+        # request for the others sharing it; the last one to leave does
+        entry[1] += 1
+        try:
+            if timeout is None:
+                return await asyncio.shield(pending)
+            return await asyncio.wait_for(asyncio.shield(pending), timeout)
+        finally:
+            entry[1] -= 1
+            if not entry[1] and not pending.done():
+                pending.cancel()
+
+    def _forget(self, key, future):
+        if self.in_flight.get(key, (None,))[0] is future:
+            del self.in_flight[key]
+
+    async def _fetch(self, key, request):
+        response = await self.client.text_to_speech.generate(**request)
+        audio = audio_bytes(response)
+        if self.cache is not None:
+            self.cache.put(key, audio)
+        return audio
+
+    async def generate_many(self, requests, concurrency=None, timeout=None, return_exceptions=False):
+        """
+        Synthesize a batch of requests (dicts of generate_speech arguments)
+        with at most `concurrency` in flight, returning audio in input order.
+        `timeout` applies to each request once it gets a slot. With
+        return_exceptions, failures are returned in place like
+        asyncio.gather; otherwise the first failure cancels the rest, as does
+        cancelling the batch itself.
+        """
+        limit = asyncio.Semaphore(concurrency or self.concurrency)
+
+        async def one(request):
+            async with limit:
+                return await self.generate_speech(timeout=timeout, **request)
+
+        tasks = [asyncio.ensure_future(one(request)) for request in requests]
+        try:
+            return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def stream_speech(self, voice_id: str, style: str, text: str, rate: int, multi_native_locale: str,
+                            lookahead=3, timeout=None, **kwargs):
+        """
+        Async generator over the audio of `text`, one segment per chunk from
+        split_for_speech(), yielded in order as soon as each is ready. Up to
+        `lookahead` chunk requests are in flight at once, so later sentences
+        are synthesized while earlier ones play. Leaving the loop early
+        cancels whatever has not been synthesized yet.
+        """
+        chunks = iter(split_for_speech(text))
+
+        def request(chunk):
+            return asyncio.ensure_future(self.generate_speech(
+                voice_id, style, chunk, rate, multi_native_locale, timeout=timeout, **kwargs))
+
+        pending = deque(request(chunk) for chunk in itertools.islice(chunks, max(1, lookahead)))
+        try:
+            while pending:
+                audio = await pending[0]
+                pending.popleft()
+                chunk = next(chunks, None)
+                if chunk is not None:
+                    pending.append(request(chunk))
+                yield audio
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def cache_stats(self):
+        """Hit/miss counters and sizes of the speech cache."""
+        return self.cache.stats() if self.cache is not None else {}
 
 # Example of how to use the MurfTTSClient
 if __name__ == "__main__":
@@ -0,0 +1,193 @@
+import asyncio
+import time
+from collections import namedtuple
+
+from tts_cache import cache_key
+
+# One line the co-presenter is likely to say on a slide; rank 0 is the first
+Utterance = namedtuple("Utterance", ["slide", "rank", "text"])
+
+
+def slide_lines(slide, max_lines=3):
+    """
+    Likely utterances for one slide of PPTParser.parse() output: the title,
+    then the text of its other shapes, one line per paragraph.
+    """
+    title = (slide.get("title") or "").strip()
+    lines = [title] if title else []
+    for shape in slide.get("shapes", []):
+        for line in (shape.get("text") or "").splitlines():
+            line = line.strip()
+            if line and line not in lines:
+                lines.append(line)
+    return lines[:max_lines]
+
+
+class SlidePrefetcher:
+    """
+    Warms the TTS cache for the slides around the one on screen.
+
+    Given the parsed deck and the current slide number, it synthesizes the
+    likely utterances of the current slide, the next `ahead` slides and the
+    previous `behind` ones through an AsyncMurfTTSClient. The first line of
+    every slide in the window goes before any second line, nearest slide
+    first. When the presenter moves, requests for slides that left the
+    window are cancelled. At most `concurrency` requests run at once,
+    starts are limited to `rate` per second, and no more than
+    `budget_chars` characters (Murf bills per character) are ever sent.
+    """
+
+    def __init__(self, tts, slides, voice, ahead=3, behind=1, concurrency=2, rate=4.0,
+                 budget_chars=None, narrate=slide_lines):
+        """
+        tts: an AsyncMurfTTSClient with a cache.
+        slides: PPTParser.parse() output; the leading file-name entry is skipped.
+        voice: generate_speech() arguments other than text (voice_id, style, ...).
+        narrate: slide dict -> list of lines, in speaking order.
+        """
+        self.tts = tts
+        self.voice = dict(voice)
+        self.ahead = ahead
+        self.behind = behind
+        self.concurrency = concurrency
+        self.rate = rate
+        self.budget_chars = budget_chars
+        self.utterances = {}
+        for slide in slides:
+            if "slide_number" in slide:
+                number = slide["slide_number"]
+                self.utterances[number] = [Utterance(number, rank, text)
+                                           for rank, text in enumerate(narrate(slide))]
+
+        self.current = None
+        self.queue = []  # wanted utterances, highest priority first
+        self.running = {}  # key -> task
+        self.done = set()
+        self.changed = asyncio.Event()
+        self.workers = []
+        self.next_start = 0.0
+        self.chars_sent = 0
+        self.synthesized = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.over_budget = 0
+
+    def key(self, utterance):
+        return cache_key(text=utterance.text, **self.voice)
+
+    # --- Scheduling ---
+    def window(self, current):
+        """Slides to prefetch around `current`, with their distance (0 = on screen)."""
+        slides = {current: 0}
+        for d in range(1, self.ahead + 1):
+            slides[current + d] = d
+        for d in range(1, self.behind + 1):
+            slides[current - d] = self.ahead + d
+        return {s: d for s, d in slides.items() if s in self.utterances}
+
+    def set_current(self, slide_number):
+        """Re-plan around `slide_number`, cancelling work for slides left behind."""
+        if slide_number == self.current:
+            return
+        self.current = slide_number
+        window = self.window(slide_number)
+        wanted = [u for s in window for u in self.utterances[s]]
+        # First lines before follow-up lines, then nearest slide first
+        wanted.sort(key=lambda u: (u.rank > 0, window[u.slide], u.rank))
+        self.queue = [u for u in wanted if self.key(u) not in self.done]
+        keep = {self.key(u) for u in self.queue}
+        for key, task in list(self.running.items()):
+            # None: claimed by a worker still waiting to start; it re-checks the window itself
+            if key not in keep and task is not None:
+                task.cancel()
+        self.changed.set()
+
+    def _next_job(self):
+        while self.queue:
+            utterance = self.queue.pop(0)
+            key = self.key(utterance)
+            if key in self.done or key in self.running:
+                continue
+            if self.tts.cache is not None and key in self.tts.cache:
+                self.done.add(key)
+                continue
+            if self.budget_chars is not None and self.chars_sent + len(utterance.text) > self.budget_chars:
+                self.over_budget += 1
+                continue
+            return key, utterance
+        return None
+
+    async def _throttle(self):
+        if not self.rate:
+            return
+        now = time.monotonic()
+        start = max(now, self.next_start)
+        self.next_start = start + 1 / self.rate
+        await asyncio.sleep(start - now)
+
+    async def _worker(self):
+        while True:
+            job = self._next_job()
+            if job is None:
+                self.changed.clear()
+                await self.changed.wait()
+                continue
+            key, utterance = job
+            self.running[key] = None  # claimed while waiting for a start slot
+            try:
+                await self._throttle()
+                if self.current is None or utterance.slide not in self.window(self.current):
+                    self.cancelled += 1
+                    continue
+                self.chars_sent += len(utterance.text)
+                task = asyncio.ensure_future(self.tts.generate_speech(text=utterance.text, **self.voice))
+                self.running[key] = task
+                await asyncio.wait({task})
+                if task.cancelled():
+                    self.cancelled += 1
+                elif task.exception() is not None:
+                    self.failed += 1
+                    print(f"Prefetch failed for slide {utterance.slide}: {task.exception()!r}")
+                else:
+                    self.done.add(key)
+                    self.synthesized += 1
+            finally:
+                task = self.running.pop(key, None)
+                if task is not None and not task.done():
+                    task.cancel()
+
+    # --- Lifecycle ---
+    def start(self, slide_number=1):
+        """Start the workers (from a running event loop) and plan around `slide_number`."""
+        self.workers = [asyncio.ensure_future(self._worker()) for _ in range(self.concurrency)]
+        self.set_current(slide_number)
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    async def follow(self, current_slide, interval=0.25):
+        """
+        Track the show by polling `current_slide()` (e.g.
+        PPTController.current_slide) every `interval` seconds. The call runs
+        in a worker thread, since a COM round trip can block.
+        """
+        while True:
+            number = await asyncio.to_thread(current_slide)
+            if number:
+                self.set_current(number)
+            await asyncio.sleep(interval)
+
+    def stats(self):
+        return {
+            "current": self.current,
+            "queued": len(self.queue),
+            "running": len(self.running),
+            "synthesized": self.synthesized,
+            "cancelled": self.cancelled,
+            "failed": self.failed,
+            "over_budget": self.over_budget,
+            "chars_sent": self.chars_sent,
+        }
@@ -0,0 +1,85 @@
+"""
+Sentence-chunked speech: split a reply into pieces that can be synthesized
+separately, and hand the resulting segments to the audio server's speech
+stream as they arrive.
+"""
+import io
+import re
+import wave
+
+# A sentence ends at . ! or ? (optionally followed by a closing quote or
+# bracket) and whitespace, unless the next word is lower case ("e.g. this")
+SENTENCE_END = re.compile(r"(?:(?<=[.!?])|(?<=[.!?][\"')\]]))\s+(?=[^a-z])")
+CLAUSE_END = re.compile(r"(?<=[,;:])\s+")
+
+# Audio format requested for segments that go to the playback path
+PLAYBACK_FORMAT = {"format": "WAV", "sample_rate": 44100, "channel_type": "MONO"}
+
+
+def _pack(parts, limit):
+    """Greedily join consecutive parts with spaces into pieces of at most `limit` characters."""
+    chunks, current = [], ""
+    for part in parts:
+        if current and len(current) + 1 + len(part) > limit:
+            chunks.append(current)
+            current = part
+        else:
+            current = f"{current} {part}" if current else part
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _fit(sentence, limit):
+    """A sentence as pieces of at most `limit` characters, cut at clauses, then words."""
+    if len(sentence) <= limit:
+        return [sentence]
+    pieces = []
+    for clause in CLAUSE_END.split(sentence):
+        pieces.extend([clause] if len(clause) <= limit else _pack(clause.split(), limit))
+    return _pack(pieces, limit)
+
+
+def split_for_speech(text, first_chars=80, max_chars=250):
+    """
+    Split `text` into chunks to synthesize one request each.
+
+    The first chunk is cut short, at a clause boundary within `first_chars`
+    where there is one, because its synthesis time is the time to first
+    audio. The rest is whole sentences packed up to `max_chars`: fewer,
+    longer requests cost less and keep the prosody of each sentence intact.
+    """
+    units = []
+    for sentence in SENTENCE_END.split(text.strip()):
+        if sentence.strip():
+            units.extend(_fit(" ".join(sentence.split()), max_chars))
+    if not units:
+        return []
+    head = _pack(CLAUSE_END.split(units[0]), first_chars)
+    return head[:1] + _pack(head[1:] + units[1:], max_chars)
+
+
+def wav_pcm(data):
+    """(Int16 PCM bytes, sample rate) from a mono 16-bit WAV segment."""
+    with wave.open(io.BytesIO(data), "rb") as wf:
+        if wf.getsampwidth() != 2 or wf.getnchannels() != 1:
+            raise ValueError("expected mono 16-bit WAV audio")
+        return wf.readframes(wf.getnframes()), wf.getframerate()
+
+
+async def play_segments(segments, server="http://127.0.0.1:8000"):
+    """
+    Forward WAV segments from an async iterator (e.g.
+    AsyncMurfTTSClient.stream_speech with PLAYBACK_FORMAT) to the audio
+    server's speech stream as each one arrives. Returns the seconds of
+    audio queued on the server after the last segment.
+    """
+    import httpx  # only this remote path needs it; wav_pcm and the splitters stay light
+    queued = 0.0
+    async with httpx.AsyncClient(base_url=server) as http:
+        async for segment in segments:
+            pcm, rate = wav_pcm(segment)
+            response = await http.post("/speech", params={"rate": rate}, content=pcm)
+            response.raise_for_status()
+            queued = response.json()["queued_seconds"]
+    return queued
@@ -0,0 +1,82 @@
+"""
+HedgedTTS against a stub Murf client, no network needed.
+
+    python -m pytest test_hedging.py
+"""
+import asyncio
+import base64
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from hedging import HedgedTTS, TTSUnavailable
+
+VOICE = dict(voice_id="en-US-natalie", style="Conversational", rate=0, multi_native_locale="en-IN")
+
+
+class StubSpeech:
+    """text_to_speech stand-in: the n-th request for a text takes `delays[n]` seconds (the last one repeats)."""
+
+    def __init__(self, *delays):
+        self.delays = list(delays)
+        self.seen = {}
+
+    async def generate(self, text, **request):
+        n = self.seen.get(text, 0)
+        self.seen[text] = n + 1
+        await asyncio.sleep(self.delays[min(n, len(self.delays) - 1)])
+        return SimpleNamespace(encoded_audio=base64.b64encode(text.encode()).decode("ascii"))
+
+
+def hedged(speech, **kwargs):
+    return HedgedTTS(SimpleNamespace(client=SimpleNamespace(text_to_speech=speech), cache=None), **kwargs)
+
+
+def test_cancelled_half_open_trial_releases_the_breaker():
+    speech = StubSpeech(1.0)
+    tts = hedged(speech, max_hedges=0)
+    tts.breaker.opened_at = time.monotonic() - tts.breaker.reset_after  # half-open
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(tts.generate_speech(text="trial", **VOICE), 0.02)
+        speech.delays = [0.0]  # the backend recovered
+        return await tts.generate_speech(text="next", **VOICE)
+
+    assert asyncio.run(run()) == b"next"
+    assert tts.breaker.state == "closed"
+
+
+def test_losing_hedges_do_not_shrink_hedge_delay():
+    # The first attempt answers in 60 ms; hedges fired before that lose
+    tts = hedged(StubSpeech(0.06, 1.0), hedge_percentile=30, min_hedge_delay=0.001)
+    for _ in range(tts.min_samples):
+        tts.latency.record(0.05)
+
+    async def run():
+        for i in range(30):
+            await tts.generate_speech(text=f"line {i}", **VOICE)
+
+    asyncio.run(run())
+    assert tts.hedges > 0 and tts.hedge_wins == 0
+    assert tts.hedge_delay() >= 0.05
+
+
+def test_first_attempt_beaten_by_its_hedge_counts_as_slow():
+    tts = hedged(StubSpeech(1.0, 0.01), initial_hedge_delay=0.05)
+
+    async def run():
+        return await tts.generate_speech(text="slow", **VOICE)
+
+    assert asyncio.run(run()) == b"slow"
+    assert tts.hedge_wins == 1
+    assert max(tts.latency.samples) >= 0.05
+
+
+def test_deadline_without_fallback_raises():
+    tts = hedged(StubSpeech(1.0), deadline=0.05, max_hedges=0)
+    with pytest.raises(TTSUnavailable):
+        asyncio.run(tts.generate_speech(text="late", **VOICE))
+    assert tts.timeouts == 1
+    assert tts.latency.samples[-1] == pytest.approx(0.05, abs=0.01)
@@ -0,0 +1,42 @@
+"""
+TTSCache and its disk tier on a temporary directory.
+
+    python -m pytest test_tts_cache.py
+"""
+import os
+
+import pytest
+
+from tts_cache import DiskStore, TTSCache, cache_key
+
+KEY = cache_key("en-US-natalie", "Conversational", "Hello", 0, "en-IN")
+
+
+def test_disk_hit_after_restart(tmp_path):
+    TTSCache(str(tmp_path)).put(KEY, b"audio")
+    cache = TTSCache(str(tmp_path))
+    assert cache.get(KEY) == b"audio"
+    assert cache.disk_hits == 1
+
+
+@pytest.mark.parametrize("content", [b"", b"\x00\x01\x02"])
+def test_truncated_entry_is_a_miss_and_removed(tmp_path, content):
+    cache = TTSCache(str(tmp_path))
+    cache.put(KEY, b"audio")
+    cache.memory.clear()
+    path = cache.disk._path(KEY)
+    with open(path, "wb") as f:
+        f.write(content)
+    assert cache.get(KEY) is None
+    assert cache.misses == 1
+    assert not os.path.exists(path)
+    assert KEY not in cache
+    cache.put(KEY, b"again")
+    assert TTSCache(str(tmp_path)).get(KEY) == b"again"
+
+
+def test_put_leaves_no_temporary_files(tmp_path):
+    store = DiskStore(str(tmp_path))
+    store.put(KEY, b"audio")
+    assert os.listdir(tmp_path) == [KEY + ".bin"]
+    assert store.size == os.path.getsize(store._path(KEY))
@@ -0,0 +1,256 @@
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+# Disk entries start with their creation time, used for TTL checks
+DISK_HEADER = struct.Struct("<d")
+
+
+def cache_key(voice_id, style, text, rate, multi_native_locale, **kwargs):
+    """Content address of one synthesis request."""
+    payload = json.dumps(
+        {
+            "voice_id": voice_id,
+            "style": style,
+            "text": text,
+            "rate": rate,
+            "multi_native_locale": multi_native_locale,
+            "kwargs": kwargs,
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MemoryLRU:
+    """In-memory LRU bounded by the total size of the cached audio."""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.entries = OrderedDict()  # key -> (created, data)
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            created, data = entry
+            if self.ttl is not None and time.time() - created > self.ttl:
+                self._remove(key)
+                return None
+            self.entries.move_to_end(key)
+            return data
+
+    def put(self, key, data, created=None):
+        if len(data) > self.max_bytes:
+            return
+        with self.lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (created or time.time(), data)
+            self.size += len(data)
+            while self.size > self.max_bytes:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+
+    def _remove(self, key):
+        _, data = self.entries.pop(key)
+        self.size -= len(data)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+
+class DiskStore:
+    """
+    One file per entry under `directory`. A file's mtime is bumped on every
+    hit, so size-based eviction drops the least recently used files first.
+
+    The keys on disk and their total size are kept in memory, so membership
+    checks don't touch the file system. save_index() snapshots them to
+    `<directory>.index.json`; the next start loads that instead of scanning
+    the directory, as long as the directory hasn't changed since.
+    """
+
+    def __init__(self, directory, max_bytes=512 * 1024 * 1024, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.index_path = os.path.normpath(directory) + ".index.json"
+        os.makedirs(directory, exist_ok=True)
+        if not self._load_index():
+            files = self._files()
+            self.keys = {e.name[:-len(".bin")] for e in files}
+            self.size = sum(e.stat().st_size for e in files)
+            self.save_index()
+
+    def _files(self):
+        return [e for e in os.scandir(self.directory) if e.name.endswith(".bin")]
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            # Adding or removing an entry changes the directory's mtime
+            if index["mtime_ns"] != os.stat(self.directory).st_mtime_ns:
+                return False
+            keys = set(index["keys"])
+            size = int(index["size"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return False  # missing or malformed: rescan the directory
+        if not all(isinstance(key, str) for key in keys):
+            return False
+        self.keys, self.size = keys, size
+        return True
+
+    def save_index(self):
+        with self.lock:
+            index = {"mtime_ns": os.stat(self.directory).st_mtime_ns, "size": self.size,
+                     "keys": sorted(self.keys)}
+        tmp = f"{self.index_path}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".bin")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+        except FileNotFoundError:
+            return None
+        except OSError:
+            blob = b""
+        if len(blob) < DISK_HEADER.size:
+            # Unreadable or cut short (e.g. a crash before put() used fsync): a miss
+            self._delete(path)
+            return None
+        self.keys.add(key)  # another process may have written it
+        (created,) = DISK_HEADER.unpack_from(blob)
+        if self.ttl is not None and time.time() - created > self.ttl:
+            self._delete(path)
+            return None
+        os.utime(path)
+        return created, blob[DISK_HEADER.size:]
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def put(self, key, data, created=None):
+        path = self._path(key)
+        blob = DISK_HEADER.pack(created or time.time()) + data
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(blob)
+            f.flush()
+            os.fsync(f.fileno())  # the rename below must never expose a partial file
+        with self.lock:
+            old = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+            self.keys.add(key)
+            self.size += len(blob) - old
+            if self.size > self.max_bytes:
+                self._evict()
+
+    def _delete(self, path):
+        with self.lock:
+            try:
+                size = os.path.getsize(path)
+                os.remove(path)
+                self.keys.discard(os.path.basename(path)[:-len(".bin")])
+                self.size -= size
+            except OSError:
+                pass
+
+    def _evict(self):
+        # Called with the lock held. Expired entries are dropped lazily on
+        # get(); here only the least recently used files go, down to 90%.
+        for entry in sorted(self._files(), key=lambda e: e.stat().st_mtime):
+            if self.size <= self.max_bytes * 0.9:
+                break
+            self.size -= entry.stat().st_size
+            os.remove(entry.path)
+            self.keys.discard(entry.name[:-len(".bin")])
+
+    def clear(self):
+        with self.lock:
+            for entry in self._files():
+                os.remove(entry.path)
+            self.keys.clear()
+            self.size = 0
+
+
+class TTSCache:
+    """
+    Two-tier cache for synthesized speech: a byte-bounded in-memory LRU in
+    front of a persistent disk store. Disk hits are promoted to memory.
+    """
+
+    def __init__(self, directory=None, memory_bytes=64 * 1024 * 1024,
+                 disk_bytes=512 * 1024 * 1024, ttl=None):
+        self.memory = MemoryLRU(memory_bytes, ttl)
+        self.disk = DiskStore(directory, disk_bytes, ttl) if directory else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        data = self.memory.get(key)
+        if data is not None:
+            self.memory_hits += 1
+            return data
+        if self.disk is not None:
+            entry = self.disk.get(key)
+            if entry is not None:
+                created, data = entry
+                self.memory.put(key, data, created)
+                self.disk_hits += 1
+                return data
+        self.misses += 1
+        return None
+
+    def __contains__(self, key):
+        """Whether `key` is cached, without counting a lookup or reading the audio."""
+        return key in self.memory.entries or (self.disk is not None and key in self.disk)
+
+    def put(self, key, data):
+        created = time.time()
+        self.memory.put(key, data, created)
+        if self.disk is not None:
+            self.disk.put(key, data, created)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def save_index(self):
+        """Snapshot the disk tier's index, so the next start skips the directory scan."""
+        if self.disk is not None:
+            self.disk.save_index()
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": len(self.memory.entries),
+            "memory_bytes": self.memory.size,
+            "disk_bytes": self.disk.size if self.disk is not None else 0,
+        }
@@ -0,0 +1,234 @@
+"""
+Unified server vs the two-server setup: request latency and memory per connection.
+
+Starts flask_app/app.py (Flask dev server) plus mic_audio/recorder.py,
+then server.py, each in its own process on a synthetic audio source.
+Measures:
+
+  - GET / (the index template) and GET /stats (audio server) latency
+  - handing a speech segment to the speech stream: POST /speech to the
+    recorder, as speech_stream.play_segments does, vs recorder.feed_speech
+    in-process, which is what server.py's speak() calls
+  - slide change to push: POST /api/slide/<n> until the /ws/slides event
+    arrives (server.py only; the two-server setup has no push channel)
+  - server RSS idle, and its growth per open /ws/audio socket (and per
+    /ws/slides socket), read from /proc (Linux only)
+
+    python bench_server.py --requests 500 --sockets 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import numpy as np
+import websockets
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "pptx_module"))
+
+from create import DeckGenerator
+
+SOURCE = "synthetic:speech"
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss_kb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        return None
+
+
+def launch(args, cwd, port):
+    proc = subprocess.Popen([sys.executable, *args], cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.perf_counter() + 30
+    while time.perf_counter() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/", timeout=1)
+            return proc
+        except httpx.TransportError:
+            if proc.poll() is not None:
+                raise RuntimeError(f"{args[0]} exited with {proc.returncode}")
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{args[0]} did not come up on port {port}")
+
+
+def summary(samples_ms):
+    samples_ms = sorted(samples_ms)
+    return (f"p50 {statistics.median(samples_ms):6.2f} ms  "
+            f"p99 {samples_ms[int(0.99 * (len(samples_ms) - 1))]:6.2f} ms")
+
+
+def get_latency(url, n):
+    times = []
+    with httpx.Client() as http:
+        http.get(url)
+        for _ in range(n):
+            start = time.perf_counter()
+            http.get(url).raise_for_status()
+            times.append(1000 * (time.perf_counter() - start))
+    return times
+
+
+def speech_http(url, pcm, n):
+    times = []
+    with httpx.Client() as http:
+        for _ in range(n):
+            start = time.perf_counter()
+            http.post(f"{url}/speech", params={"rate": 44100}, content=pcm).raise_for_status()
+            times.append(1000 * (time.perf_counter() - start))
+            http.delete(f"{url}/speech")
+    return times
+
+
+def speech_in_process(pcm, n):
+    sys.path.insert(0, os.path.join(ROOT, "mic_audio"))
+    import recorder
+    times = []
+    for _ in range(n):
+        start = time.perf_counter()
+        recorder.feed_speech(pcm, 44100)
+        times.append(1000 * (time.perf_counter() - start))
+        recorder.speech_source.clear()
+    return times
+
+
+async def socket_memory(pid, url, n):
+    """RSS growth of `pid` per socket, with `n` clients connected and reading."""
+    async def listen(ws):
+        try:
+            async for _ in ws:
+                pass
+        except websockets.ConnectionClosed:
+            pass
+
+    before = rss_kb(pid)
+    sockets = [await websockets.connect(url, max_size=None) for _ in range(n)]
+    for ws in sockets:
+        await ws.recv()  # the format or state message
+    readers = [asyncio.create_task(listen(ws)) for ws in sockets]
+    await asyncio.sleep(2)
+    after = rss_kb(pid)
+    for ws in sockets:
+        await ws.close()
+    await asyncio.gather(*readers)
+    if before is None:
+        return None
+    return (after - before) / n
+
+
+async def push_latency(url, n):
+    times = []
+    async with httpx.AsyncClient(base_url=url) as http, \
+            websockets.connect(url.replace("http", "ws") + "/ws/slides") as ws:
+        state = json.loads(await ws.recv())
+        slides = state["slides"]
+        for i in range(n):
+            target = 1 + (state["slide"] + i) % slides
+            start = time.perf_counter()
+            await http.post(f"/api/slide/{target}")
+            while json.loads(await ws.recv())["slide"] != target:
+                pass
+            times.append(1000 * (time.perf_counter() - start))
+    return times
+
+
+def memory_line(label, idle_kb, per_socket):
+    idle = "n/a" if idle_kb is None else f"{idle_kb / 1024:6.1f} MB"
+    per = "n/a" if per_socket is None else f"{per_socket:7.1f} KB"
+    return f"{label:34s} idle RSS {idle}   per /ws/audio socket {per}"
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--requests", type=int, default=500)
+    ap.add_argument("--sockets", type=int, default=16)
+    ap.add_argument("--slides", type=int, default=30)
+    args = ap.parse_args()
+    ws_path = "/ws/audio?encoding=mulaw&rate=16000"
+    # One second of noise at the capture rate (PLAYBACK_FORMAT), so only the hand-off is timed
+    pcm = np.random.default_rng(0).normal(0, 3000, 44100).astype("<i2").tobytes()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = os.path.join(tmp, "deck.pptx")
+        DeckGenerator(args.slides).build(deck)
+
+        # --- Two servers ---
+        flask_port, audio_port = free_port(), free_port()
+        flask_proc = launch(["-m", "flask", "--app", "app", "run", "--port", str(flask_port)],
+                            os.path.join(ROOT, "flask_app"), flask_port)
+        audio_proc = launch(["recorder.py", "--source", SOURCE, "--host", "127.0.0.1", "--port", str(audio_port)],
+                            os.path.join(ROOT, "mic_audio"), audio_port)
+        try:
+            flask_url, audio_url = f"http://127.0.0.1:{flask_port}", f"http://127.0.0.1:{audio_port}"
+            two = {
+                "index": get_latency(flask_url + "/", args.requests),
+                "stats": get_latency(audio_url + "/stats", args.requests),
+                "speech": speech_http(audio_url, pcm, args.requests // 5),
+            }
+            idle = [rss_kb(flask_proc.pid), rss_kb(audio_proc.pid)]
+            two_idle = None if None in idle else sum(idle)
+            two_socket = asyncio.run(socket_memory(audio_proc.pid, f"ws://127.0.0.1:{audio_port}{ws_path}",
+                                                   args.sockets))
+        finally:
+            flask_proc.terminate()
+            audio_proc.terminate()
+            flask_proc.wait()
+            audio_proc.wait()
+
+        # --- One server ---
+        port = free_port()
+        proc = launch(["server.py", "--deck", deck, "--backend", "sim", "--source", SOURCE,
+                       "--host", "127.0.0.1", "--port", str(port)], HERE, port)
+        try:
+            url = f"http://127.0.0.1:{port}"
+            one = {
+                "index": get_latency(url + "/", args.requests),
+                "stats": get_latency(url + "/stats", args.requests),
+                "state": get_latency(url + "/api/state", args.requests),
+                "speech": speech_in_process(pcm, args.requests // 5),
+                "push": asyncio.run(push_latency(url, args.requests // 5)),
+            }
+            one_idle = rss_kb(proc.pid)
+            one_socket = asyncio.run(socket_memory(proc.pid, f"ws://127.0.0.1:{port}{ws_path}", args.sockets))
+            push_socket = asyncio.run(socket_memory(proc.pid, f"ws://127.0.0.1:{port}/ws/slides", args.sockets))
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{args.requests} requests per route, {args.sockets} sockets, audio source {SOURCE}, "
+          f"{args.slides}-slide deck on the simulated backend")
+    print(f"GET /             Flask               {summary(two['index'])}")
+    print(f"                  unified             {summary(one['index'])}")
+    print(f"GET /stats        recorder            {summary(two['stats'])}")
+    print(f"                  unified             {summary(one['stats'])}")
+    print(f"GET /api/state    unified             {summary(one['state'])}")
+    print(f"1 s of speech     POST /speech        {summary(two['speech'])}")
+    print(f"                  in-process queue    {summary(one['speech'])}")
+    print(f"slide -> push     unified             {summary(one['push'])}")
+    print(memory_line("Flask + recorder (2 processes)", two_idle, two_socket))
+    print(memory_line("unified (1 process)", one_idle, one_socket))
+    if push_socket is not None:
+        print(f"{'':34s} per /ws/slides socket {push_socket:7.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Startup budget: import time of server.py and time to first response and to ready.
+
+Imports server in fresh interpreters under `python -X importtime` and
+takes the median cumulative time, listing the most expensive top-level
+imports. Fails (exit status 1) when that exceeds --budget-ms, or when a
+module that should be deferred to the warm-up (python-pptx, murf, pyaudio,
+pyannote, win32com, uvicorn, httpx) is imported with it.
+
+Then starts server.py on a synthetic deck with the simulated backend and
+times, from process start, the first answer to GET /api/state and the
+moment it reports ready: cold (no deck snapshot, so the deck is parsed in
+the warm-up) and warm (the snapshot written by the cold run is loaded).
+
+    python bench_startup.py --budget-ms 800 --slides 200
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "pptx_module"))
+
+from create import DeckGenerator
+
+DEFERRED = ("pptx", "murf", "pyaudio", "pyannote", "win32com", "uvicorn", "httpx")
+
+
+def import_times():
+    """{module: (self us, cumulative us, depth)} for one `import server` in a fresh interpreter."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", "import server"], cwd=HERE,
+                         capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        times[name.strip()] = (int(own), int(cumulative), depth)
+    return times
+
+
+def boot(deck, port):
+    """(ms to first answer, ms to ready, warm-up report) for one server start."""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "server.py", "--deck", deck, "--backend", "sim",
+                             "--source", "synthetic:speech", "--host", "127.0.0.1", "--port", str(port)],
+                            cwd=HERE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    first = None
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=1) as http:
+            while time.perf_counter() - started < 60:
+                try:
+                    state = http.get("/api/state").json()
+                except httpx.TransportError:
+                    time.sleep(0.005)
+                    continue
+                if first is None:
+                    first = 1000 * (time.perf_counter() - started)
+                if state["ready"]:
+                    return first, 1000 * (time.perf_counter() - started), state["warmup"]
+                time.sleep(0.005)
+        raise RuntimeError("server did not become ready in 60 s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--budget-ms", type=float, default=800.0, help="import time allowed for server.py")
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--slides", type=int, default=200)
+    ap.add_argument("--port", type=int, default=8765)
+    args = ap.parse_args()
+
+    runs = [import_times() for _ in range(args.runs)]
+    total = statistics.median(run["server"][1] for run in runs) / 1000
+    print(f"import server: median {total:.0f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    last = runs[-1]
+    top = sorted(((cum, name) for name, (_, cum, depth) in last.items() if depth == 1), reverse=True)[:8]
+    for cumulative, name in top:
+        print(f"  {name:24s} {cumulative / 1000:7.1f} ms")
+    deferred = sorted({name for name in last if name.split(".")[0] in DEFERRED})
+    failed = total > args.budget_ms
+    if deferred:
+        print(f"  imported but should be deferred: {', '.join(deferred)}")
+        failed = True
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = os.path.join(tmp, "deck.pptx")
+        DeckGenerator(args.slides).build(deck)
+        for label in ("cold", "warm"):
+            first, ready, warmup = boot(deck, args.port)
+            steps = ", ".join(f"{k} {v} ms" if isinstance(v, (int, float)) else f"{k} {v}"
+                              for k, v in warmup.items())
+            print(f"{label}: first answer {first:6.0f} ms, ready {ready:6.0f} ms  ({steps})")
+
+    if failed:
+        print("FAILED: startup budget exceeded")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
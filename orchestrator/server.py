@@ -0,0 +1,407 @@
+"""
+Single-process server: the web page, the audio streams, the deck and the
+slideshow controller in one ASGI app, instead of flask_app/app.py and
+mic_audio/recorder.py running side by side.
+
+Components talk through in-memory queues rather than HTTP: the audio
+capture hub fans frames out to subscriber queues, transcripts go to the
+intent router through `orchestrator.transcripts`, commands reach
+PowerPoint through the ControllerActor's queue, slide changes are pushed to
+/ws/slides clients from one asyncio.Queue each, and synthesized speech is
+handed to the speech stream with `speak()` instead of POST /speech.
+
+Startup stays cheap: python-pptx, murf and uvicorn are not imported with
+this module, the parsed deck comes from its columnar snapshot when one is
+current, and everything slow (parsing a changed deck, the COM dispatch and
+slideshow, the TTS client and its cache index) warms up in the background
+while the server already answers. bench_startup.py guards the import time.
+
+    python server.py --deck talk.pptx                         # live PowerPoint
+    python server.py --deck talk.pptx --backend sim --source synthetic:speech
+"""
+import argparse
+import asyncio
+import importlib
+import os
+import sys
+import time
+from contextlib import asynccontextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The modules are plain directories of scripts; make them importable from here
+for module_dir in ("mic_audio", "pptx_module", "murf_asr"):
+    sys.path.insert(0, os.path.join(ROOT, module_dir))
+
+from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse
+from fastapi.templating import Jinja2Templates
+
+import recorder
+from actor import ControllerActor, default_controller
+from backends import make_backend
+from capture import make_source
+from columnar import ColumnarDeck, source_stamp
+from controller import PPTController
+from intent import CommandRouter
+from ooxml import FastPPTParser
+from speech_stream import wav_pcm
+
+TEMPLATES = os.path.join(ROOT, "flask_app", "templates")
+# Slide events buffered per push client before the oldest is dropped
+EVENT_QUEUE_SIZE = 16
+# .pptx to open at startup, and how to drive the show: com or sim[:<latency ms>]
+DECK = os.environ.get("MAYA_DECK")
+BACKEND = os.environ.get("PPT_BACKEND", "com")
+# Imported by the background warm-up instead of on first use (python-pptx
+# parses whatever the fast parser hands back, and builds decks)
+WARM_IMPORTS = ("pptx",)
+
+
+class SlideEvents:
+    """
+    Fan-out of slide changes to push clients, one bounded asyncio.Queue per
+    client. A client that stops reading loses its oldest events, never
+    the newest: only the latest slide matters.
+    """
+
+    def __init__(self, maxsize=EVENT_QUEUE_SIZE):
+        self.maxsize = maxsize
+        self.queues = set()
+        self.published = 0
+
+    def subscribe(self):
+        queue = asyncio.Queue(self.maxsize)
+        self.queues.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        """Stop feeding `queue` and wake its reader with None."""
+        self.queues.discard(queue)
+        self._put(queue, None)
+
+    def publish(self, event):
+        self.published += 1
+        for queue in self.queues:
+            self._put(queue, event)
+
+    def _put(self, queue, event):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+def controller_factory(backend, slides_data):
+    """Factory for the actor thread: default_controller for COM, else a PPTController on `backend`."""
+    if backend == "com":
+        return default_controller
+    return lambda: PPTController(make_backend(backend, slides_data))
+
+
+def snapshot_path(deck):
+    """The deck's columnar sidecar (see columnar.py), read on boot instead of parsing."""
+    return os.path.splitext(deck)[0] + ".deck"
+
+
+class Orchestrator:
+    """
+    Shared state of the server: the parsed deck, the actor driving the
+    show, and the queues between components. start() loads the deck's
+    snapshot if it was built from the deck as it is now (same size and
+    mtime) and returns; the rest warms up in
+    the background: parsing `deck` (and refreshing the snapshot) when there
+    was none, opening it and starting the show, and the TTS client. Each
+    step's time in ms, or its error, is in `warmup`; `ready` is set once the show
+    takes commands. Without a deck only the audio routes are live.
+    """
+
+    def __init__(self, deck=None, backend="com"):
+        self.deck = deck
+        self.backend = backend
+        self.slides_data = [{}]
+        self.actor = None
+        self.position = None
+        self.updated = None
+        self.events = SlideEvents()
+        # (text, final) from the ASR, routed to commands or, when unsure, the LLM
+        self.transcripts = asyncio.Queue()
+        self.llm_requests = asyncio.Queue()
+        self.router = None
+        self.tts = None
+        self.tasks = []
+        self.snapshot = False
+        self.warmup = {}
+        self.warming = None
+        self.show = None
+        self.ready = False
+
+    @property
+    def slides(self):
+        return self.slides_data[1:]
+
+    # --- Lifecycle ---
+    async def start(self):
+        if self.deck is not None:
+            started = time.perf_counter()
+            self.snapshot = self._load_snapshot()
+            if self.snapshot:
+                self.warmup["snapshot"] = round(1000 * (time.perf_counter() - started), 1)
+        self.warming = asyncio.create_task(self._warm_up())
+
+    async def stop(self):
+        if self.warming is not None:
+            self.warming.cancel()
+            await asyncio.gather(self.warming, return_exceptions=True)
+        for task in self.tasks:
+            task.cancel()
+        self.tasks.clear()
+        for queue in list(self.events.queues):
+            self.events.unsubscribe(queue)
+        if self.actor is not None:
+            await asyncio.to_thread(self.actor.stop)
+            self.actor = None
+        if self.tts is not None:
+            if self.tts.cache is not None:
+                await asyncio.to_thread(self.tts.cache.save_index)
+            await self.tts.aclose()
+            self.tts = None
+
+    # --- Warm-up ---
+    def _load_snapshot(self):
+        path = snapshot_path(self.deck)
+        try:
+            snapshot = ColumnarDeck.open(path)
+            if snapshot.source != source_stamp(self.deck):
+                return False
+            self.slides_data = snapshot.to_list()
+        except (OSError, ValueError):
+            return False
+        return True
+
+    async def _warm_up(self):
+        steps = [self._step("imports", asyncio.to_thread(self._import_heavy)),
+                 self._step("tts", self._start_tts())]
+        if self.deck is not None:
+            deck = asyncio.ensure_future(self._step("deck", self._load_deck()))
+            self.show = asyncio.ensure_future(self._step("controller", self._start_show(deck)))
+            steps += [deck, self.show]
+        await asyncio.gather(*steps)
+        print(f"* Warm-up done: {self.warmup}")
+
+    async def _step(self, name, coro):
+        """Run one warm-up step; True if it worked. A failed step doesn't stop the others."""
+        started = time.perf_counter()
+        try:
+            await coro
+        except Exception as e:
+            self.warmup[name] = f"{type(e).__name__}: {e}"
+            print(f"* Warm-up step {name} failed: {self.warmup[name]}")
+            return False
+        self.warmup[name] = round(1000 * (time.perf_counter() - started), 1)
+        return True
+
+    def _import_heavy(self):
+        for name in WARM_IMPORTS:
+            importlib.import_module(name)
+
+    async def _load_deck(self):
+        if not self.snapshot:
+            self.slides_data = await asyncio.to_thread(self._parse)
+
+    def _parse(self):
+        source = source_stamp(self.deck)  # before parsing: an edit meanwhile leaves the snapshot stale
+        slides_data = FastPPTParser(self.deck).parse()
+        try:
+            ColumnarDeck.from_parse(slides_data).save(snapshot_path(self.deck), source=source)
+        except OSError as e:
+            print(f"* Could not write the deck snapshot: {e}")
+        return slides_data
+
+    async def _start_show(self, deck):
+        if self.backend != "com":
+            await deck  # the simulated show is built from the parsed deck
+        # A COM dispatch (and PowerPoint starting up) overlaps parsing
+        actor = ControllerActor(controller_factory(self.backend, self.slides_data))
+        await asyncio.to_thread(actor.start)
+        self.actor = actor
+        if not await deck:
+            raise RuntimeError("the deck could not be parsed")
+        actor.slides = len(self.slides)
+        await actor.open_presentation(os.path.abspath(self.deck))
+        await actor.start_show()
+        self._moved(await actor.current_slide())
+        self.router = CommandRouter(self._execute, slides=len(self.slides), fallback=self.llm_requests.put_nowait)
+        self.tasks.append(asyncio.create_task(self._route_transcripts()))
+        self.ready = True
+
+    async def _start_tts(self):
+        def build():
+            from murf_asr import AsyncMurfTTSClient  # imports murf; loads the speech cache index
+            return AsyncMurfTTSClient()
+        self.tts = await asyncio.to_thread(build)
+
+    # --- Slides ---
+    def state(self):
+        return {"slide": self.position, "slides": len(self.slides), "updated": self.updated,
+                "ready": self.ready, "warmup": self.warmup}
+
+    def slide(self, number):
+        if not 1 <= number <= len(self.slides):
+            raise IndexError(f"slide {number} out of range 1..{len(self.slides)}")
+        return self.slides[number - 1]
+
+    async def navigate(self, name, *args):
+        """Run a navigation command on the actor; returns the slide the show is on after it."""
+        if self.show is not None and not self.ready:
+            await asyncio.shield(self.show)  # commands sent during warm-up wait for the show
+        if not self.ready:
+            raise RuntimeError("no presentation is open")
+        position = await self.actor.call(name, *args)  # navigation resolves with the slide it ended on
+        self._moved(position)
+        return position
+
+    def _moved(self, position):
+        if position == self.position:
+            return
+        self.position = position
+        self.updated = time.time()
+        title = self.slides[position - 1].get("title") if position and position <= len(self.slides) else None
+        self.events.publish({"type": "slide", "slide": position, "title": title, "updated": self.updated})
+
+    # --- Voice commands ---
+    def _execute(self, name, *args):
+        # Tasks start in creation order, so "back three" reaches the actor as three queued commands
+        asyncio.get_running_loop().create_task(self._navigate_quietly(name, *args))
+
+    async def _navigate_quietly(self, name, *args):
+        try:
+            await self.navigate(name, *args)
+        except (IndexError, RuntimeError) as e:
+            print(f"* Voice command {name}{args} failed: {e}")
+
+    async def _route_transcripts(self):
+        while True:
+            text, final = await self.transcripts.get()
+            self.router.feed(text, final=final)
+
+    # --- Speech ---
+    async def speak(self, segments):
+        """
+        In-process counterpart of speech_stream.play_segments: WAV segments
+        from an async iterator go straight onto the speech stream. Returns
+        the seconds of speech queued after the last one.
+        """
+        queued = 0.0
+        async for segment in segments:
+            queued = recorder.feed_speech(*wav_pcm(segment))
+        return queued
+
+
+orchestrator = Orchestrator(DECK, BACKEND)
+templates = Jinja2Templates(directory=TEMPLATES)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    await orchestrator.start()
+    try:
+        yield
+    finally:
+        await orchestrator.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+# /ws/audio, /speech, /stats, /metrics, /start, /stop and the playback worklet
+app.include_router(recorder.router)
+
+
+@app.get("/")
+async def index(request: Request):
+    return templates.TemplateResponse(request, "index.html")
+
+@app.get("/audio")
+async def audio_page():
+    """The audio stream client that recorder.py serves at /."""
+    return HTMLResponse(recorder.html)
+
+# --- Deck and slide state ---
+@app.get("/api/deck")
+async def deck():
+    return {"file_name": orchestrator.slides_data[0].get("file_name"), "slides": len(orchestrator.slides),
+            "titles": [s.get("title") for s in orchestrator.slides]}
+
+@app.get("/api/slides/{number:int}")
+async def slide(number: int):
+    try:
+        return orchestrator.slide(number)
+    except IndexError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+@app.get("/api/state")
+async def state():
+    return orchestrator.state()
+
+async def navigate(name, *args):
+    try:
+        await orchestrator.navigate(name, *args)
+    except IndexError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return orchestrator.state()
+
+@app.post("/api/slide/next")
+async def next_slide():
+    return await navigate("next_slide")
+
+@app.post("/api/slide/previous")
+async def previous_slide():
+    return await navigate("previous_slide")
+
+@app.post("/api/slide/{number:int}")
+async def goto_slide(number: int):
+    return await navigate("goto_slide", number)
+
+# --- Server push ---
+async def wait_for_disconnect(websocket: WebSocket, queue):
+    """Push clients only listen; whatever they send is ignored until they leave."""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        orchestrator.events.unsubscribe(queue)
+
+@app.websocket("/ws/slides")
+async def slide_events(websocket: WebSocket):
+    """Sends the current state on connect, then every slide change as JSON."""
+    await websocket.accept()
+    queue = orchestrator.events.subscribe()
+    receiver = asyncio.create_task(wait_for_disconnect(websocket, queue))
+    try:
+        await websocket.send_json({"type": "state", **orchestrator.state()})
+        while (event := await queue.get()) is not None:
+            await websocket.send_json(event)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        orchestrator.events.unsubscribe(queue)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--deck", default=DECK, help=".pptx to open and start the show on")
+    ap.add_argument("--backend", default=BACKEND, help="com or sim[:<latency ms>]")
+    ap.add_argument("--source", default=recorder.AUDIO_SOURCE,
+                    help="mic, mic:<device>, file:<path>[:fast][:loop] or synthetic[:tone|noise|speech][:fast]")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=8000)
+    args = ap.parse_args()
+    orchestrator.deck = args.deck
+    orchestrator.backend = args.backend
+    recorder.hub.source = make_source(args.source, rate=recorder.RATE, channels=recorder.CHANNELS,
+                                      chunk=recorder.CHUNK)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+from collections import deque, namedtuple
+from concurrent.futures import Future
+
+# Commands that only move the show, and can be folded into one goto_slide
+NAVIGATION = frozenset(("next_slide", "previous_slide", "goto_slide"))
+
+Command = namedtuple("Command", "name args future enqueued")
+# One record per command: queued = enqueue to execute start, run = execute time (ms)
+Timing = namedtuple("Timing", "name args queued_ms run_ms coalesced")
+
+
+def default_controller():
+    """A PPTController for the actor thread, with COM initialised there first."""
+    try:
+        import pythoncom
+        pythoncom.CoInitialize()
+    except ImportError:
+        pass
+    from controller import PPTController
+    return PPTController()
+
+
+class ControllerActor:
+    """
+    Owns a PPTController on a dedicated thread and runs its commands from a
+    queue, so callers (the voice pipeline's event loop) never block on COM.
+
+    Runs of queued navigation are coalesced: "next, next, next" waiting
+    behind a slow call becomes one goto_slide, and an earlier goto that a
+    later one overrides is never sent. A run is only folded into a goto if
+    it can't step past the last slide: with `slides` (the deck's slide
+    count) unknown, runs with a "next" after their last goto are sent
+    command by command, as the show clamps them itself. Any other command
+    is a barrier that navigation is never moved across, and a command
+    whose caller gave up (cancelled) before it ran is dropped.
+
+    Every caller gets its own future. Navigation commands resolve with the
+    slide number the show is on after them (after the whole run, when
+    queued behind each other); other commands with the controller's
+    return value.
+
+    `factory` builds the controller on the actor thread (COM objects belong
+    to the thread that created them); pass any object with the
+    PPTController methods to run without PowerPoint.
+    """
+
+    def __init__(self, factory=default_controller, slides=None, history=1000):
+        self.factory = factory
+        self.slides = slides
+        self.queue = deque()
+        self.cond = threading.Condition()
+        self.thread = None
+        self.controller = None
+        self.history = deque(maxlen=history)
+        self.round_trips = 0
+        self._stopping = False
+
+    # --- Lifecycle ---
+    def start(self):
+        if self.thread is None:
+            ready = Future()
+            self._stopping = False
+            self.thread = threading.Thread(target=self._run, args=(ready,), name="ppt-actor", daemon=True)
+            self.thread.start()
+            try:
+                ready.result()  # surfaces a factory error here rather than on the first command
+            except BaseException:
+                self.thread = None
+                raise
+        return self
+
+    def stop(self, close=False):
+        """Finish queued commands, then stop the thread; `close` quits PowerPoint too."""
+        if self.thread is None:
+            return
+        if close:
+            self.submit("close")
+        with self.cond:
+            self._stopping = True
+            self.cond.notify()
+        self.thread.join()
+        self.thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    async def __aenter__(self):
+        await asyncio.to_thread(self.start)
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.to_thread(self.stop)
+
+    # --- Submitting ---
+    def submit(self, name, *args):
+        """Queue a controller call; returns a concurrent.futures.Future of its result."""
+        future = Future()
+        with self.cond:
+            if self.thread is None or self._stopping:
+                raise RuntimeError("actor is not running")
+            self.queue.append(Command(name, args, future, time.perf_counter()))
+            self.cond.notify()
+        return future
+
+    async def call(self, name, *args):
+        return await asyncio.wrap_future(self.submit(name, *args))
+
+    async def next_slide(self):
+        return await self.call("next_slide")
+
+    async def previous_slide(self):
+        return await self.call("previous_slide")
+
+    async def goto_slide(self, slide_index):
+        return await self.call("goto_slide", slide_index)
+
+    async def current_slide(self):
+        return await self.call("current_slide")
+
+    async def open_presentation(self, file_path):
+        return await self.call("open_presentation", file_path)
+
+    async def start_show(self):
+        return await self.call("start_show")
+
+    async def end_show(self):
+        return await self.call("end_show")
+
+    # --- Actor thread ---
+    def _run(self, ready):
+        try:
+            self.controller = self.factory()
+        except BaseException as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        while True:
+            with self.cond:
+                while not self.queue and not self._stopping:
+                    self.cond.wait()
+                if not self.queue:
+                    return
+                batch = [self.queue.popleft()]
+                if batch[0].name in NAVIGATION:
+                    while self.queue and self.queue[0].name in NAVIGATION:
+                        batch.append(self.queue.popleft())
+            batch = [cmd for cmd in batch if cmd.future.set_running_or_notify_cancel()]
+            if batch:
+                self._execute(batch)
+
+    def _anchor(self, batch):
+        """Index of the last absolute goto in a run of navigation, or None."""
+        return max((i for i, cmd in enumerate(batch) if cmd.name == "goto_slide"), default=None)
+
+    def _can_coalesce(self, batch):
+        """Whether one goto_slide can stand in for the run without overshooting the deck."""
+        if len(batch) < 2:
+            return False
+        if self.slides:
+            return True
+        start = self._anchor(batch)
+        rest = batch if start is None else batch[start + 1:]
+        return all(cmd.name != "next_slide" for cmd in rest)
+
+    def _target(self, batch):
+        """Slide a run of navigation commands ends on, starting from the last absolute goto."""
+        start = self._anchor(batch)
+        if start is None:
+            position = self._invoke("current_slide")
+            rest = batch
+        else:
+            position = batch[start].args[0]
+            rest = batch[start + 1:]
+        last = self.slides or float("inf")
+        # Step by step, as the show would: a "previous" on slide 1 stays there
+        for cmd in rest:
+            position = min(max(position + (1 if cmd.name == "next_slide" else -1), 1), last)
+        return min(max(position, 1), last)
+
+    def _invoke(self, name, *args):
+        self.round_trips += 1
+        return getattr(self.controller, name)(*args)
+
+    def _navigate(self, batch):
+        """Run a run of navigation commands one by one; the slide the show ends on."""
+        for cmd in batch:
+            self._invoke(cmd.name, *cmd.args)
+        if batch[-1].name == "goto_slide":
+            return batch[-1].args[0]
+        return self._invoke("current_slide")
+
+    def _execute(self, batch):
+        began = time.perf_counter()
+        coalesced = self._can_coalesce(batch)
+        try:
+            if batch[0].name not in NAVIGATION:
+                result = self._invoke(batch[0].name, *batch[0].args)
+            elif coalesced:
+                result = self._target(batch)
+                self._invoke("goto_slide", result)
+            else:
+                result = self._navigate(batch)
+        except BaseException as e:
+            result, error = None, e
+        else:
+            error = None
+        ended = time.perf_counter()
+        for cmd in batch:
+            self.history.append(Timing(cmd.name, cmd.args, 1000 * (began - cmd.enqueued),
+                                       1000 * (ended - began), coalesced))
+            if error is not None:
+                cmd.future.set_exception(error)
+            else:
+                cmd.future.set_result(result)
+
+    def stats(self):
+        """Per command: count, coalesced count, mean queued and run times (ms)."""
+        out = {}
+        for t in list(self.history):
+            s = out.setdefault(t.name, {"count": 0, "coalesced": 0, "queued_ms": 0.0, "run_ms": 0.0})
+            s["count"] += 1
+            s["coalesced"] += t.coalesced
+            s["queued_ms"] += t.queued_ms
+            s["run_ms"] += t.run_ms
+        for s in out.values():
+            s["queued_ms"] = round(s["queued_ms"] / s["count"], 3)
+            s["run_ms"] = round(s["run_ms"] / s["count"], 3)
+        return out
@@ -0,0 +1,210 @@
+import json
+import random
+import time
+from collections import namedtuple
+
+# Methods every backend implements; PPTController delegates them unchanged
+COMMANDS = ("open_presentation", "start_show", "next_slide", "previous_slide", "goto_slide",
+            "current_slide", "end_show", "close")
+
+# One call in a trace: offset from the start of recording and duration (s)
+TraceEntry = namedtuple("TraceEntry", "name args at duration result error")
+
+
+class COMBackend:
+    """Drives a live PowerPoint through COM (Windows only)."""
+
+    def __init__(self):
+        import win32com.client  # only available on Windows with pywin32
+        self.app = win32com.client.Dispatch("PowerPoint.Application")
+        self.app.Visible = 1
+        self.presentation = None
+
+    def open_presentation(self, file_path):
+        self.presentation = self.app.Presentations.Open(file_path)
+
+    def start_show(self):
+        self.presentation.SlideShowSettings.Run()
+
+    def next_slide(self):
+        self.presentation.SlideShowWindow.View.Next()
+
+    def previous_slide(self):
+        self.presentation.SlideShowWindow.View.Previous()
+
+    def goto_slide(self, slide_index):
+        self.presentation.SlideShowWindow.View.GotoSlide(slide_index)
+
+    def current_slide(self):
+        return self.presentation.SlideShowWindow.View.CurrentShowPosition
+
+    def end_show(self):
+        window = self.presentation.SlideShowWindow
+        if window is not None:
+            window.View.Exit()
+
+    def close(self):
+        self.app.Quit()
+
+
+class SimulatedBackend:
+    """
+    Headless stand-in for PowerPoint, driven by PPTParser output. Tracks
+    the show position like a slideshow view: Next on the last slide and
+    Previous on the first stay put, and an out-of-range goto_slide raises
+    IndexError. Each call sleeps `latency` seconds (a float, or a dict per
+    command name) plus up to `jitter` seconds drawn from a seeded RNG, so
+    runs are repeatable.
+    """
+
+    def __init__(self, slides_data=None, latency=0.0, jitter=0.0, seed=0, sleep=time.sleep):
+        self.slides = None
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.sleep = sleep
+        self.position = None
+        self.file_path = None
+        if slides_data is not None:
+            self._load(slides_data)
+
+    def _load(self, slides_data):
+        self.slides = [s for s in slides_data if "slide_number" in s]
+
+    def _delay(self, name):
+        base = self.latency.get(name, 0.0) if isinstance(self.latency, dict) else self.latency
+        delay = base + (self.rng.random() * self.jitter if self.jitter else 0.0)
+        if delay > 0:
+            self.sleep(delay)
+
+    def _show(self):
+        if self.position is None:
+            raise RuntimeError("no slide show is running")
+
+    # --- Backend interface ---
+    def open_presentation(self, file_path):
+        self._delay("open_presentation")
+        self.file_path = file_path
+        if self.slides is None:
+            from parser import PPTParser
+            self._load(PPTParser(file_path).parse())
+
+    def start_show(self):
+        self._delay("start_show")
+        if self.slides is None:
+            raise RuntimeError("no presentation is open")
+        self.position = 1
+
+    def next_slide(self):
+        self._delay("next_slide")
+        self._show()
+        self.position = min(self.position + 1, len(self.slides))
+
+    def previous_slide(self):
+        self._delay("previous_slide")
+        self._show()
+        self.position = max(self.position - 1, 1)
+
+    def goto_slide(self, slide_index):
+        self._delay("goto_slide")
+        self._show()
+        if not 1 <= slide_index <= len(self.slides):
+            raise IndexError(f"slide {slide_index} out of range 1..{len(self.slides)}")
+        self.position = slide_index
+
+    def current_slide(self):
+        self._delay("current_slide")
+        self._show()
+        return self.position
+
+    def end_show(self):
+        self._delay("end_show")
+        self.position = None
+
+    def close(self):
+        self._delay("close")
+        self.position = None
+        self.slides = None
+
+    def slide(self):
+        """Parsed dict of the slide on screen."""
+        self._show()
+        return self.slides[self.position - 1]
+
+
+class RecordingBackend:
+    """Wraps any backend and appends a TraceEntry for every call it forwards."""
+
+    def __init__(self, backend, clock=time.perf_counter):
+        self.backend = backend
+        self.clock = clock
+        self.started = clock()
+        self.trace = []
+
+    def _call(self, name, *args):
+        at = self.clock()
+        try:
+            result = getattr(self.backend, name)(*args)
+        except Exception as e:
+            self.trace.append(TraceEntry(name, args, at - self.started, self.clock() - at, None, repr(e)))
+            raise
+        self.trace.append(TraceEntry(name, args, at - self.started, self.clock() - at, result, None))
+        return result
+
+    def __getattr__(self, name):
+        if name not in COMMANDS:
+            raise AttributeError(name)
+        return lambda *args: self._call(name, *args)
+
+    def save(self, path):
+        save_trace(self.trace, path)
+
+
+def save_trace(trace, path):
+    with open(path, "w", encoding="utf-8") as f:
+        for entry in trace:
+            f.write(json.dumps(entry._asdict()) + "\n")
+
+
+def load_trace(path):
+    with open(path, encoding="utf-8") as f:
+        return [TraceEntry(**{**d, "args": tuple(d["args"])}) for d in map(json.loads, f)]
+
+
+def replay(trace, backend, paced=False, sleep=time.sleep):
+    """
+    Re-issue a trace against `backend`. Unpaced, calls go back to back (for
+    throughput); paced, each starts at its recorded offset. Returns a new
+    trace of what happened, plus the indexes of calls whose result or
+    error differs from the recording.
+    """
+    recorder = RecordingBackend(backend)
+    mismatches = []
+    for i, entry in enumerate(trace):
+        if paced:
+            wait = entry.at - (recorder.clock() - recorder.started)
+            if wait > 0:
+                sleep(wait)
+        try:
+            recorder._call(entry.name, *entry.args)
+        except Exception:
+            pass
+        got = recorder.trace[-1]
+        if (got.result, got.error is None) != (entry.result, entry.error is None):
+            mismatches.append(i)
+    return recorder.trace, mismatches
+
+
+def make_backend(spec="com", slides_data=None):
+    """
+    Build a backend from a config string:
+
+        com                     live PowerPoint (Windows)
+        sim[:<latency ms>]      SimulatedBackend, parsing the deck on open
+    """
+    kind, _, rest = spec.partition(":")
+    if kind == "com":
+        return COMBackend()
+    if kind == "sim":
+        return SimulatedBackend(slides_data, latency=float(rest) / 1000 if rest else 0.0)
+    raise ValueError(f"unknown backend {spec!r}")
@@ -0,0 +1,118 @@
+"""
+Navigation throughput and latency on the simulated backend, from a trace.
+
+Builds an N-slide deck and records a seeded navigation session (bursts of
+"next", occasional "previous" and jumps, an out-of-range goto now and
+then) against a SimulatedBackend with per-call latency. The saved trace
+is then replayed back to back against a fresh backend, checking every
+result matches the recording, and the same commands are pushed through
+ControllerActor in their bursts to show what coalescing saves.
+
+    python bench_backends.py --slides 50 --commands 400 --latency-ms 5
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from actor import ControllerActor
+from backends import RecordingBackend, SimulatedBackend, load_trace, replay
+from bench_parse_cache import build_deck
+from controller import PPTController
+from ooxml import FastPPTParser
+
+
+def session(n_commands, n_slides, rng):
+    """Bursts of navigation as a voice pipeline would issue them: [[(name, args)]]."""
+    bursts, total = [], 0
+    while total < n_commands:
+        r = rng.random()
+        if r < 0.6:
+            burst = [("next_slide", ())] * rng.randint(1, 4)
+        elif r < 0.8:
+            burst = [("previous_slide", ())] * rng.randint(1, 2)
+        elif r < 0.95:
+            burst = [("goto_slide", (rng.randint(1, n_slides),))]
+        else:
+            burst = [("goto_slide", (n_slides + rng.randint(1, 5),))]  # rejected
+        bursts.append(burst)
+        total += len(burst)
+    return bursts
+
+
+def percentiles(samples_ms):
+    samples_ms = sorted(samples_ms)
+    return statistics.median(samples_ms), samples_ms[int(0.95 * (len(samples_ms) - 1))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, default=50)
+    ap.add_argument("--commands", type=int, default=400)
+    ap.add_argument("--latency-ms", type=float, default=5.0)
+    ap.add_argument("--jitter-ms", type=float, default=2.0)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    latency, jitter = args.latency_ms / 1000, args.jitter_ms / 1000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = os.path.join(tmp, "deck.pptx")
+        build_deck(deck, args.slides)
+        slides_data = FastPPTParser(deck).parse()
+        bursts = session(args.commands, args.slides, random.Random(args.seed))
+
+        # --- Record ---
+        recorder = RecordingBackend(SimulatedBackend(latency=latency, jitter=jitter, seed=args.seed))
+        controller = PPTController(recorder)
+        controller.open_presentation(deck)
+        controller.start_show()
+        for burst in bursts:
+            for name, call_args in burst:
+                try:
+                    getattr(controller, name)(*call_args)
+                except IndexError:
+                    pass
+        controller.current_slide()
+        trace_path = os.path.join(tmp, "session.jsonl")
+        recorder.save(trace_path)
+        trace = load_trace(trace_path)
+        rejected = sum(entry.error is not None for entry in trace)
+        print(f"recorded {len(trace)} calls ({rejected} rejected gotos) on a {args.slides}-slide deck, "
+              f"{args.latency_ms:g} ms + up to {args.jitter_ms:g} ms per call")
+
+        # --- Replay, back to back ---
+        backend = SimulatedBackend(slides_data, latency=latency, jitter=jitter, seed=args.seed)
+        start = time.perf_counter()
+        replayed, mismatches = replay(trace, backend)
+        elapsed = time.perf_counter() - start
+        assert not mismatches, f"replay diverged from the recording at calls {mismatches[:5]}"
+        p50, p95 = percentiles([1000 * e.duration for e in replayed])
+        print(f"replay:  {len(replayed) / elapsed:7.1f} calls/s, per call p50 {p50:.2f} ms p95 {p95:.2f} ms, "
+              f"final slide {replayed[-1].result} (recorded {trace[-1].result})")
+
+        # --- The same bursts through the actor ---
+        backend = SimulatedBackend(slides_data, latency=latency, jitter=jitter, seed=args.seed)
+        backend.start_show()
+        waits = []
+        start = time.perf_counter()
+        with ControllerActor(factory=lambda: PPTController(backend), slides=args.slides) as actor:
+            for burst in bursts:
+                sent = time.perf_counter()
+                futures = [actor.submit(name, *call_args) for name, call_args in burst]
+                for future in futures:
+                    try:
+                        future.result()
+                    except IndexError:
+                        pass
+                waits.append(1000 * (time.perf_counter() - sent))
+        elapsed = time.perf_counter() - start
+        p50, p95 = percentiles(waits)
+        print(f"actor:   {args.commands / elapsed:7.1f} commands/s in {actor.round_trips} round trips "
+              f"for {sum(map(len, bursts))} commands, per burst p50 {p50:.2f} ms p95 {p95:.2f} ms, "
+              f"final slide {backend.position}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Parsed-deck memory and load time: JSON file vs ColumnarDeck sidecar.
+
+Generates PPTParser output for an N-slide deck, writes it both as the
+JSON file PPTParser's __main__ produces and as a columnar sidecar, then
+measures file size, load time, memory held after loading (tracemalloc),
+and the time to read every slide's shape boxes. Round trips are checked
+against the original data, and to_json() against the JSON file.
+
+    python bench_columnar.py --slides 2000 --shapes 12
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from columnar import ColumnarDeck
+
+TYPES = ("SlidePlaceholder", "Shape", "Picture", "GraphicFrame", "Connector", "GroupShape")
+WORDS = "revenue growth pipeline roadmap hiring security latency budget mobile team plan review".split()
+
+
+def parse_output(n_slides, n_shapes, rng):
+    data = [{"file_name": "bench"}]
+    for i in range(1, n_slides + 1):
+        title = f"Slide {i}: {rng.choice(WORDS).title()}"
+        shapes = [{"type": "SlidePlaceholder", "left": 838, "top": 365, "width": 10515, "height": 1326,
+                   "text": title}]
+        for _ in range(n_shapes - 1):
+            kind = rng.choice(TYPES)
+            text = " ".join(rng.choices(WORDS, k=rng.randint(2, 12))) if kind in ("Shape", "SlidePlaceholder") else None
+            shapes.append({"type": kind, "left": rng.randint(0, 11000), "top": rng.randint(0, 6000),
+                           "width": rng.randint(10, 5000), "height": rng.randint(10, 3000), "text": text})
+        data.append({"slide_number": i, "title": title, "shapes": shapes})
+    return data
+
+
+def measure(load):
+    """(result, load ms, bytes still allocated by the result)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    ms = 1000 * (time.perf_counter() - start)
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # timing again without tracemalloc's overhead
+    start = time.perf_counter()
+    load()
+    return result, min(ms, 1000 * (time.perf_counter() - start)), held
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return 1000 * (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, default=2000)
+    ap.add_argument("--shapes", type=int, default=12, help="shapes per slide")
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    data = parse_output(args.slides, args.shapes, random.Random(args.seed))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "bench.json")
+        sidecar = os.path.join(tmp, "bench.deck")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"), ensure_ascii=False)
+        ColumnarDeck.from_parse(data).save(sidecar)
+
+        def load_json():
+            with open(json_path, encoding="utf-8") as f:
+                return json.load(f)
+
+        loaded, json_ms, json_mem = measure(load_json)
+        deck, col_ms, col_mem = measure(lambda: ColumnarDeck.open(sidecar))
+        assert loaded == data
+        assert deck.to_list() == data, "sidecar round trip differs"
+        with open(json_path, encoding="utf-8") as f:
+            assert deck.to_json() == f.read(), "to_json() differs from the JSON file"
+        _, built_ms, built_mem = measure(lambda: ColumnarDeck.from_parse(data))
+
+        json_boxes_ms = timed(lambda: [[(s["left"], s["top"], s["width"], s["height"]) for s in slide["shapes"]]
+                                       for slide in loaded[1:]])
+        col_boxes_ms = timed(lambda: [slide.boxes for slide in deck])
+
+        print(f"{args.slides} slides x {args.shapes} shapes")
+        print(f"{'':22} {'file KB':>8} {'load ms':>8} {'held KB':>8} {'boxes ms':>9}")
+        print(f"{'JSON (json.load)':22} {os.path.getsize(json_path) // 1024:8d} {json_ms:8.1f} "
+              f"{json_mem // 1024:8d} {json_boxes_ms:9.1f}")
+        print(f"{'sidecar (mmap open)':22} {os.path.getsize(sidecar) // 1024:8d} {col_ms:8.2f} "
+              f"{col_mem // 1024:8d} {col_boxes_ms:9.1f}")
+        print(f"{'in memory (from_parse)':22} {'':8} {built_ms:8.1f} {built_mem // 1024:8d}")
+        print(f"to_json() of the whole deck from the sidecar: {timed(deck.to_json):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Intent fast path: match latency and precision on labelled command phrases.
+
+Streams each labelled utterance into a CommandRouter the way streaming ASR
+would (one partial per word, the whole utterance included, then the final
+transcript once the ASR decides the speaker stopped) and checks what
+it decided: the command fired (and its argument), a hand-off to the LLM,
+or nothing. Runs with every partial sent once, then with each sent
+twice (a pause after every word) for the default router and for the
+eager stable_partials=2 setting, and reports precision and recall of
+fired commands, how many of them fired before the final transcript
+(saving the ASR's end-of-utterance wait), and feed() latency.
+
+    python bench_intent.py --repeat 200
+"""
+import argparse
+import statistics
+import time
+
+from intent import CommandRouter, IntentMatcher
+
+SLIDES = 30
+NEXT, PREV = "next_slide", "previous_slide"
+
+# (utterance, expected): a command tuple (name, arg) with arg = slide number for
+# goto_slide or the step count otherwise, "llm" for a hand-off, None for plain speech
+LABELLED = [
+    ("next", (NEXT, 1)), ("next slide", (NEXT, 1)), ("next slide please", (NEXT, 1)),
+    ("okay next one", (NEXT, 1)), ("maya go to the next slide", (NEXT, 1)), ("move on", (NEXT, 1)),
+    ("let's move on to the next slide", (NEXT, 1)), ("go forward", (NEXT, 1)), ("advance", (NEXT, 1)),
+    ("skip two slides", (NEXT, 2)), ("skip ahead three", (NEXT, 3)), ("forward two", (NEXT, 2)),
+    ("two slides forward", (NEXT, 2)), ("next page", (NEXT, 1)), ("um next", (NEXT, 1)),
+    ("previous", (PREV, 1)), ("previous slide", (PREV, 1)), ("go back", (PREV, 1)), ("back one", (PREV, 1)),
+    ("go back two slides", (PREV, 2)), ("back three", (PREV, 3)), ("three slides back", (PREV, 3)),
+    ("can you go back please", (PREV, 1)), ("go to the previous slide", (PREV, 1)), ("move back", (PREV, 1)),
+    ("go to slide four", ("goto_slide", 4)), ("go to slide for", ("goto_slide", 4)),
+    ("slide twelve", ("goto_slide", 12)), ("jump to slide 7", ("goto_slide", 7)),
+    ("go to slide twenty one", ("goto_slide", 21)), ("take me to slide number nine", ("goto_slide", 9)),
+    ("show slide fifteen", ("goto_slide", 15)), ("go to the fifth slide", ("goto_slide", 5)),
+    ("jump to the 3rd slide", ("goto_slide", 3)), ("go back to slide two", ("goto_slide", 2)),
+    ("switch to slide eleven", ("goto_slide", 11)), ("go to the first slide", ("goto_slide", 1)),
+    ("go to the final slide", ("goto_slide", 30)), ("take me to the last slide", ("goto_slide", 30)),
+    ("bring up slide twenty", ("goto_slide", 20)), ("go to page six", ("goto_slide", 6)),
+    ("return to the beginning", ("goto_slide", 1)), ("slide number twenty-eight", ("goto_slide", 28)),
+    ("go to slide forty", "llm"),  # out of range: not ours to guess
+    ("last slide", "llm"), ("continue", "llm"), ("start", "llm"),
+    ("i think we should go to slide four", "llm"), ("let's go back to what we discussed", "llm"),
+    ("can we skip this part", "llm"), ("go back to the chart with revenue", "llm"),
+    ("next quarter we expect strong growth across all regions", None),
+    ("as you can see revenue went up by forty percent", None),
+    ("thank you all for coming today", None),
+    ("our team worked on this for two years", None),
+    ("the previous version of the product was slower and harder to use", None),
+    ("we are now moving into european markets", None),
+    ("this chart shows the number of customers per region", None),
+    ("let me tell you a story about how we started", None),
+]
+
+
+def stream(router, text, repeats=1):
+    """
+    Feed one utterance word by word, each partial `repeats` times (ASR
+    re-sends a partial while the speaker pauses); returns (outcome, words
+    heard when it was decided, whether that took the final transcript,
+    feed() times in us).
+    """
+    words = text.split()
+    times = []
+    for n in range(1, len(words) + 2):
+        final = n > len(words)
+        for _ in range(1 if final else repeats):
+            start = time.perf_counter()
+            outcome = router.feed(" ".join(words[:n]), final=final)
+            times.append(1e6 * (time.perf_counter() - start))
+            if outcome is not None:
+                break
+        if outcome is not None:
+            if not final:
+                router.feed(text, final=True)  # the utterance still ends
+            return outcome, min(n, len(words)), final, times
+    return None, len(words), True, times
+
+
+def evaluate(router, executed, clock, repeats, label):
+    fired = correct = commands = early = llm_ok = quiet_ok = 0
+    wrong = []
+    for text, expected in LABELLED:
+        clock[0] += 10  # utterances far apart: no debouncing here
+        executed.clear()
+        outcome, _, final, _ = stream(router, text, repeats)
+        kind = outcome.kind if outcome else None
+        if isinstance(expected, tuple):
+            commands += 1
+        if kind == "fired":
+            fired += 1
+            name, arg = executed[0][0], (executed[0][1] if executed[0][0] == "goto_slide" else len(executed))
+            if (name, arg) == expected:
+                correct += 1
+                early += not final
+            else:
+                wrong.append((text, expected, (name, arg)))
+        elif expected == "llm":
+            llm_ok += kind == "llm"
+            if kind != "llm":
+                wrong.append((text, expected, kind))
+        elif expected is None:
+            quiet_ok += kind == "ignored"
+            if kind != "ignored":
+                wrong.append((text, expected, kind))
+        else:
+            wrong.append((text, expected, kind))
+
+    n_llm = sum(e == "llm" for _, e in LABELLED)
+    n_quiet = sum(e is None for _, e in LABELLED)
+    print(f"{label}: fired {fired}, precision {correct / max(fired, 1):.1%}, "
+          f"recall {correct / commands:.1%}, early {early}/{correct} ({early / max(correct, 1):.0%}) "
+          f"before the final transcript; "
+          f"to the LLM {llm_ok}/{n_llm}, plain speech ignored {quiet_ok}/{n_quiet}")
+    for text, expected, got in wrong:
+        print(f"  miss: {text!r}: expected {expected}, got {got}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeat", type=int, default=200, help="passes over the labelled set, for timing")
+    args = ap.parse_args()
+
+    executed = []
+    clock = [0.0]
+    matcher = IntentMatcher()
+
+    def router(**kwargs):
+        return CommandRouter(lambda name, *a: executed.append((name, *a)), matcher,
+                             slides=SLIDES, clock=lambda: clock[0], **kwargs)
+
+    commands = sum(isinstance(e, tuple) for _, e in LABELLED)
+    print(f"{len(LABELLED)} labelled utterances: {commands} commands, "
+          f"{sum(e == 'llm' for _, e in LABELLED)} for the LLM, {sum(e is None for _, e in LABELLED)} plain speech")
+    evaluate(router(), executed, clock, 1, "default")
+    evaluate(router(), executed, clock, 2, "default, pauses between words")
+    evaluate(router(stable_partials=2), executed, clock, 2, "stable_partials=2, pauses between words")
+    router = router()
+
+    # Debounce: the same command again within the window is dropped
+    clock[0] += 10
+    executed.clear()
+    for _ in range(3):
+        stream(router, "next slide")
+        clock[0] += 0.2
+    print(f"'next slide' x3 within 0.4 s: executed {len(executed)}, debounced {router.counts['debounced']}")
+
+    samples = []
+    for _ in range(args.repeat):
+        for text, _ in LABELLED:
+            clock[0] += 10
+            samples.extend(stream(router, text)[3])
+    samples.sort()
+    print(f"feed() over {len(samples)} partials: p50 {statistics.median(samples):.1f} us, "
+          f"p99 {samples[int(0.99 * (len(samples) - 1))]:.1f} us, max {samples[-1]:.0f} us")
+
+
+if __name__ == "__main__":
+    main()
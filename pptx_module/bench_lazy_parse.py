@@ -0,0 +1,61 @@
+"""
+Time to first slide and total parse time: eager, lazy and process-parallel.
+
+For synthetic decks of each size, compares PPTParser.parse() (nothing is
+usable until every slide is done), iter_slides() (first slide as soon as
+the deck is open) and parse_parallel(). Every mode's output is checked
+against parse().
+
+    python bench_lazy_parse.py --slides 10 100 1000 --workers 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench_parse_cache import build_deck
+from parser import PPTParser
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    args = ap.parse_args()
+
+    print(f"{'slides':>6s} {'mode':10s} {'first slide':>12s} {'total':>10s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.slides:
+            deck = os.path.join(tmp, f"deck{n}.pptx")
+            build_deck(deck, n)
+
+            start = time.perf_counter()
+            expected = PPTParser(deck).parse()
+            eager = time.perf_counter() - start
+
+            start = time.perf_counter()
+            slides = PPTParser(deck).iter_slides()
+            lazy = [next(slides)]
+            first = time.perf_counter() - start
+            lazy.extend(slides)
+            lazy_total = time.perf_counter() - start
+            assert lazy == expected[1:], "iter_slides() differs from parse()"
+
+            start = time.perf_counter()
+            single = PPTParser(deck).get_slide(n)
+            random_access = time.perf_counter() - start
+            assert single == expected[n]
+
+            start = time.perf_counter()
+            parallel = PPTParser(deck).parse_parallel(workers=args.workers)
+            parallel_total = time.perf_counter() - start
+            assert parallel == expected, "parse_parallel() differs from parse()"
+
+            for mode, t_first, total in (("eager", eager, eager), ("lazy", first, lazy_total),
+                                         ("get_slide", random_access, random_access),
+                                         (f"parallel/{args.workers}", parallel_total, parallel_total)):
+                print(f"{n:6d} {mode:10s} {1000 * t_first:9.1f} ms {1000 * total:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
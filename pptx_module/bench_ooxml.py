@@ -0,0 +1,55 @@
+"""
+Shapes per second: python-pptx PPTParser vs the FastPPTParser OOXML path.
+
+    python bench_ooxml.py --slides 100 1000
+    python bench_ooxml.py --deck talk.pptx
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from bench_parse_cache import build_deck
+from ooxml import FastPPTParser
+from parser import PPTParser
+
+
+def measure(path, repeat):
+    rows = []
+    expected = None
+    for name, cls in (("python-pptx", PPTParser), ("ooxml", FastPPTParser)):
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            data = cls(path).parse()
+            best = min(best, time.perf_counter() - start)
+        expected = expected or data
+        assert data == expected, f"{name} output differs"
+        rows.append((name, best))
+    shapes = sum(len(s["shapes"]) for s in expected[1:])
+    return len(expected) - 1, shapes, rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, nargs="+", default=[100, 1000])
+    ap.add_argument("--deck", help="benchmark this .pptx instead of synthetic decks")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    print(f"{'slides':>6s} {'shapes':>7s} {'engine':12s} {'time':>10s} {'shapes/s':>10s} {'speedup':>8s}")
+    with tempfile.TemporaryDirectory() as tmp:
+        decks = [args.deck] if args.deck else []
+        for n in ([] if args.deck else args.slides):
+            decks.append(os.path.join(tmp, f"deck{n}.pptx"))
+            build_deck(decks[-1], n)
+        for path in decks:
+            slides, shapes, rows = measure(path, args.repeat)
+            base = rows[0][1]
+            for name, seconds in rows:
+                print(f"{slides:6d} {shapes:7d} {name:12s} {1000 * seconds:7.1f} ms {shapes / seconds:10.0f} "
+                      f"{base / seconds:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Deck reload time: PPTParser vs CachedPPTParser after a one-slide edit.
+
+Builds an N-slide deck, then times a full python-pptx parse, a cold
+cached parse, a reload of the unchanged file, and a reload after editing
+one slide's text and saving. The cached output is checked against
+PPTParser's after every step.
+
+    python bench_parse_cache.py --slides 300
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from pptx import Presentation
+from pptx.util import Inches
+
+from parse_cache import CachedPPTParser
+from parser import PPTParser
+
+
+def build_deck(path, n):
+    prs = Presentation()
+    for i in range(1, n + 1):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"Slide {i}"
+        slide.placeholders[1].text = f"First point of slide {i}\nSecond point\nThird point"
+        slide.shapes.add_textbox(Inches(1), Inches(6), Inches(4), Inches(0.5)).text = f"Footnote {i}"
+    prs.save(path)
+
+
+def edit_slide(path, number):
+    prs = Presentation(path)
+    prs.slides[number - 1].shapes.title.text = f"Slide {number} (edited)"
+    prs.save(path)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, 1000 * (time.perf_counter() - start)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, default=300)
+    ap.add_argument("--edit", type=int, default=None, help="slide to edit (default: the middle one)")
+    args = ap.parse_args()
+    edit = args.edit or args.slides // 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        deck = os.path.join(tmp, "deck.pptx")
+        cache_dir = os.path.join(tmp, "cache")
+        build_deck(deck, args.slides)
+        print(f"{args.slides}-slide deck, {os.path.getsize(deck) // 1024} KB")
+
+        def step(name):
+            full, full_ms = timed(lambda: PPTParser(deck).parse())
+            parser = CachedPPTParser(deck, cache_dir)
+            cached, cached_ms = timed(parser.parse)
+            assert cached == full, f"{name}: cached output differs from PPTParser"
+            changed = parser.changed if len(parser.changed) <= 5 else f"{len(parser.changed)} slides"
+            print(f"  {name:24s} PPTParser {full_ms:8.1f} ms   cached {cached_ms:8.1f} ms   "
+                  f"re-extracted: {changed or 'none'}")
+
+        step("cold cache")
+        step("unchanged reload")
+        edit_slide(deck, edit)
+        step(f"after editing slide {edit}")
+        step("unchanged reload")
+
+
+if __name__ == "__main__":
+    main()
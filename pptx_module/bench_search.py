@@ -0,0 +1,118 @@
+"""
+Slide search latency: SlideSearchIndex vs scanning every shape's text.
+
+Generates an N-slide deck in PPTParser's output format from a fixed topic
+vocabulary, then times exact, multi-word and misspelled queries against
+the index and against a linear scan of the parsed text. Also times an
+incremental update after editing one slide against a full rebuild, and
+checks both give the same rankings.
+
+    python bench_search.py --slides 500 --queries 2000
+"""
+import argparse
+import random
+import statistics
+import time
+
+from search import SlideSearchIndex, slide_text, tokenize
+
+TOPICS = ("revenue forecast quarterly growth pipeline customers retention churn pricing "
+          "roadmap hiring engineering security compliance architecture latency database "
+          "migration marketing campaign budget partners europe expansion mobile analytics "
+          "dashboard onboarding support satisfaction infrastructure costs outlook risks").split()
+FILLER = ("overview summary details notes next steps team plan results update review key "
+          "metrics goals status timeline owner action items highlights background context").split()
+
+
+def deck(n, rng):
+    slides = []
+    for i in range(1, n + 1):
+        topic = rng.sample(TOPICS, 2)
+        title = f"{topic[0].title()} {rng.choice(FILLER)}"
+        bullets = "\n".join(" ".join(rng.choices(TOPICS + FILLER * 3, k=rng.randint(5, 12))) for _ in range(4))
+        shapes = [{"type": "SlidePlaceholder", "left": 0, "top": 0, "width": 900, "height": 100, "text": title},
+                  {"type": "SlidePlaceholder", "left": 0, "top": 120, "width": 900, "height": 500,
+                   "text": f"{topic[1]} {bullets}"}]
+        slides.append({"slide_number": i, "title": title, "shapes": shapes})
+    return slides
+
+
+def misspell(word, rng):
+    i = rng.randrange(1, len(word) - 1)
+    op = rng.choice(("drop", "swap", "sub"))
+    if op == "drop":
+        return word[:i] + word[i + 1:]
+    if op == "swap":
+        return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+    return word[:i] + rng.choice("aeiou") + word[i + 1:]
+
+
+def linear_search(slides, query, limit=5):
+    """What parse() output supports today: count query-word hits in every slide's text."""
+    words = tokenize(query)
+    scores = []
+    for slide in slides:
+        text = tokenize(slide_text(slide))
+        hits = sum(text.count(w) for w in words)
+        if hits:
+            scores.append((-hits, slide["slide_number"]))
+    return [n for _, n in sorted(scores)[:limit]]
+
+
+def latency(fn, queries):
+    samples = []
+    for q in queries:
+        start = time.perf_counter()
+        fn(q)
+        samples.append(1e6 * (time.perf_counter() - start))
+    samples.sort()
+    return statistics.median(samples), samples[int(0.99 * (len(samples) - 1))]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, default=500)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+    slides = deck(args.slides, rng)
+
+    start = time.perf_counter()
+    index = SlideSearchIndex()
+    index.update(slides)
+    print(f"{args.slides} slides, {len(index.postings)} terms, built in "
+          f"{1000 * (time.perf_counter() - start):.1f} ms")
+
+    kinds = {
+        "one word": [rng.choice(TOPICS) for _ in range(args.queries)],
+        "phrase": [" ".join(["the slide about"] + rng.sample(TOPICS, 2)) for _ in range(args.queries)],
+        "misspelled": [misspell(rng.choice(TOPICS), rng) for _ in range(args.queries)],
+    }
+    print(f"{'query':>11} {'index p50':>10} {'p99':>8} {'scan p50':>10}")
+    for name, queries in kinds.items():
+        p50, p99 = latency(index.search, queries)
+        scan_p50, _ = latency(lambda q: linear_search(slides, q), queries[:50])
+        print(f"{name:>11} {p50:8.0f}us {p99:6.0f}us {scan_p50:8.0f}us")
+
+    found = sum(index.best_slide(q) is not None for q in kinds["misspelled"])
+    print(f"misspelled queries with a hit: {found}/{len(kinds['misspelled'])}")
+
+    edited = args.slides // 2
+    slides[edited - 1]["shapes"][1]["text"] = "brand new quantum teleportation results"
+    start = time.perf_counter()
+    redone = index.update(slides)
+    incremental_ms = 1000 * (time.perf_counter() - start)
+    start = time.perf_counter()
+    rebuilt = SlideSearchIndex()
+    rebuilt.update(slides)
+    rebuild_ms = 1000 * (time.perf_counter() - start)
+    assert (index.postings, index.fuzzy_keys) == (rebuilt.postings, rebuilt.fuzzy_keys)
+    for q in kinds["phrase"][:200] + ["quantum teleportation", "teleportaton"]:
+        assert index.search(q) == rebuilt.search(q), f"incremental index differs on {q!r}"
+    print(f"edit slide {edited}: incremental update {incremental_ms:.2f} ms (re-indexed {redone}), "
+          f"full rebuild {rebuild_ms:.1f} ms; best hit for 'teleportaton': slide {index.best_slide('teleportaton')}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Hit-testing on dense slides: SlideIndex vs a linear scan of the shape dicts.
+
+Generates slides of N random shapes in PPTParser's output format, then
+times point, rectangle and nearest-shape queries against a Python scan of
+the "shapes" list (what the flat parse output offers today) and a
+vectorised NumPy scan of the same boxes. Every answer is checked against
+the Python scan.
+
+    python bench_spatial.py --shapes 100 1000 5000 --queries 2000
+"""
+import argparse
+import math
+import random
+import time
+
+import numpy as np
+
+from spatial import SlideIndex
+
+# 13.33in x 7.5in slide in PPTParser units (EMU / 1000)
+SLIDE_W, SLIDE_H = 12192, 6858
+
+
+def dense_slide(n, rng):
+    shapes = []
+    for _ in range(n):
+        w = rng.randint(50, 1500)
+        h = rng.randint(30, 600)
+        shapes.append({"type": "Shape", "left": rng.randint(0, SLIDE_W - w), "top": rng.randint(0, SLIDE_H - h),
+                       "width": w, "height": h, "text": None})
+    return shapes
+
+
+# --- Linear scans ---
+def scan_at(shapes, x, y):
+    return [i for i in range(len(shapes) - 1, -1, -1)
+            if shapes[i]["left"] <= x <= shapes[i]["left"] + shapes[i]["width"]
+            and shapes[i]["top"] <= y <= shapes[i]["top"] + shapes[i]["height"]]
+
+
+def scan_overlapping(shapes, left, top, width, height):
+    return [i for i, s in enumerate(shapes)
+            if s["left"] <= left + width and left <= s["left"] + s["width"]
+            and s["top"] <= top + height and top <= s["top"] + s["height"]]
+
+
+def scan_nearest(shapes, x, y):
+    def dist(s):
+        dx = max(s["left"] - x, 0, x - s["left"] - s["width"])
+        dy = max(s["top"] - y, 0, y - s["top"] - s["height"])
+        return math.hypot(dx, dy)
+    return min(dist(s) for s in shapes)
+
+
+def numpy_at(boxes, x, y):
+    return np.flatnonzero((boxes[:, 0] <= x) & (x <= boxes[:, 2]) & (boxes[:, 1] <= y) & (y <= boxes[:, 3]))[::-1]
+
+
+def timed(fn, queries):
+    start = time.perf_counter()
+    results = [fn(*q) for q in queries]
+    return results, 1e6 * (time.perf_counter() - start) / len(queries)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--shapes", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    rng = random.Random(args.seed)
+
+    print(f"{'shapes':>7} {'query':>8} {'scan us':>9} {'numpy us':>9} {'index us':>9} {'speedup':>8}")
+    for n in args.shapes:
+        shapes = dense_slide(n, rng)
+        start = time.perf_counter()
+        index = SlideIndex(shapes)
+        build_ms = 1000 * (time.perf_counter() - start)
+        points = [(rng.randint(0, SLIDE_W), rng.randint(0, SLIDE_H)) for _ in range(args.queries)]
+        rects = [(x, y, rng.randint(0, 600), rng.randint(0, 400)) for x, y in points]
+
+        expected, scan_us = timed(lambda x, y: scan_at(shapes, x, y), points)
+        _, numpy_us = timed(lambda x, y: numpy_at(index.boxes, x, y), points)
+        got, index_us = timed(index.at, points)
+        assert got == expected, "point query differs from the linear scan"
+        print(f"{n:7d} {'point':>8} {scan_us:9.1f} {numpy_us:9.1f} {index_us:9.1f} {scan_us / index_us:7.1f}x")
+
+        expected, scan_us = timed(lambda *r: scan_overlapping(shapes, *r), rects)
+        got, index_us = timed(index.overlapping, rects)
+        assert got == expected, "rectangle query differs from the linear scan"
+        print(f"{n:7d} {'rect':>8} {scan_us:9.1f} {'':>9} {index_us:9.1f} {scan_us / index_us:7.1f}x")
+
+        expected, scan_us = timed(lambda x, y: scan_nearest(shapes, x, y), points)
+        got, index_us = timed(index.nearest, points)
+        assert all(math.isclose(g[0][1], e) for g, e in zip(got, expected)), "nearest differs from the linear scan"
+        print(f"{n:7d} {'nearest':>8} {scan_us:9.1f} {'':>9} {index_us:9.1f} {scan_us / index_us:7.1f}x")
+        print(f"{'':7} index build {build_ms:.1f} ms, {index.cols}x{index.rows} grid, "
+              f"{len(index.cell_items)} cell entries")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Parser benchmark suite over a matrix of synthetic deck sizes.
+
+For every (slides, profile) cell a seeded deck is generated with
+DeckGenerator, then each parser's parse() runs in a fresh process that
+reports wall time, peak Python heap (tracemalloc), growth in peak RSS
+(where the OS reports it) and the size of the compact JSON output.
+Results are written to bench_results.json next to this file, which is
+checked in so changes in parser cost show up in review.
+
+    python bench_suite.py                     # full matrix
+    python bench_suite.py --slides 100 300 --profiles light
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from create import DeckGenerator
+
+RESULTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_results.json")
+
+PROFILES = {
+    "light": dict(shapes=(2, 6), words=(4, 40), tables=0.1, pictures=0.1, groups=0.05),
+    "dense": dict(shapes=(10, 20), words=(10, 60), tables=0.3, pictures=0.3, groups=0.2),
+}
+PARSERS = ("PPTParser", "FastPPTParser")
+
+
+def measure_parse(parser_name, path):
+    """Runs in its own process, so memory figures cover this one parse only."""
+    import tracemalloc
+    try:
+        import resource
+    except ImportError:  # Windows
+        resource = None
+    from ooxml import FastPPTParser
+    from parser import PPTParser
+    parser_cls = {"PPTParser": PPTParser, "FastPPTParser": FastPPTParser}[parser_name]
+
+    def max_rss_kb():
+        if resource is None:
+            return None
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss // 1024 if sys.platform == "darwin" else rss
+
+    rss_before = max_rss_kb()
+    start = time.perf_counter()
+    data = parser_cls(path).parse()
+    seconds = time.perf_counter() - start
+    rss_after = max_rss_kb()
+    # Heap peak from a second parse: tracemalloc would slow the timed one
+    del data
+    tracemalloc.start()
+    data = parser_cls(path).parse()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "parse_s": round(seconds, 3),
+        "py_heap_peak_kb": peak // 1024,
+        "rss_growth_kb": None if rss_before is None else rss_after - rss_before,
+        "json_kb": len(json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()) // 1024,
+        "shapes": sum(len(s["shapes"]) for s in data[1:]),
+    }
+
+
+def in_fresh_process(fn, *args):
+    with ProcessPoolExecutor(1, max_tasks_per_child=1) as pool:
+        return pool.submit(fn, *args).result()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--slides", type=int, nargs="+", default=[100, 300, 1000])
+    ap.add_argument("--profiles", nargs="+", default=list(PROFILES), choices=list(PROFILES))
+    ap.add_argument("--parsers", nargs="+", default=list(PARSERS), choices=list(PARSERS))
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for deck generation")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", default=RESULTS)
+    args = ap.parse_args()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for profile in args.profiles:
+            for slides in args.slides:
+                path = os.path.join(tmp, f"{profile}-{slides}.pptx")
+                start = time.perf_counter()
+                DeckGenerator(slides, seed=args.seed, **PROFILES[profile]).build(path, workers=args.workers)
+                build_s = time.perf_counter() - start
+                for parser_name in args.parsers:
+                    result = in_fresh_process(measure_parse, parser_name, path)
+                    run = {"profile": profile, "slides": slides, "parser": parser_name,
+                           "deck_kb": os.path.getsize(path) // 1024, "build_s": round(build_s, 2), **result}
+                    runs.append(run)
+                    rss = "n/a" if run["rss_growth_kb"] is None else f"{run['rss_growth_kb'] / 1024:.1f} MB"
+                    print(f"{profile:6s} {slides:5d} slides {run['shapes']:6d} shapes {parser_name:14s} "
+                          f"{run['parse_s']:7.2f} s  heap {run['py_heap_peak_kb'] / 1024:6.1f} MB  rss +{rss:>8s}  "
+                          f"json {run['json_kb']:6d} KB  (built in {build_s:.1f} s)", flush=True)
+
+    results = {
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count(), "generator_workers": args.workers, "seed": args.seed},
+        "runs": runs,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
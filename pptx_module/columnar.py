@@ -0,0 +1,252 @@
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+# Sidecar layout, all little-endian, each array starting on an 8-byte boundary:
+#   header (MAGIC, version, slides, shapes, strings, file name string id,
+#           source deck size and mtime in ns, 0 when unknown)
+#   slide_start int32[slides + 1]   first shape of each slide
+#   titles      int32[slides]       string id, -1 for None
+#   boxes       int32[shapes, 4]    left, top, width, height
+#   types       int32[shapes]       string id
+#   texts       int32[shapes]       string id, -1 for None
+#   offsets     int64[strings + 1]  byte ranges of the strings in the blob
+#   blob        UTF-8 string data
+MAGIC = b"PPTCOL\0\0"
+VERSION = 2
+HEADER = struct.Struct("<8sIIIIiQQ")
+
+
+def _align(n):
+    return -(-n // 8) * 8
+
+
+def source_stamp(path):
+    """(size, mtime in ns) of the file a sidecar was built from; equal stamps mean it is current."""
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+class StringTable:
+    """Interned strings: each distinct string stored once and referred to by id."""
+
+    __slots__ = ("offsets", "blob", "_cache", "_ids")
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+        self._cache = {}
+        self._ids = None
+
+    @classmethod
+    def build(cls, strings):
+        encoded = [s.encode("utf-8") for s in strings]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        table = cls(offsets, b"".join(encoded))
+        table._cache = dict(enumerate(strings))
+        return table
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if i < 0:
+            return None
+        s = self._cache.get(i)
+        if s is None:
+            s = self._cache[i] = str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+        return s
+
+    def find(self, s):
+        """Id of `s`, or -1 when the deck doesn't contain it."""
+        if self._ids is None:
+            self._ids = {self[i]: i for i in range(len(self))}
+        return self._ids.get(s, -1)
+
+
+class SlideRecord:
+    """One slide of a ColumnarDeck; reads its columns, holds no copies."""
+
+    __slots__ = ("deck", "index")
+
+    def __init__(self, deck, index):
+        self.deck = deck
+        self.index = index
+
+    @property
+    def slide_number(self):
+        return self.index + 1
+
+    @property
+    def title(self):
+        return self.deck.strings[int(self.deck.titles[self.index])]
+
+    @property
+    def span(self):
+        return int(self.deck.slide_start[self.index]), int(self.deck.slide_start[self.index + 1])
+
+    @property
+    def boxes(self):
+        """(shapes, 4) int32 view: left, top, width, height."""
+        start, stop = self.span
+        return self.deck.boxes[start:stop]
+
+    def __len__(self):
+        start, stop = self.span
+        return stop - start
+
+    def shapes(self):
+        d = self.deck
+        start, stop = self.span
+        strings = d.strings
+        return [{"type": strings[t], "left": left, "top": top, "width": width, "height": height,
+                 "text": strings[x]}
+                for (left, top, width, height), t, x in zip(d.boxes[start:stop].tolist(),
+                                                            d.types[start:stop].tolist(),
+                                                            d.texts[start:stop].tolist())]
+
+    def to_dict(self):
+        """The slide as PPTParser.parse() returns it."""
+        return {"slide_number": self.slide_number, "title": self.title, "shapes": self.shapes()}
+
+
+class ColumnarDeck:
+    """
+    Parsed deck data as columns instead of nested dicts. Shape geometry,
+    type and text ids are int32 arrays indexed by shape; `slide_start`
+    gives each slide's range of shapes; every string (titles, texts, type
+    names) lives once in a StringTable. A deck saved with `save()` can be
+    reopened with `open()` as views over an mmap of the file, without
+    parsing or copying anything up front.
+    """
+
+    __slots__ = ("file_name", "slide_start", "titles", "boxes", "types", "texts", "strings", "source", "_mmap")
+
+    def __init__(self, file_name, slide_start, titles, boxes, types, texts, strings, source=None, _mmap=None):
+        self.file_name = file_name
+        self.slide_start = slide_start
+        self.titles = titles
+        self.boxes = boxes
+        self.types = types
+        self.texts = texts
+        self.strings = strings
+        self.source = source  # source_stamp() of the deck, when known
+        self._mmap = _mmap
+
+    @classmethod
+    def from_parse(cls, slides_data):
+        """Build from PPTParser.parse() output (header dict first, then slides)."""
+        ids = {}
+
+        def intern(s):
+            if s is None:
+                return -1
+            i = ids.get(s)
+            if i is None:
+                i = ids[s] = len(ids)
+            return i
+
+        file_name = slides_data[0]["file_name"]
+        intern(file_name)
+        slides = slides_data[1:]
+        slide_start = [0]
+        titles, boxes, types, texts = [], [], [], []
+        for slide in slides:
+            titles.append(intern(slide["title"]))
+            for shape in slide["shapes"]:
+                boxes.append((shape["left"], shape["top"], shape["width"], shape["height"]))
+                types.append(intern(shape["type"]))
+                texts.append(intern(shape["text"]))
+            slide_start.append(len(boxes))
+        return cls(file_name,
+                   np.array(slide_start, dtype=np.int32),
+                   np.array(titles, dtype=np.int32),
+                   np.array(boxes, dtype=np.int32).reshape(len(boxes), 4),
+                   np.array(types, dtype=np.int32),
+                   np.array(texts, dtype=np.int32),
+                   StringTable.build(list(ids)))
+
+    def __len__(self):
+        return len(self.titles)
+
+    def __iter__(self):
+        return (SlideRecord(self, i) for i in range(len(self)))
+
+    def slide(self, n):
+        """SlideRecord for slide number `n` (1-based)."""
+        if not 1 <= n <= len(self):
+            raise IndexError(f"slide {n} out of range 1..{len(self)}")
+        return SlideRecord(self, n - 1)
+
+    def to_list(self):
+        """Exactly what PPTParser.parse() returned."""
+        return [{"file_name": self.file_name}] + [slide.to_dict() for slide in self]
+
+    def to_json(self, **kwargs):
+        """The JSON PPTParser's __main__ writes; json.dump arguments may be overridden."""
+        kwargs.setdefault("separators", (",", ":"))
+        kwargs.setdefault("ensure_ascii", False)
+        return json.dumps(self.to_list(), **kwargs)
+
+    # --- Binary sidecar ---
+    def save(self, path, source=None):
+        """Write the sidecar; `source` (a source_stamp(), default self.source) lets readers tell it is stale."""
+        source = source or self.source or (0, 0)
+        strings = self.strings
+        file_name_id = strings.find(self.file_name)
+        arrays = [self.slide_start, self.titles, self.boxes, self.types, self.texts, strings.offsets]
+        with open(path, "wb") as f:
+            header = HEADER.pack(MAGIC, VERSION, len(self), len(self.types), len(strings), file_name_id,
+                                 *source)
+            f.write(header + b"\0" * (_align(len(header)) - len(header)))
+            for array in arrays:
+                data = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")).tobytes()
+                f.write(data + b"\0" * (_align(len(data)) - len(data)))
+            f.write(strings.blob)
+
+    @classmethod
+    def open(cls, path):
+        """Map a sidecar written by save(); arrays are read-only views of the file."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n_slides, n_shapes, n_strings, file_name_id, size, mtime_ns = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} deck sidecar")
+        offset = _align(HEADER.size)
+
+        def take(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(mm, dtype=dtype, count=count, offset=offset)
+            offset += _align(array.nbytes)
+            return array
+
+        slide_start = take("<i4", n_slides + 1)
+        titles = take("<i4", n_slides)
+        boxes = take("<i4", n_shapes * 4).reshape(n_shapes, 4)
+        types = take("<i4", n_shapes)
+        texts = take("<i4", n_shapes)
+        offsets = take("<i8", n_strings + 1)
+        strings = StringTable(offsets, memoryview(mm)[offset:])
+        source = (size, mtime_ns) if size or mtime_ns else None
+        return cls(strings[file_name_id], slide_start, titles, boxes, types, texts, strings, source, mm)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from parse_cache import CachedPPTParser
+    ap = argparse.ArgumentParser(description="Parse a deck and write its columnar sidecar")
+    ap.add_argument("deck")
+    ap.add_argument("--out", help="sidecar path (default: <deck name>.deck)")
+    args = ap.parse_args()
+    start = time.perf_counter()
+    deck = ColumnarDeck.from_parse(CachedPPTParser(args.deck).parse())
+    out = args.out or os.path.splitext(os.path.basename(args.deck))[0] + ".deck"
+    deck.save(out, source=source_stamp(args.deck))
+    print(f"{len(deck)} slides, {len(deck.types)} shapes, {len(deck.strings)} strings -> {out} "
+          f"({os.path.getsize(out) // 1024} KB) in {1000 * (time.perf_counter() - start):.1f} ms")
@@ -1,31 +1,36 @@
+from backends import COMBackend
 
-import win32com.client
 
 class PPTController:
-    def __init__(self):
-        self.app = win32com.client.Dispatch("PowerPoint.Application")
-        self.app.Visible = 1
+    """
+    Slideshow control, on a live PowerPoint by default. Pass a backend
+    from backends.py (e.g. SimulatedBackend) to run without one.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend if backend is not None else COMBackend()
 
     def open_presentation(self, file_path):
-        self.presentation = self.app.Presentations.Open(file_path)
+        self.backend.open_presentation(file_path)
 
     def start_show(self):
-        self.presentation.SlideShowSettings.Run()
+        self.backend.start_show()
 
     def next_slide(self):
-        self.presentation.SlideShowWindow.View.Next()
+        self.backend.next_slide()
 
     def previous_slide(self):
-        self.presentation.SlideShowWindow.View.Previous()
+        self.backend.previous_slide()
 
     def goto_slide(self, slide_index):
-        self.presentation.SlideShowWindow.View.GotoSlide(slide_index)
+        self.backend.goto_slide(slide_index)
 
-    def end_show(self):
-        window = self.presentation.SlideShowWindow
-        if window is not None:
-            window.View.Exit()  
+    def current_slide(self):
+        """1-based number of the slide on screen in the running show."""
+        return self.backend.current_slide()
 
+    def end_show(self):
+        self.backend.end_show()
 
     def close(self):
-        self.app.Quit()
+        self.backend.close()
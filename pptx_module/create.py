@@ -1,4 +1,16 @@
-from pptx import Presentation 
+import io
+import os
+import random
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import qn
+from pptx.util import Emu
+from lxml import etree
 
 class PPTCreator:
     def __init__(self, path):
@@ -32,6 +44,155 @@ class PPTCreator:
         self.prs.save(self.path)
         print(f"Presentation '{self.path}' created successfully.")
 
+
+# --- Synthetic decks for benchmarks ---
+WORDS = ("revenue growth pipeline roadmap hiring security latency budget mobile team plan review "
+         "customers retention pricing forecast quarter market launch partners analytics platform "
+         "design research support costs outlook risks goals metrics strategy product results").split()
+
+
+def png_bytes(width, height, rgb):
+    """A minimal valid single-colour RGB PNG."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + bytes(rgb) * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+class DeckGenerator:
+    """
+    Seeded synthetic decks for parser and controller benchmarks. Each slide
+    gets a layout from `layouts`, its placeholders filled, and `shapes`
+    (min, max) extra shapes: text boxes and autoshapes with `words` (min,
+    max) words of text, plus a table, picture or group with probability
+    `tables`, `pictures`, `groups`. Slide n is built from its own RNG
+    seeded with (seed, n), so a deck is the same however it is chunked.
+    """
+
+    def __init__(self, slides=100, shapes=(2, 6), words=(4, 40), tables=0.1, pictures=0.1,
+                 groups=0.05, layouts=(0, 1, 3, 5, 6), seed=0):
+        self.slides = slides
+        self.shapes = shapes
+        self.words = words
+        self.tables = tables
+        self.pictures = pictures
+        self.groups = groups
+        self.layouts = layouts
+        self.seed = seed
+
+    def _text(self, rng):
+        n = rng.randint(*self.words)
+        lines = []
+        while n > 0:
+            k = min(n, rng.randint(3, 12))
+            lines.append(" ".join(rng.choices(WORDS, k=k)))
+            n -= k
+        return "\n".join(lines)
+
+    def _box(self, rng, width, height):
+        w = rng.randint(width // 10, width // 2)
+        h = rng.randint(height // 12, height // 3)
+        return Emu(rng.randint(0, width - w)), Emu(rng.randint(0, height - h)), Emu(w), Emu(h)
+
+    def build_slide(self, prs, number):
+        """Append slide `number` (1-based) to `prs` and return it."""
+        rng = random.Random(f"{self.seed}:{number}")
+        width, height = prs.slide_width, prs.slide_height
+        slide = prs.slides.add_slide(prs.slide_layouts[rng.choice(self.layouts)])
+        for ph in slide.placeholders:
+            if ph.placeholder_format.idx == 0:
+                ph.text = f"Slide {number}: {rng.choice(WORDS).title()} {rng.choice(WORDS)}"
+            elif ph.has_text_frame:
+                ph.text = self._text(rng)
+        for _ in range(rng.randint(*self.shapes)):
+            if rng.random() < 0.5:
+                shape = slide.shapes.add_textbox(*self._box(rng, width, height))
+            else:
+                shape = slide.shapes.add_shape(rng.choice((MSO_SHAPE.RECTANGLE, MSO_SHAPE.ROUNDED_RECTANGLE,
+                                                           MSO_SHAPE.OVAL)), *self._box(rng, width, height))
+            shape.text_frame.text = self._text(rng)
+        if rng.random() < self.tables:
+            rows, cols = rng.randint(2, 6), rng.randint(2, 5)
+            table = slide.shapes.add_table(rows, cols, *self._box(rng, width, height)).table
+            for r in range(rows):
+                for c in range(cols):
+                    table.cell(r, c).text = rng.choice(WORDS) if r == 0 else str(rng.randint(0, 9999))
+        if rng.random() < self.pictures:
+            image = png_bytes(rng.randint(4, 32), rng.randint(4, 32), [rng.randrange(256) for _ in range(3)])
+            slide.shapes.add_picture(io.BytesIO(image), *self._box(rng, width, height))
+        if rng.random() < self.groups:
+            group = slide.shapes.add_group_shape()
+            for _ in range(rng.randint(2, 4)):
+                group.shapes.add_textbox(*self._box(rng, width, height)).text_frame.text = self._text(rng)
+        return slide
+
+    def build(self, path, workers=1, chunk_size=50):
+        """
+        Write the deck to `path`. With workers > 1, chunks of slides are
+        built in a process pool and merged here: each slide's shape tree is
+        grafted onto a fresh slide of the same layout and its images are
+        re-added, so the result is identical to a serial build.
+        """
+        prs = Presentation()
+        if workers <= 1:
+            for number in range(1, self.slides + 1):
+                self.build_slide(prs, number)
+        else:
+            ranges = [(start, min(start + chunk_size, self.slides + 1))
+                      for start in range(1, self.slides + 1, chunk_size)]
+            with ProcessPoolExecutor(workers) as pool:
+                for chunk in pool.map(self._build_chunk, ranges):
+                    for layout, sp_tree, images in chunk:
+                        self._graft(prs, layout, sp_tree, images)
+        prs.save(path)
+        return path
+
+    def _build_chunk(self, bounds):
+        """[(layout index, spTree XML, {rId: image bytes})] for slides in [start, stop)."""
+        prs = Presentation()
+        layouts = list(prs.slide_layouts)
+        out = []
+        for number in range(*bounds):
+            slide = self.build_slide(prs, number)
+            tree = slide.shapes._spTree
+            images = {blip.get(qn("r:embed")): slide.part.related_part(blip.get(qn("r:embed"))).blob
+                      for blip in tree.iter(qn("a:blip"))}
+            out.append((layouts.index(slide.slide_layout), etree.tostring(tree), images))
+        return out
+
+    def _graft(self, prs, layout, sp_tree, images):
+        slide = prs.slides.add_slide(prs.slide_layouts[layout])
+        old = slide.shapes._spTree
+        tree = parse_xml(sp_tree)
+        old.getparent().replace(old, tree)
+        new_ids = {}
+        for blip in tree.iter(qn("a:blip")):
+            old_id = blip.get(qn("r:embed"))
+            if old_id not in new_ids:
+                new_ids[old_id] = slide.part.get_or_add_image_part(io.BytesIO(images[old_id]))[1]
+            blip.set(qn("r:embed"), new_ids[old_id])
+
+
 if __name__ == "__main__":
-    creator = PPTCreator("test.pptx")
-    creator.main()
+    import argparse
+    import time
+    ap = argparse.ArgumentParser(description="Write the five-slide test deck, or a synthetic one with --slides")
+    ap.add_argument("path", nargs="?", default="test.pptx")
+    ap.add_argument("--slides", type=int, help="build a synthetic deck of this many slides")
+    ap.add_argument("--shapes", type=int, nargs=2, default=(2, 6), metavar=("MIN", "MAX"))
+    ap.add_argument("--words", type=int, nargs=2, default=(4, 40), metavar=("MIN", "MAX"))
+    ap.add_argument("--tables", type=float, default=0.1)
+    ap.add_argument("--pictures", type=float, default=0.1)
+    ap.add_argument("--groups", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+    if args.slides is None:
+        creator = PPTCreator(args.path)
+        creator.main()
+    else:
+        start = time.perf_counter()
+        DeckGenerator(args.slides, tuple(args.shapes), tuple(args.words), args.tables, args.pictures,
+                      args.groups, seed=args.seed).build(args.path, workers=args.workers)
+        print(f"{args.slides}-slide deck '{args.path}' built in {time.perf_counter() - start:.1f} s")
@@ -0,0 +1,304 @@
+import re
+import time
+from collections import namedtuple
+
+WORD = re.compile(r"[a-z0-9']+")
+
+# Dropped before matching, from both patterns and transcripts
+FILLERS = frozenset("""
+um uh er ah hmm okay ok alright right hey maya please so now then well actually just the a an
+can could would you let let's lets us me and
+""".split())
+
+SMALL = {w: i for i, w in enumerate(
+    "zero one two three four five six seven eight nine ten eleven twelve thirteen fourteen fifteen "
+    "sixteen seventeen eighteen nineteen".split())}
+TENS = {w: 10 * i for i, w in enumerate("twenty thirty forty fifty sixty seventy eighty ninety".split(), start=2)}
+ORDINALS = {w: i for i, w in enumerate(
+    "first second third fourth fifth sixth seventh eighth ninth tenth eleventh twelfth thirteenth "
+    "fourteenth fifteenth sixteenth seventeenth eighteenth nineteenth".split(), start=1)}
+ORDINAL_TENS = {w: 10 * i for i, w in enumerate(
+    "twentieth thirtieth fortieth fiftieth sixtieth seventieth eightieth ninetieth".split(), start=2)}
+# What ASR writes for a lone number word it mishears
+HOMOPHONES = {"won": 1, "to": 2, "too": 2, "tree": 3, "for": 4, "fore": 4, "ate": 8}
+# Words after which a homophone is read as a number
+NUMBER_CUES = frozenset(("slide", "number", "page"))
+
+NUMBER = "<n>"
+LAST = -1  # goto_slide argument for "the last slide"
+
+Intent = namedtuple("Intent", "name arg confidence end open")
+Outcome = namedtuple("Outcome", "kind intent text")
+
+GOTO_VERBS = ("", "go to", "go back to", "back to", "return to", "jump to", "skip to", "switch to",
+              "move to", "take to", "show", "open", "bring up", "display", "head to", "turn to")
+GOTO_TARGETS = (("slide <n>", None, 1.0), ("slide number <n>", None, 1.0), ("page <n>", None, 0.9),
+                ("<n> slide", None, 1.0), ("first slide", 1, 1.0), ("beginning", 1, 0.9),
+                ("start", 1, 0.5), ("last slide", LAST, 0.8), ("final slide", LAST, 1.0), ("end", LAST, 0.5))
+
+# (phrase, intent, fixed argument or None to take <n>, weight); weight < 1 marks phrases
+# that are often not commands ("continue", a bare "start"), so they need the LLM's opinion
+PATTERNS = [
+    ("next", "next_slide", 1, 1.0), ("next slide", "next_slide", 1, 1.0), ("next one", "next_slide", 1, 1.0),
+    ("next page", "next_slide", 1, 1.0), ("forward", "next_slide", 1, 0.9), ("go forward", "next_slide", 1, 1.0),
+    ("move forward", "next_slide", 1, 1.0), ("advance", "next_slide", 1, 0.9), ("move on", "next_slide", 1, 0.9),
+    ("move on to next slide", "next_slide", 1, 1.0), ("go to next slide", "next_slide", 1, 1.0),
+    ("go next", "next_slide", 1, 1.0), ("following slide", "next_slide", 1, 0.9), ("continue", "next_slide", 1, 0.5),
+    ("skip", "next_slide", 1, 0.6), ("forward <n>", "next_slide", None, 1.0), ("go forward <n>", "next_slide", None, 1.0),
+    ("skip <n>", "next_slide", None, 0.9), ("skip <n> slides", "next_slide", None, 1.0),
+    ("skip ahead <n>", "next_slide", None, 1.0), ("next <n> slides", "next_slide", None, 0.9),
+    ("<n> slides forward", "next_slide", None, 1.0), ("<n> slides ahead", "next_slide", None, 1.0),
+    ("previous", "previous_slide", 1, 1.0), ("previous slide", "previous_slide", 1, 1.0),
+    ("previous one", "previous_slide", 1, 1.0), ("previous page", "previous_slide", 1, 1.0),
+    ("go to previous slide", "previous_slide", 1, 1.0), ("back", "previous_slide", 1, 0.9),
+    ("go back", "previous_slide", 1, 1.0), ("move back", "previous_slide", 1, 1.0), ("one back", "previous_slide", 1, 1.0),
+    ("last one", "previous_slide", 1, 0.6), ("back <n>", "previous_slide", None, 1.0),
+    ("go back <n>", "previous_slide", None, 1.0), ("back <n> slides", "previous_slide", None, 1.0),
+    ("go back <n> slides", "previous_slide", None, 1.0), ("<n> slides back", "previous_slide", None, 1.0),
+    ("go back to", "previous_slide", 1, 0.75),  # "... to what we discussed" is for the LLM
+    ("rewind <n>", "previous_slide", None, 0.9),
+]
+for verb in GOTO_VERBS:
+    for target, arg, weight in GOTO_TARGETS:
+        PATTERNS.append((f"{verb} {target}".strip(), "goto_slide", arg, weight if verb else weight * 0.9))
+
+
+def words(text):
+    return [w for w in WORD.findall(text.casefold().replace("-", " ")) if w not in FILLERS]
+
+
+def parse_number(tokens, i, limit=None):
+    """
+    (value, next index, open) for a number starting at tokens[i], or None.
+    Reads digits ("12", "12th"), words up to the hundreds ("one hundred
+    and five", "twenty first") and homophones right after "slide",
+    "number" or "page" ("slide for"). `open` is True when more words could
+    still extend it ("twenty" -> "twenty one") to a value up to `limit`
+    (the deck's slide count, if known).
+    """
+    t = tokens[i]
+    at_end = i + 1 == len(tokens)
+
+    def extends(smallest):
+        # The next words could still make it `smallest` or more
+        return limit is None or smallest <= limit
+
+    digits = t.rstrip("stndrh") if t[:1].isdigit() else ""
+    if digits.isdigit():
+        return int(digits), i + 1, digits == t and at_end and extends(10 * int(digits))
+    if t in HOMOPHONES:
+        # Only where a number is expected: "go to the slide ..." is not "go 2 slide"
+        if i == 0 or tokens[i - 1] not in NUMBER_CUES:
+            return None
+        # "slide for" may yet continue "... for the quarter"
+        return HOMOPHONES[t], i + 1, at_end
+    if t in ORDINALS:
+        return ORDINALS[t], i + 1, False
+    if t in ORDINAL_TENS:
+        return ORDINAL_TENS[t], i + 1, False
+    value, j = 0, i
+    if t in SMALL:
+        value, j = SMALL[t], i + 1
+        if j < len(tokens) and tokens[j] == "hundred":
+            value, j = value * 100, j + 1
+            if j < len(tokens) and tokens[j] == "and":
+                j += 1
+        else:
+            # "five" may become "five hundred"; "twelve" is done
+            return value, j, j == len(tokens) and 1 <= value <= 9 and extends(100 * value)
+    if j < len(tokens) and tokens[j] in TENS:
+        value, j = value + TENS[tokens[j]], j + 1
+        if j < len(tokens) and 1 <= SMALL.get(tokens[j], 0) <= 9:
+            return value + SMALL[tokens[j]], j + 1, False
+        if j < len(tokens) and 1 <= ORDINALS.get(tokens[j], 0) <= 9:
+            return value + ORDINALS[tokens[j]], j + 1, False
+        return value, j, j == len(tokens) and value % 10 == 0 and extends(value + 1)
+    if j < len(tokens) and j > i:
+        if tokens[j] in SMALL:
+            return value + SMALL[tokens[j]], j + 1, False
+        if tokens[j] in ORDINALS:
+            return value + ORDINALS[tokens[j]], j + 1, False
+    if j > i:
+        return value, j, j == len(tokens) and extends(value + 1)
+    return None
+
+
+class IntentMatcher:
+    """
+    Token trie compiled from PATTERNS. match() finds the best command in
+    a (possibly partial) transcript: the longest pattern match from any
+    word, scored by its weight times the share of the transcript's words it
+    explains, so "next" alone scores 1.0 but "next quarter we grew" does not.
+    A match is open while more words could still change the command, or
+    it is a single word: "next" and "go back" (-> "go back to slide two")
+    are, "next slide" and "back three" (-> "back three slides", the same
+    command) are not.
+    """
+
+    def __init__(self, patterns=PATTERNS):
+        self.root = {}
+        for phrase, name, arg, weight in patterns:
+            node = self.root
+            for token in (w for w in phrase.split() if w not in FILLERS):
+                node = node.setdefault(token, {})
+            node[None] = (name, arg, weight)
+        self._settle(self.root)
+
+    def _settle(self, node):
+        """Mark every pattern end with whether all longer patterns through it mean the same command."""
+        for token, child in node.items():
+            if token is not None:
+                self._settle(child)
+        if None in node:
+            name, arg, weight = node[None]
+            node[None] = (name, arg, weight, self._same_below(node, (name, arg)))
+
+    def _same_below(self, node, command):
+        for token, child in node.items():
+            if token is None:
+                continue
+            if token == NUMBER or (None in child and child[None][:2] != command):
+                return False
+            if not self._same_below(child, command):
+                return False
+        return True
+
+    def _walk(self, tokens, i, limit=None):
+        """Longest pattern from tokens[i]: (name, arg, weight, end, open) or None."""
+        best = None
+        stack = [(self.root, i, None, False)]
+        while stack:
+            node, j, number, number_open = stack.pop()
+            if None in node:
+                name, arg, weight, settled = node[None]
+                if best is None or j > best[3]:
+                    # Open if more words could still change this match; a lone
+                    # word ("previous ...") is as often the start of a sentence
+                    extends = j == len(tokens) and (number_open or not settled or j - i < 2)
+                    best = (name, arg if arg is not None else number, weight, j, extends)
+            if j == len(tokens):
+                continue
+            child = node.get(tokens[j])
+            if child is not None:
+                stack.append((child, j + 1, number, False))
+            if NUMBER in node:
+                parsed = parse_number(tokens, j, limit)
+                if parsed is not None:
+                    stack.append((node[NUMBER], parsed[1], parsed[0], parsed[2]))
+        return best
+
+    def match(self, text, limit=None):
+        """Best Intent in `text`, or None. `limit`: the slide count, if known (see parse_number)."""
+        tokens = words(text)
+        best = None
+        for i in range(len(tokens)):
+            found = self._walk(tokens, i, limit)
+            if found is None:
+                continue
+            name, arg, weight, end, extends = found
+            confidence = weight * (end - i) / len(tokens)
+            if best is None or confidence > best.confidence:
+                best = Intent(name, arg, confidence, end, extends)
+        return best
+
+
+class CommandRouter:
+    """
+    Feeds streaming ASR transcripts to an IntentMatcher and fires controller
+    commands without waiting for the LLM.
+
+    Call feed(partial) as partials arrive and feed(text, final=True) at the
+    end of each utterance. A match scoring `fire_at` or more fires at once,
+    unless more words could still change it ("next...", "go to slide
+    twenty..."); that waits for the final transcript or, when
+    `stable_partials` is set, for that many identical partials in a row
+    (the speaker paused). The eager setting fires sooner but also fires on
+    a pause in "next quarter we...", so it is off by default. Each
+    utterance fires at most once, and the same command fired again within
+    `debounce` seconds is dropped. Final utterances that
+    score between `ambiguous_at` and `fire_at` go to `fallback(text)` (the
+    LLM); lower scores are ordinary speech and are ignored.
+
+    `execute(name, *args)` runs a command: e.g. ControllerActor.submit, or
+    a PPTController method lookup. "back three" runs previous_slide three
+    times (the actor coalesces them). "Last slide" needs `slides`.
+    """
+
+    def __init__(self, execute, matcher=None, fire_at=0.8, ambiguous_at=0.35, debounce=0.6,
+                 stable_partials=None, slides=None, fallback=None, clock=time.monotonic):
+        self.execute = execute
+        self.matcher = matcher or IntentMatcher()
+        self.fire_at = fire_at
+        self.ambiguous_at = ambiguous_at
+        self.debounce = debounce
+        self.stable_partials = stable_partials
+        self.slides = slides
+        self.fallback = fallback
+        self.clock = clock
+        self.last_fired = (None, float("-inf"))
+        self.counts = {"fired": 0, "debounced": 0, "llm": 0, "ignored": 0}
+        self._reset()
+
+    def _reset(self):
+        self.fired = False
+        self.previous = None
+        self.agreeing = 0
+
+    def _command(self, intent):
+        """(name, args, repeat) to execute, or None when the intent can't be resolved here."""
+        if intent.name == "goto_slide":
+            target = self.slides if intent.arg == LAST else intent.arg
+            if target is None or target < 1 or (self.slides and target > self.slides):
+                return None
+            return "goto_slide", (target,), 1
+        if not 1 <= intent.arg <= (self.slides or 100):
+            return None
+        return intent.name, (), intent.arg
+
+    def _fire(self, intent, text, final):
+        command = self._command(intent)
+        if command is None:
+            return self._ambiguous(intent, text) if final else None
+        self.fired = True
+        now = self.clock()
+        key, at = self.last_fired
+        if key == command and now - at < self.debounce:
+            self.counts["debounced"] += 1
+            return Outcome("debounced", intent, text)
+        self.last_fired = (command, now)
+        name, args, repeat = command
+        for _ in range(repeat):
+            self.execute(name, *args)
+        self.counts["fired"] += 1
+        return Outcome("fired", intent, text)
+
+    def _ambiguous(self, intent, text):
+        self.counts["llm"] += 1
+        if self.fallback is not None:
+            self.fallback(text)
+        return Outcome("llm", intent, text)
+
+    def feed(self, text, final=False):
+        """Returns an Outcome when this transcript decided something, else None."""
+        try:
+            if self.fired:
+                return None
+            intent = self.matcher.match(text, limit=self.slides)
+            if intent is not None and intent.confidence >= self.fire_at:
+                same = self.previous == (intent[:2], text)
+                self.agreeing = self.agreeing + 1 if same else 1
+                self.previous = (intent[:2], text)
+                stable = self.stable_partials and self.agreeing >= self.stable_partials
+                if final or not intent.open or stable:
+                    return self._fire(intent, text, final)
+                return None
+            self.previous, self.agreeing = None, 0
+            if not final:
+                return None
+            if intent is not None and intent.confidence >= self.ambiguous_at:
+                return self._ambiguous(intent, text)
+            self.counts["ignored"] += 1
+            return Outcome("ignored", intent, text)
+        finally:
+            if final:
+                self._reset()
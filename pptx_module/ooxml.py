@@ -0,0 +1,286 @@
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+
+from parser import PPTParser
+
+NS_A = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+NS_P = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+NS_R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+NS_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+LAYOUT_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideLayout"
+MASTER_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/slideMaster"
+
+# --- Shape elements, as python-pptx recognises them in a p:spTree ---
+SP = NS_P + "sp"
+GRP_SP = NS_P + "grpSp"
+GRAPHIC_FRAME = NS_P + "graphicFrame"
+CXN_SP = NS_P + "cxnSp"
+PIC = NS_P + "pic"
+CONTENT_PART = NS_P + "contentPart"
+SHAPE_TAGS = frozenset((SP, GRP_SP, GRAPHIC_FRAME, CXN_SP, PIC, CONTENT_PART))
+
+# python-pptx proxy class names, which PPTParser reports as the shape type
+SHAPE_CLASSES = {SP: "Shape", GRP_SP: "GroupShape", GRAPHIC_FRAME: "GraphicFrame", CXN_SP: "Connector"}
+SLIDE_PLACEHOLDER_CLASSES = {"clipArt": "PicturePlaceholder", "chart": "ChartPlaceholder",
+                             "pic": "PicturePlaceholder", "tbl": "TablePlaceholder"}
+# Master placeholder type a layout placeholder of each type inherits from
+MASTER_PLACEHOLDER_TYPES = {
+    "body": "body", "chart": "body", "clipArt": "body", "ctrTitle": "title", "dgm": "body",
+    "dt": "dt", "ftr": "ftr", "media": "body", "obj": "body", "pic": "body", "sldNum": "sldNum",
+    "subTitle": "body", "tbl": "body", "title": "title",
+}
+
+
+class Unsupported(Exception):
+    """Raised for XML the fast path can't map exactly onto python-pptx's reading of it."""
+
+
+def part_rels(zf, part):
+    """{rId: (type, target part name)} for one part, read straight from the zip."""
+    rels_name = posixpath.join(posixpath.dirname(part), "_rels", posixpath.basename(part) + ".rels")
+    try:
+        root = ET.fromstring(zf.read(rels_name))
+    except KeyError:
+        return {}
+    base = posixpath.dirname(part)
+    return {rel.get("Id"): (rel.get("Type"), posixpath.normpath(posixpath.join(base, rel.get("Target"))))
+            for rel in root.iter(NS_REL + "Relationship")}
+
+
+def related_part(rels, rel_type):
+    return next((target for kind, target in rels.values() if kind == rel_type), None)
+
+
+def slide_parts(zf):
+    """[(slide, layout, master) part names] in show order."""
+    presentation = ET.fromstring(zf.read("ppt/presentation.xml"))
+    pres_rels = part_rels(zf, "ppt/presentation.xml")
+    parts = []
+    for sld_id in presentation.iter(NS_P + "sldId"):
+        slide = pres_rels[sld_id.get(NS_R + "id")][1]
+        layout = related_part(part_rels(zf, slide), LAYOUT_REL)
+        master = related_part(part_rels(zf, layout), MASTER_REL) if layout else None
+        parts.append((slide, layout, master))
+    return parts
+
+
+def iter_shape_elements(stream):
+    """
+    Stream the top-level shapes of a slide, layout or master part with
+    iterparse. Each p:spTree child is yielded once its subtree is complete,
+    then cleared, so memory stays flat however big the slide is.
+    """
+    path = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            path.append(elem.tag)
+            continue
+        path.pop()
+        if (len(path) == 3 and path[2] == NS_P + "spTree" and path[1] == NS_P + "cSld"
+                and elem.tag in SHAPE_TAGS):
+            yield elem
+            elem.clear()
+
+
+def _emu(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        # Missing required attribute, or a universal measure like "2.5in"
+        raise Unsupported(f"coordinate {value!r}")
+
+
+def geometry(elem):
+    """[x, y, cx, cy] in EMU as python-pptx reads them; None where absent."""
+    tag = elem.tag
+    if tag == GRAPHIC_FRAME:
+        xfrm = elem.find(NS_P + "xfrm")
+    elif tag == CONTENT_PART:
+        raise Unsupported("p:contentPart")
+    else:
+        props = elem.find(NS_P + ("grpSpPr" if tag == GRP_SP else "spPr"))
+        if props is None:
+            raise Unsupported("shape without properties")
+        xfrm = props.find(NS_A + "xfrm")
+    x = y = cx = cy = None
+    if xfrm is not None:
+        off = xfrm.find(NS_A + "off")
+        ext = xfrm.find(NS_A + "ext")
+        if off is not None:
+            x, y = _emu(off.get("x")), _emu(off.get("y"))
+        if ext is not None:
+            cx, cy = _emu(ext.get("cx")), _emu(ext.get("cy"))
+    return [x, y, cx, cy]
+
+
+def placeholder(elem):
+    """(idx, type) of a placeholder shape, or None for an ordinary shape."""
+    if not len(elem):
+        return None
+    ph = elem[0].find(f"{NS_P}nvPr/{NS_P}ph")
+    if ph is None:
+        return None
+    try:
+        return int(ph.get("idx", "0")), ph.get("type", "obj")
+    except ValueError:
+        raise Unsupported(f"placeholder idx {ph.get('idx')!r}")
+
+
+def paragraph_text(p):
+    """Run and field text, with "\\v" for each line break, like python-pptx."""
+    parts = []
+    for child in p:
+        tag = child.tag
+        if tag == NS_A + "r":
+            t = child.find(NS_A + "t")
+            if t is None:
+                raise Unsupported("a:r without a:t")
+            parts.append(t.text or "")
+        elif tag == NS_A + "br":
+            parts.append("\v")
+        elif tag == NS_A + "fld":
+            t = child.find(NS_A + "t")
+            parts.append("" if t is None else t.text or "")
+    return "".join(parts)
+
+
+def shape_text(elem):
+    """Text of a p:sp; "" when it has no text body, as python-pptx adds an empty one."""
+    tx_body = elem.find(NS_P + "txBody")
+    if tx_body is None:
+        return ""
+    return "\n".join(paragraph_text(p) for p in tx_body.findall(NS_A + "p"))
+
+
+def shape_class(elem, ph):
+    tag = elem.tag
+    if ph is not None:
+        if tag == SP:
+            return SLIDE_PLACEHOLDER_CLASSES.get(ph[1], "SlidePlaceholder")
+        if tag == GRAPHIC_FRAME:
+            return "PlaceholderGraphicFrame"
+        if tag == PIC:
+            return "PlaceholderPicture"
+    if tag == PIC:
+        movie = elem.find(f"{NS_P}nvPicPr/{NS_P}nvPr/{NS_A}videoFile")
+        return "Movie" if movie is not None else "Picture"
+    return SHAPE_CLASSES.get(tag, "BaseShape")
+
+
+class FastPPTParser(PPTParser):
+    """
+    PPTParser engine that reads the slide XML straight out of the .pptx zip
+    with iterparse instead of building python-pptx proxies for every
+    shape. Output is identical to PPTParser.parse(), including placeholder
+    geometry inherited from the layout and master and python-pptx's class
+    names as shape types. A slide using anything the fast path doesn't
+    cover is handed to python-pptx; `fallbacks` counts those.
+    """
+
+    def __init__(self, file_path):
+        super().__init__(file_path)
+        self.zf = None
+        self.parts = None
+        self.placeholder_tables = {}
+        self.fallbacks = 0
+
+    def _open(self):
+        if self.zf is None:
+            self.zf = zipfile.ZipFile(self.file_path)
+            self.parts = slide_parts(self.zf)
+
+    def close(self):
+        if self.zf is not None:
+            self.zf.close()
+            self.zf = None
+
+    def slide_count(self):
+        self._open()
+        return len(self.parts)
+
+    # --- Placeholder inheritance ---
+    def _placeholders(self, part):
+        """[(tag, idx, type, geometry)] for the placeholders of a layout or master, cached."""
+        if part not in self.placeholder_tables:
+            table = []
+            if part is not None:
+                with self.zf.open(part) as stream:
+                    for elem in iter_shape_elements(stream):
+                        ph = placeholder(elem)
+                        if ph is not None:
+                            table.append((elem.tag, ph[0], ph[1], geometry(elem)))
+            self.placeholder_tables[part] = table
+        return self.placeholder_tables[part]
+
+    def _master_geometry(self, master, layout_type):
+        if layout_type not in MASTER_PLACEHOLDER_TYPES:
+            raise Unsupported(f"layout placeholder type {layout_type!r}")
+        base_type = MASTER_PLACEHOLDER_TYPES[layout_type]
+        for _, _, ph_type, geom in self._placeholders(master):
+            if ph_type == base_type:
+                return geom
+        return [None] * 4
+
+    def _inherited_geometry(self, layout, master, idx):
+        for tag, layout_idx, ph_type, geom in self._placeholders(layout):
+            if layout_idx != idx:
+                continue
+            if tag != SP:
+                return geom
+            # A layout placeholder inherits in turn from the master, per value
+            if None in geom:
+                base = self._master_geometry(master, ph_type)
+                geom = [v if v is not None else b for v, b in zip(geom, base)]
+            return geom
+        return [None] * 4
+
+    # --- Extraction ---
+    def _fast_slide(self, idx):
+        slide, layout, master = self.parts[idx - 1]
+        slide_info = {"slide_number": idx, "title": None, "shapes": []}
+        title_found = False
+        with self.zf.open(slide) as stream:
+            for elem in iter_shape_elements(stream):
+                ph = placeholder(elem)
+                geom = geometry(elem)
+                inherits = ph is not None and elem.tag in (SP, PIC)
+                if inherits and None in geom:
+                    base = self._inherited_geometry(layout, master, ph[0])
+                    geom = [v if v is not None else b for v, b in zip(geom, base)]
+                if None in geom:
+                    raise Unsupported("shape without a position or size")
+                text = shape_text(elem) if elem.tag == SP else None
+                if ph is not None and ph[0] == 0 and not title_found:
+                    if elem.tag != SP:
+                        raise Unsupported("title placeholder that is not a text shape")
+                    slide_info["title"] = text
+                    title_found = True
+                x, y, cx, cy = geom
+                slide_info["shapes"].append({
+                    "type": shape_class(elem, ph),
+                    "left": self.toPX(x),
+                    "top": self.toPX(y),
+                    "width": self.toPX(cx),
+                    "height": self.toPX(cy),
+                    "text": text,
+                })
+        return slide_info
+
+    def get_slide(self, n):
+        self._open()
+        if not 1 <= n <= len(self.parts):
+            raise IndexError(f"slide {n} out of range 1..{len(self.parts)}")
+        try:
+            return self._fast_slide(n)
+        except Unsupported:
+            self.fallbacks += 1
+            return super().get_slide(n)
+
+    def iter_slides(self, start=1):
+        self._open()
+        for idx in range(start, len(self.parts) + 1):
+            yield self.get_slide(idx)
+
+    def parse(self):
+        return [{"file_name": self.file_name}] + list(self.iter_slides())
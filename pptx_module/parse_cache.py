@@ -0,0 +1,120 @@
+import hashlib
+import json
+import os
+import zipfile
+
+from ooxml import slide_parts
+from parser import PPTParser
+
+# Bump when PPTParser's output changes, so stale cache entries are ignored
+PARSE_VERSION = "1"
+
+# Compact JSON for everything written by the cache
+COMPACT = {"separators": (",", ":"), "ensure_ascii": False}
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def slide_fingerprints(path):
+    """
+    One hash per slide, in show order, from the zip parts alone (no
+    python-pptx). Each covers the slide XML plus its layout and master,
+    since placeholder shapes inherit their position from those.
+    """
+    with zipfile.ZipFile(path) as zf:
+        part_hashes = {}
+
+        def part_hash(name):
+            if name not in part_hashes:
+                part_hashes[name] = hashlib.sha256(zf.read(name)).hexdigest() if name else ""
+            return part_hashes[name]
+
+        fingerprints = []
+        for parts in slide_parts(zf):
+            h = hashlib.sha256(PARSE_VERSION.encode())
+            for name in parts:
+                h.update(part_hash(name).encode())
+            fingerprints.append(h.hexdigest())
+        return fingerprints
+
+
+class CachedPPTParser:
+    """
+    PPTParser with a persistent cache in `cache_dir`. A deck whose file hash
+    was seen before is answered from one JSON file. Otherwise every slide
+    is fingerprinted from the zip and only slides with an unseen
+    fingerprint go through python-pptx; the rest are reused. After
+    `parse()`, `changed` lists the slide numbers that were re-extracted.
+    """
+
+    def __init__(self, file_path, cache_dir=".parse_cache"):
+        self.file_path = file_path
+        self.file_name = os.path.splitext(os.path.basename(file_path))[0]
+        self.cache_dir = cache_dir
+        self.slide_dir = os.path.join(cache_dir, "slides")
+        os.makedirs(self.slide_dir, exist_ok=True)
+        self.changed = []
+
+    def _deck_path(self, sha):
+        return os.path.join(self.cache_dir, f"{sha}.json")
+
+    def _slide_path(self, fingerprint):
+        return os.path.join(self.slide_dir, f"{fingerprint}.json")
+
+    def _load(self, path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _store(self, path, data):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, **COMPACT)
+        os.replace(tmp, path)
+
+    def parse(self):
+        sha = file_sha256(self.file_path)
+        deck = self._load(self._deck_path(sha))
+        if deck is not None and deck.get("version") == PARSE_VERSION:
+            self.changed = []
+            return [{"file_name": self.file_name}] + deck["slides"]
+
+        fingerprints = slide_fingerprints(self.file_path)
+        slides = [self._load(self._slide_path(fp)) for fp in fingerprints]
+        self.changed = [idx for idx, slide in enumerate(slides, start=1) if slide is None]
+        if self.changed:
+            parser = PPTParser(self.file_path)
+            pptx_slides = parser.prs.slides
+            for idx in self.changed:
+                slide = parser.parse_slide(idx, pptx_slides[idx - 1])
+                del slide["slide_number"]  # a slide may move; numbers are assigned per deck
+                self._store(self._slide_path(fingerprints[idx - 1]), slide)
+                slides[idx - 1] = slide
+
+        slides = [{"slide_number": idx, **slide} for idx, slide in enumerate(slides, start=1)]
+        self._store(self._deck_path(sha), {"version": PARSE_VERSION, "slides": slides})
+        return [{"file_name": self.file_name}] + slides
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    ap = argparse.ArgumentParser(description="Parse a deck to JSON, reusing unchanged slides")
+    ap.add_argument("deck")
+    ap.add_argument("--cache-dir", default=".parse_cache")
+    args = ap.parse_args()
+    start = time.perf_counter()
+    parser = CachedPPTParser(args.deck, args.cache_dir)
+    data = parser.parse()
+    with open(parser.file_name + ".json", "w", encoding="utf-8") as outfile:
+        json.dump(data, outfile, **COMPACT)
+    print(f"{len(data) - 1} slides in {1000 * (time.perf_counter() - start):.1f} ms, "
+          f"re-extracted: {parser.changed or 'none'}")
@@ -1,53 +1,112 @@
+import itertools
 import json
 import os
-from pptx import Presentation
+from concurrent.futures import ProcessPoolExecutor
 
 class PPTParser:
     def __init__(self, file_path):
+        self.file_path = file_path
         self.file_name = os.path.splitext(os.path.basename(file_path))[0]
-        self.prs = Presentation(file_path)
+        self._prs = None
+
+    @property
+    def prs(self):
+        """The python-pptx Presentation, opened on first use."""
+        if self._prs is None:
+            # python-pptx is imported here, so the fast parser and cache hits never load it
+            from pptx import Presentation
+            self._prs = Presentation(self.file_path)
+        return self._prs
 
 
     def toPX(self, num):
         return round(num/1000)
 
+    def parse_slide(self, idx, slide):
+        """The dict for one python-pptx slide, numbered `idx` (1-based)."""
+        slide_info = {
+            "slide_number": idx,
+            "title": slide.shapes.title.text if slide.shapes.title else None,
+            "shapes": []
+        }
+
+        for shape in slide.shapes:
+            shape_info = {
+                "type": shape.__class__.__name__,
+                "left": self.toPX(shape.left), 
+                "top": self.toPX(shape.top),
+                "width": self.toPX(shape.width),
+                "height": self.toPX(shape.height),
+            }
+
+            if shape.has_text_frame:
+                text = "\n".join(
+                    para.text for para in shape.text_frame.paragraphs
+                )
+                shape_info["text"] = text
+            else:
+                shape_info["text"] = None
+
+            slide_info["shapes"].append(shape_info)
+
+        return slide_info
+
+    def slide_count(self):
+        return len(self.prs.slides)
+
+    def iter_slides(self, start=1):
+        """Yield slide dicts one at a time, from slide number `start` on."""
+        slides = itertools.islice(self.prs.slides, start - 1, None)
+        for idx, slide in enumerate(slides, start=start):
+            yield self.parse_slide(idx, slide)
+
+    def get_slide(self, n):
+        """The dict for slide number `n` (1-based), extracted on demand."""
+        slides = self.prs.slides
+        if not 1 <= n <= len(slides):
+            raise IndexError(f"slide {n} out of range 1..{len(slides)}")
+        return self.parse_slide(n, slides[n - 1])
+
     def parse(self):
         slides_data = [ {"file_name": self.file_name}]
 
         for idx, slide in enumerate(self.prs.slides, start=1):
-            slide_info = {
-                "slide_number": idx,
-                "title": slide.shapes.title.text if slide.shapes.title else None,
-                "shapes": []
-            }
+            slides_data.append(self.parse_slide(idx, slide))
 
-            for shape in slide.shapes:
-                shape_info = {
-                    "type": shape.__class__.__name__,
-                    "left": self.toPX(shape.left), 
-                    "top": self.toPX(shape.top),
-                    "width": self.toPX(shape.width),
-                    "height": self.toPX(shape.height),
-                }
+        return slides_data
 
-                if shape.has_text_frame:
-                    text = "\n".join(
-                        para.text for para in shape.text_frame.paragraphs
-                    )
-                    shape_info["text"] = text
-                else:
-                    shape_info["text"] = None
+    def parse_parallel(self, workers=None, chunk_size=None):
+        """
+        Same result as parse(), with slide extraction split across a process
+        pool. Each worker opens the deck once and extracts contiguous ranges
+        of slides; worth it for indexing large decks on several cores.
+        """
+        count = self.slide_count()
+        workers = workers or os.cpu_count() or 1
+        chunk_size = chunk_size or max(1, -(-count // (workers * 4)))
+        ranges = [(start, min(start + chunk_size, count + 1)) for start in range(1, count + 1, chunk_size)]
+        slides_data = [ {"file_name": self.file_name}]
+        with ProcessPoolExecutor(workers, initializer=_open_worker, initargs=(self.file_path,)) as pool:
+            for chunk in pool.map(_parse_range, ranges):
+                slides_data.extend(chunk)
+        return slides_data
 
-                slide_info["shapes"].append(shape_info)
 
-            slides_data.append(slide_info)
+# --- Process pool workers for PPTParser.parse_parallel ---
+_worker_parser = None
 
-        return slides_data
+def _open_worker(file_path):
+    global _worker_parser
+    _worker_parser = PPTParser(file_path)
 
+def _parse_range(bounds):
+    start, stop = bounds
+    slides = _worker_parser.prs.slides
+    return [_worker_parser.parse_slide(idx, slides[idx - 1]) for idx in range(start, stop)]
 
 if __name__ == "__main__":
     file_path = "test."
     parser = PPTParser(file_path)
     data = parser.parse()
     with open(os.path.splitext(os.path.basename(file_path))[0]+".json", "w") as outfile:
-        json.dump(data, outfile, indent=4)
+        json.dump(data, outfile, separators=(",", ":"), ensure_ascii=False)
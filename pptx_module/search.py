@@ -0,0 +1,209 @@
+import math
+import re
+from collections import Counter
+
+WORD = re.compile(r"\w+")
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or that the this to was were will with
+""".split())
+
+
+def stem(word):
+    """Light suffix stripping (plurals, -ing, -ed, -ly), enough to make "charts" find "chart"."""
+    if len(word) <= 3 or not word.isalpha():
+        return word
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith("sses"):
+        return word[:-2]
+    for suffix in ("ing", "ed"):
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            word = word[:-len(suffix)]
+            # running -> runn -> run
+            if len(word) > 3 and word[-1] == word[-2] and word[-1] not in "lsz":
+                word = word[:-1]
+            return word
+    if word.endswith("ly") and len(word) > 5:
+        return word[:-2]
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def words(text):
+    """Case-folded words of `text`, stopwords dropped."""
+    if not text:
+        return []
+    return [w for w in WORD.findall(text.casefold()) if w not in STOPWORDS]
+
+
+def tokenize(text):
+    """Stemmed index terms of `text`."""
+    return [stem(w) for w in words(text)]
+
+
+def deletes(term):
+    """The term with each single character removed (SymSpell-style fuzzy keys)."""
+    return {term[:i] + term[i + 1:] for i in range(len(term))}
+
+
+def slide_text(slide):
+    """All searchable text of a parsed slide; the title also counts once more on top of its shape."""
+    parts = [slide.get("title") or ""]
+    parts.extend(shape["text"] for shape in slide.get("shapes", ()) if shape.get("text"))
+    return "\n".join(parts)
+
+
+class SlideSearchIndex:
+    """
+    BM25 inverted index over parsed slides, for spoken "go to the slide
+    about X" commands. `search(query)` returns [(slide_number, score)]
+    best first. A query word whose stem isn't indexed is matched against
+    the deck's words one edit away (insert, delete, substitute or swap)
+    and scored through their stems at a reduced weight, to absorb ASR
+    misspellings. Fuzzy matching compares whole words, since a misspelled
+    word rarely stems like the word it stands for.
+
+    `update()` re-tokenizes only slides whose text changed, so it can be fed
+    straight from CachedPPTParser.parse() after every reload.
+    """
+
+    def __init__(self, k1=1.2, b=0.75, fuzzy_weight=0.6, fuzzy_min_len=4):
+        self.k1 = k1
+        self.b = b
+        self.fuzzy_weight = fuzzy_weight
+        self.fuzzy_min_len = fuzzy_min_len
+        self.postings = {}   # term -> {slide_number: term frequency}
+        self.word_df = {}    # surface word -> number of slides using it
+        self.fuzzy_keys = {}  # word or one-deletion variant -> {words}
+        self.lengths = {}    # slide_number -> number of terms
+        self.texts = {}      # slide_number -> text that was indexed
+        self.total_length = 0
+        self._norms = None
+
+    def __len__(self):
+        return len(self.lengths)
+
+    # --- Building ---
+    def _count_word(self, word, delta):
+        """Track how many slides use a word; its fuzzy keys exist while any does."""
+        df = self.word_df.get(word, 0) + delta
+        if len(word) >= self.fuzzy_min_len and df in (0, delta):
+            for key in deletes(word) | {word}:
+                if df:
+                    self.fuzzy_keys.setdefault(key, set()).add(word)
+                else:
+                    self.fuzzy_keys[key].discard(word)
+                    if not self.fuzzy_keys[key]:
+                        del self.fuzzy_keys[key]
+        if df:
+            self.word_df[word] = df
+        else:
+            del self.word_df[word]
+
+    def remove_slide(self, number):
+        if number not in self.lengths:
+            return
+        slide_words = set(words(self.texts.pop(number)))
+        for word in slide_words:
+            self._count_word(word, -1)
+        for term in {stem(w) for w in slide_words}:
+            docs = self.postings[term]
+            del docs[number]
+            if not docs:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(number)
+        self._norms = None
+
+    def add_slide(self, slide):
+        number = slide["slide_number"]
+        self.remove_slide(number)
+        text = slide_text(slide)
+        slide_words = words(text)
+        terms = [stem(w) for w in slide_words]
+        for word in set(slide_words):
+            self._count_word(word, 1)
+        for term, tf in Counter(terms).items():
+            self.postings.setdefault(term, {})[number] = tf
+        self.lengths[number] = len(terms)
+        self.texts[number] = text
+        self.total_length += len(terms)
+        self._norms = None
+
+    def update(self, slides_data):
+        """
+        Bring the index in line with parse() output, re-indexing only slides
+        whose text differs from what is indexed under their number. Slides
+        are compared by text rather than taken from CachedPPTParser.changed,
+        since inserting or deleting a slide mid-deck renumbers every later
+        slide without re-extracting it. Returns the re-indexed slide numbers.
+        """
+        slides = {s["slide_number"]: s for s in slides_data if "slide_number" in s}
+        for number in [n for n in self.lengths if n not in slides]:
+            self.remove_slide(number)
+        todo = [n for n, s in slides.items() if self.texts.get(n) != slide_text(s)]
+        for number in todo:
+            self.add_slide(slides[number])
+        return todo
+
+    # --- Querying ---
+    def _length_norms(self):
+        """k1 * (1 - b + b * len / avgdl) per slide; recomputed only after the index changes."""
+        if self._norms is None:
+            avgdl = self.total_length / len(self.lengths) if self.lengths else 1
+            avgdl = avgdl or 1
+            self._norms = {n: self.k1 * (1 - self.b + self.b * length / avgdl)
+                           for n, length in self.lengths.items()}
+        return self._norms
+
+    def _fuzzy_terms(self, word):
+        """Stems of the deck's words within one edit of `word`."""
+        if len(word) < self.fuzzy_min_len:
+            return set()
+        found = set()
+        for key in deletes(word) | {word}:
+            found |= self.fuzzy_keys.get(key, set())
+        return {stem(w) for w in found}
+
+    def search(self, query, limit=5):
+        n_slides = len(self.lengths)
+        if not n_slides:
+            return []
+        norms = self._length_norms()
+        scores = {}
+        for word in set(words(query)):
+            term = stem(word)
+            if term in self.postings:
+                matches = ((term, 1.0),)
+            else:
+                matches = [(t, self.fuzzy_weight) for t in self._fuzzy_terms(word)]
+            for match, weight in matches:
+                docs = self.postings[match]
+                idf = math.log(1 + (n_slides - len(docs) + 0.5) / (len(docs) + 0.5))
+                for number, tf in docs.items():
+                    score = weight * idf * tf * (self.k1 + 1) / (tf + norms[number])
+                    scores[number] = scores.get(number, 0.0) + score
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:limit]
+
+    def best_slide(self, query):
+        """Slide number of the top hit, or None."""
+        hits = self.search(query, limit=1)
+        return hits[0][0] if hits else None
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+    from parse_cache import CachedPPTParser
+    ap = argparse.ArgumentParser(description="Search a deck's slides by content")
+    ap.add_argument("deck")
+    ap.add_argument("query", nargs="+")
+    args = ap.parse_args()
+    index = SlideSearchIndex()
+    index.update(CachedPPTParser(args.deck).parse())
+    for query in args.query:
+        start = time.perf_counter()
+        hits = index.search(query)
+        print(f"{query!r}: {hits} ({1e6 * (time.perf_counter() - start):.0f} us)")
@@ -0,0 +1,153 @@
+import math
+
+import numpy as np
+
+
+class SlideIndex:
+    """
+    Uniform-grid spatial index over the shape boxes of one parsed slide,
+    for hit-testing (highlight / zoom). Coordinates are the parser's units
+    (toPX of EMU). Queries return shape positions in the slide's "shapes"
+    list.
+
+    Everything lives in flat NumPy arrays: `boxes` holds (left, top, right,
+    bottom) per shape, and the grid is CSR-style, with the shapes of cell c
+    at `cell_items[cell_start[c]:cell_start[c + 1]]`. A shape is listed in
+    every cell its box touches.
+    """
+
+    def __init__(self, shapes, cells_per_shape=1.0):
+        n = len(shapes)
+        boxes = np.array([(s["left"], s["top"], s["left"] + s["width"], s["top"] + s["height"])
+                          for s in shapes], dtype=np.int32).reshape(n, 4)
+        # Boxes are normalised so a negative size can't hide a shape
+        self.boxes = np.concatenate((np.minimum(boxes[:, :2], boxes[:, 2:]),
+                                     np.maximum(boxes[:, :2], boxes[:, 2:])), axis=1)
+        if n:
+            self.x0, self.y0 = int(self.boxes[:, 0].min()), int(self.boxes[:, 1].min())
+            x1, y1 = int(self.boxes[:, 2].max()), int(self.boxes[:, 3].max())
+        else:
+            self.x0 = self.y0 = x1 = y1 = 0
+        side = max(1, min(256, math.ceil(math.sqrt(n * cells_per_shape))))
+        self.cols = self.rows = side
+        self.cell_w = max(1.0, (x1 - self.x0 + 1) / side)
+        self.cell_h = max(1.0, (y1 - self.y0 + 1) / side)
+        self._build()
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cell_range(self, lo, hi, origin, size, count):
+        first = np.clip(((lo - origin) // size).astype(np.int64), 0, count - 1)
+        last = np.clip(((hi - origin) // size).astype(np.int64), 0, count - 1)
+        return first, last
+
+    def _build(self):
+        b = self.boxes
+        cx0, cx1 = self._cell_range(b[:, 0], b[:, 2], self.x0, self.cell_w, self.cols)
+        cy0, cy1 = self._cell_range(b[:, 1], b[:, 3], self.y0, self.cell_h, self.rows)
+        widths = cx1 - cx0 + 1
+        counts = widths * (cy1 - cy0 + 1)
+        # One (cell, shape) pair for every cell a box covers, without a Python loop
+        shape = np.repeat(np.arange(len(b)), counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        col = cx0[shape] + offset % widths[shape]
+        row = cy0[shape] + offset // widths[shape]
+        cell = row * self.cols + col
+        order = np.argsort(cell, kind="stable")
+        self.cell_items = shape[order].astype(np.int32)
+        self.cell_start = np.zeros(self.cols * self.rows + 1, dtype=np.int32)
+        np.cumsum(np.bincount(cell, minlength=self.cols * self.rows), out=self.cell_start[1:])
+
+    def _cells(self, cx0, cy0, cx1, cy1):
+        """Shape ids listed in the block of cells [cx0..cx1] x [cy0..cy1] (with repeats)."""
+        parts = [self.cell_items[self.cell_start[r * self.cols + cx0]:self.cell_start[r * self.cols + cx1 + 1]]
+                 for r in range(cy0, cy1 + 1)]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int32)
+
+    # --- Queries ---
+    def at(self, x, y):
+        """Shapes containing the point, topmost (last drawn) first."""
+        if not len(self.boxes):
+            return []
+        col = int((x - self.x0) // self.cell_w)
+        row = int((y - self.y0) // self.cell_h)
+        if not (0 <= col < self.cols and 0 <= row < self.rows):
+            return []
+        cand = self._cells(col, row, col, row)
+        b = self.boxes[cand]
+        hit = cand[(b[:, 0] <= x) & (x <= b[:, 2]) & (b[:, 1] <= y) & (y <= b[:, 3])]
+        return hit[::-1].tolist()
+
+    def _col(self, x):
+        return min(max(int((x - self.x0) // self.cell_w), 0), self.cols - 1)
+
+    def _row(self, y):
+        return min(max(int((y - self.y0) // self.cell_h), 0), self.rows - 1)
+
+    def overlapping(self, left, top, width, height):
+        """Shapes whose box intersects the rectangle (edges touching count), in slide order."""
+        if not len(self.boxes):
+            return []
+        right, bottom = left + width, top + height
+        cand = self._cells(self._col(left), self._row(top), self._col(right), self._row(bottom))
+        b = self.boxes[cand]
+        hit = cand[(b[:, 0] <= right) & (left <= b[:, 2]) & (b[:, 1] <= bottom) & (top <= b[:, 3])]
+        # A box spanning several of the cells is listed once per cell
+        return np.unique(hit).tolist()
+
+    def _distances(self, ids, x, y):
+        b = self.boxes[ids]
+        dx = np.maximum(np.maximum(b[:, 0] - x, 0), x - b[:, 2])
+        dy = np.maximum(np.maximum(b[:, 1] - y, 0), y - b[:, 3])
+        return np.hypot(dx, dy)
+
+    def nearest(self, x, y, k=1):
+        """
+        The k shapes whose boxes are closest to the point (distance 0 when
+        inside), as [(shape id, distance)] nearest first. Searches rings of
+        cells outwards until no unvisited cell can hold anything closer.
+        """
+        n = len(self.boxes)
+        if not n:
+            return []
+        k = min(k, n)
+        col, row = self._col(x), self._row(y)
+        seen = np.zeros(n, dtype=bool)
+        best_ids = np.empty(0, dtype=np.int64)
+        best_d = np.empty(0)
+        for r in range(max(self.cols, self.rows)):
+            cx0, cx1 = max(col - r, 0), min(col + r, self.cols - 1)
+            cy0, cy1 = max(row - r, 0), min(row + r, self.rows - 1)
+            cand = self._cells(cx0, cy0, cx1, cy1)
+            cand = np.unique(cand[~seen[cand]])
+            if len(cand):
+                seen[cand] = True
+                ids = np.concatenate((best_ids, cand))
+                d = np.concatenate((best_d, self._distances(cand, x, y)))
+                keep = np.argsort(d, kind="stable")[:k]
+                best_ids, best_d = ids[keep], d[keep]
+            whole_grid = cx0 == 0 and cy0 == 0 and cx1 == self.cols - 1 and cy1 == self.rows - 1
+            if whole_grid:
+                break
+            if len(best_d) == k:
+                # Anything unseen lies wholly outside the searched block of cells
+                reach = min(x - (self.x0 + cx0 * self.cell_w) if cx0 > 0 else math.inf,
+                            self.x0 + (cx1 + 1) * self.cell_w - x if cx1 < self.cols - 1 else math.inf,
+                            y - (self.y0 + cy0 * self.cell_h) if cy0 > 0 else math.inf,
+                            self.y0 + (cy1 + 1) * self.cell_h - y if cy1 < self.rows - 1 else math.inf)
+                if best_d[-1] <= reach:
+                    break
+        return [(int(i), float(d)) for i, d in zip(best_ids, best_d)]
+
+
+def index_deck(slides_data):
+    """{slide_number: SlideIndex} for PPTParser.parse() output."""
+    return {slide["slide_number"]: SlideIndex(slide["shapes"])
+            for slide in slides_data if "slide_number" in slide}
+
+
+def parse_indexed(parser):
+    """Parse with any of the deck parsers and index every slide in the same pass."""
+    slides_data = parser.parse()
+    return slides_data, index_deck(slides_data)
@@ -1,6 +1,7 @@
 
 from parser import PPTParser
 from controller import PPTController
+from backends import make_backend
 from create import PPTCreator
 import os
 import json
@@ -19,7 +20,8 @@ with open(os.path.splitext(os.path.basename(file_path))[0]+".json", "w") as outf
         json.dump(data, outfile, indent=4)
 
 
-controller = PPTController()
+# PPT_BACKEND=sim runs the walk-through headless (no PowerPoint)
+controller = PPTController(make_backend(os.environ.get("PPT_BACKEND", "com")))
 controller.open_presentation(absolute_path)
 controller.start_show()
 
@@ -0,0 +1,213 @@
+"""
+ControllerActor against a recording controller, no PowerPoint needed.
+
+    python -m pytest test_actor.py
+"""
+import asyncio
+import threading
+
+import pytest
+
+from actor import ControllerActor
+
+
+class RecordingController:
+    """Keeps the show position and logs every call; `gate` holds the next call until set."""
+
+    def __init__(self, position=1, slides=20):
+        self.position = position
+        self.slides = slides
+        self.calls = []
+        self.gate = threading.Event()
+        self.gate.set()
+        self.entered = threading.Event()
+
+    def _call(self, name, *args):
+        self.calls.append((name, *args))
+        self.entered.set()
+        self.gate.wait()
+
+    # Like a slideshow view: next/previous stop at the ends, an out-of-range goto fails
+    def next_slide(self):
+        self._call("next_slide")
+        self.position = min(self.position + 1, self.slides)
+
+    def previous_slide(self):
+        self._call("previous_slide")
+        self.position = max(self.position - 1, 1)
+
+    def goto_slide(self, n):
+        self._call("goto_slide", n)
+        if not 1 <= n <= self.slides:
+            raise IndexError(f"slide {n} out of range 1..{self.slides}")
+        self.position = n
+
+    def current_slide(self):
+        self._call("current_slide")
+        return self.position
+
+    def start_show(self):
+        self._call("start_show")
+
+    def broken(self):
+        raise RuntimeError("COM error")
+
+
+def actor_with(controller, **kwargs):
+    return ControllerActor(factory=lambda: controller, **kwargs).start()
+
+
+def hold(controller, actor):
+    """Block the actor inside a slow call so further commands queue up behind it."""
+    controller.gate.clear()
+    controller.entered.clear()
+    first = actor.submit("start_show")
+    assert controller.entered.wait(5)
+    return first
+
+
+def test_lone_commands_pass_straight_through():
+    controller = RecordingController(position=3)
+    with actor_with(controller) as actor:
+        async def run():
+            assert await actor.next_slide() == 4
+            assert await actor.previous_slide() == 3
+            assert await actor.current_slide() == 3
+            assert await actor.goto_slide(7) == 7
+        asyncio.run(run())
+    # relative moves ask where the show ended up; a goto already knows
+    assert controller.calls == [("next_slide",), ("current_slide",), ("previous_slide",), ("current_slide",),
+                                ("current_slide",), ("goto_slide", 7)]
+    assert controller.position == 7
+
+
+def test_queued_nexts_become_one_goto():
+    controller = RecordingController(position=4)
+    with actor_with(controller, slides=20) as actor:
+        first = hold(controller, actor)
+        nexts = [actor.submit("next_slide") for _ in range(3)]
+        controller.gate.set()
+        first.result(5)
+        assert [f.result(5) for f in nexts] == [7, 7, 7]
+    assert controller.calls == [("start_show",), ("current_slide",), ("goto_slide", 7)]
+    assert actor.stats()["next_slide"]["coalesced"] == 3
+
+
+def test_superseded_goto_is_never_sent():
+    controller = RecordingController(position=1)
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        futures = [actor.submit("goto_slide", 9), actor.submit("next_slide"),
+                   actor.submit("goto_slide", 4), actor.submit("previous_slide")]
+        controller.gate.set()
+        assert [f.result(5) for f in futures] == [3, 3, 3, 3]
+    # the last absolute goto fixes the position, so no current_slide round trip either
+    assert controller.calls == [("start_show",), ("goto_slide", 3)]
+
+
+def test_other_commands_are_barriers():
+    controller = RecordingController(position=5)
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        before = actor.submit("next_slide")
+        current = actor.submit("current_slide")
+        after = actor.submit("next_slide")
+        controller.gate.set()
+        assert current.result(5) == 6
+        before.result(5), after.result(5)
+    assert controller.calls[1:] == [("next_slide",), ("current_slide",), ("current_slide",),
+                                    ("next_slide",), ("current_slide",)]
+
+
+def test_nexts_past_the_end_stay_put_without_a_slide_count():
+    controller = RecordingController(position=19, slides=20)
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        futures = [actor.submit("next_slide") for _ in range(3)]
+        controller.gate.set()
+        assert [f.result(5) for f in futures] == [20, 20, 20]
+    # not folded into goto_slide(22): the show clamps each step itself
+    assert controller.calls[1:] == [("next_slide",)] * 3 + [("current_slide",)]
+    assert actor.stats()["next_slide"]["coalesced"] == 0
+
+
+def test_backward_runs_coalesce_without_a_slide_count():
+    controller = RecordingController(position=5)
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        futures = [actor.submit("goto_slide", 8)] + [actor.submit("previous_slide") for _ in range(2)]
+        controller.gate.set()
+        assert [f.result(5) for f in futures] == [6, 6, 6]
+    assert controller.calls[1:] == [("goto_slide", 6)]
+
+
+def test_target_is_clamped_to_the_deck():
+    controller = RecordingController(position=2)
+    with actor_with(controller, slides=3) as actor:
+        hold(controller, actor)
+        futures = [actor.submit("previous_slide") for _ in range(4)] + [actor.submit("goto_slide", 9)]
+        futures.append(actor.submit("next_slide"))
+        controller.gate.set()
+        assert futures[-1].result(5) == 3
+        hold(controller, actor)
+        futures = [actor.submit("goto_slide", 2)] + [actor.submit("previous_slide") for _ in range(3)]
+        futures.append(actor.submit("next_slide"))
+        controller.gate.set()
+        assert futures[-1].result(5) == 2
+
+
+def test_errors_reach_every_caller_and_the_actor_keeps_going():
+    controller = RecordingController()
+    with actor_with(controller) as actor:
+        with pytest.raises(RuntimeError, match="COM error"):
+            actor.submit("broken").result(5)
+        actor.submit("next_slide").result(5)
+    assert controller.position == 2
+
+
+def test_cancelled_commands_are_dropped():
+    controller = RecordingController(position=1)
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        dropped = actor.submit("goto_slide", 10)
+        assert dropped.cancel()
+        kept = actor.submit("next_slide")
+        controller.gate.set()
+        kept.result(5)
+    assert ("goto_slide", 10) not in controller.calls
+    assert controller.position == 2
+
+
+def test_timings_cover_queue_and_execution():
+    controller = RecordingController()
+    with actor_with(controller) as actor:
+        hold(controller, actor)
+        queued = actor.submit("next_slide")
+        threading.Timer(0.05, controller.gate.set).start()
+        queued.result(5)
+    timing = [t for t in actor.history if t.name == "next_slide"][0]
+    assert timing.queued_ms >= 40
+    assert timing.run_ms >= 0
+    assert actor.stats()["start_show"]["count"] == 1
+
+
+def test_factory_error_surfaces_on_start():
+    def factory():
+        raise OSError("PowerPoint not installed")
+    actor = ControllerActor(factory=factory)
+    with pytest.raises(OSError):
+        actor.start()
+    with pytest.raises(RuntimeError):
+        actor.submit("next_slide")
+
+
+def test_async_context_manager():
+    controller = RecordingController(position=2)
+
+    async def run():
+        async with ControllerActor(factory=lambda: controller) as actor:
+            results = await asyncio.gather(*(actor.next_slide() for _ in range(5)))
+            assert await actor.current_slide() == 7
+            return results
+    asyncio.run(run())
+    assert controller.position == 7
@@ -0,0 +1,74 @@
+"""
+IntentMatcher and CommandRouter on transcripts, no ASR needed.
+
+    python -m pytest test_intent.py
+"""
+import pytest
+
+from intent import CommandRouter, IntentMatcher
+
+SLIDES = 30
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return IntentMatcher()
+
+
+def router_for(matcher, executed, **kwargs):
+    return CommandRouter(lambda name, *args: executed.append((name, *args)), matcher, slides=SLIDES,
+                         clock=lambda: 0.0, **kwargs)
+
+
+def test_homophones_only_count_after_slide_or_number(matcher):
+    assert matcher.match("go to slide for", limit=SLIDES)[:2] == ("goto_slide", 4)
+    assert matcher.match("slide number to", limit=SLIDES)[:2] == ("goto_slide", 2)
+    # "to slide" is not "<n> slide"
+    assert matcher.match("go to the slide about revenue", limit=SLIDES) is None
+
+
+def test_slide_about_a_topic_is_not_a_goto(matcher):
+    executed = []
+    router = router_for(matcher, executed, fallback=lambda text: executed.append(("llm", text)))
+    text = "go to the slide about revenue"
+    for n in range(1, 7):
+        router.feed(" ".join(text.split()[:n]), final=n == 6)
+    assert not any(name == "goto_slide" for name, *_ in executed)
+
+
+@pytest.mark.parametrize("text, command", [
+    ("next slide", ("next_slide", 1)),
+    ("slide five", ("goto_slide", 5)),
+    ("go to slide twelve", ("goto_slide", 12)),
+    ("back three", ("previous_slide", 3)),
+    ("go to the fifth slide", ("goto_slide", 5)),
+])
+def test_complete_commands_close_on_the_partial(matcher, text, command):
+    intent = matcher.match(text, limit=SLIDES)
+    assert intent[:2] == command
+    assert not intent.open
+
+
+@pytest.mark.parametrize("text", [
+    "next",             # -> "next three slides", or "next quarter we ..."
+    "previous",         # -> "the previous version ..."
+    "go back",          # -> "go back to slide two"
+    "go to slide twenty",  # -> "twenty one"
+])
+def test_unfinished_commands_stay_open(matcher, text):
+    assert matcher.match(text, limit=SLIDES).open
+
+
+def test_numbers_that_cannot_grow_within_the_deck_close(matcher):
+    assert matcher.match("slide two", limit=SLIDES).open is False
+    assert matcher.match("slide two").open  # "two hundred" is possible without a slide count
+    assert matcher.match("slide twenty", limit=20).open is False
+
+
+def test_router_fires_before_the_final_transcript(matcher):
+    executed = []
+    router = router_for(matcher, executed)
+    assert router.feed("next") is None
+    assert router.feed("next slide").kind == "fired"
+    assert router.feed("next slide please", final=True) is None
+    assert executed == [("next_slide",)]
@@ -0,0 +1,224 @@
+"""
+Differential tests: FastPPTParser must produce exactly what PPTParser
+(python-pptx) produces, on decks covering every layout, shape kind and
+text feature the fast path reads, plus seeded random decks.
+
+    python -m pytest test_ooxml.py
+"""
+import random
+import struct
+import zlib
+
+import pytest
+from lxml import etree
+from pptx import Presentation
+from pptx.util import Inches, Pt
+
+from create import PPTCreator
+from ooxml import NS_A, FastPPTParser
+from parser import PPTParser
+
+
+def png_bytes(width=4, height=3):
+    """A minimal valid RGB PNG."""
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+    rows = b"".join(b"\x00" + b"\x80\x40\x20" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+def assert_same(path):
+    expected = PPTParser(path).parse()
+    fast = FastPPTParser(path)
+    assert fast.parse() == expected
+    assert fast.fallbacks == 0
+    return expected
+
+
+def save(prs, tmp_path, name="deck.pptx"):
+    path = str(tmp_path / name)
+    prs.save(path)
+    return path
+
+
+def test_every_default_layout_with_empty_placeholders(tmp_path):
+    prs = Presentation()
+    for layout in prs.slide_layouts:
+        prs.slides.add_slide(layout)
+    data = assert_same(save(prs, tmp_path))
+    assert len(data) == 1 + len(prs.slide_layouts)
+
+
+def test_every_default_layout_with_text(tmp_path):
+    prs = Presentation()
+    for i, layout in enumerate(prs.slide_layouts):
+        slide = prs.slides.add_slide(layout)
+        for ph in slide.placeholders:
+            if ph.has_text_frame:
+                ph.text_frame.text = f"Layout {i} placeholder {ph.placeholder_format.idx}"
+    assert_same(save(prs, tmp_path))
+
+
+def test_placeholder_with_its_own_geometry(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[1])
+    slide.shapes.title.text = "Moved title"
+    slide.shapes.title.left = Inches(2)
+    slide.shapes.title.top = Inches(0.25)
+    body = slide.placeholders[1]
+    body.width = Inches(3)  # only the size is overridden; position is inherited
+    body.height = Inches(2)
+    assert_same(save(prs, tmp_path))
+
+
+def test_paragraphs_line_breaks_and_runs(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(2))
+    tf = box.text_frame
+    tf.text = "First paragraph"
+    p = tf.add_paragraph()
+    p.text = "soft\vbreak inside"
+    p = tf.add_paragraph()
+    for word in ("several ", "runs ", "here"):
+        run = p.add_run()
+        run.text = word
+        run.font.size = Pt(20)
+    tf.add_paragraph()  # empty paragraph
+    tf.add_paragraph().text = "Symbols & <angle> \"quotes\" and unicode: café – 日本語 😀"
+    tf.add_paragraph().text = "   leading and trailing spaces   "
+    data = assert_same(save(prs, tmp_path))
+    assert "\v" in data[1]["shapes"][0]["text"]
+
+
+def test_fields_and_empty_runs(tmp_path):
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    box = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(4), Inches(1))
+    box.text_frame.text = "Slide "
+    p = box.text_frame.paragraphs[0]._p
+    fld = etree.SubElement(p, f"{NS_A}fld", id="{B6F15528-21DE-4FAA-801E-634DDDAF4B2B}", type="slidenum")
+    etree.SubElement(fld, f"{NS_A}t").text = "7"
+    etree.SubElement(p, f"{NS_A}fld", id="{00000000-0000-0000-0000-000000000000}", type="datetime")
+    run = etree.SubElement(p, f"{NS_A}r")
+    etree.SubElement(run, f"{NS_A}t")  # <a:t/>
+    assert_same(save(prs, tmp_path))
+
+
+def test_shape_kinds(tmp_path):
+    from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+    image = tmp_path / "pixel.png"
+    image.write_bytes(png_bytes())
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[5])
+    slide.shapes.title.text = "Shapes"
+    slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(1), Inches(2), Inches(2), Inches(1)).text = "Box"
+    slide.shapes.add_connector(MSO_CONNECTOR.STRAIGHT, Inches(1), Inches(4), Inches(5), Inches(5))
+    slide.shapes.add_picture(str(image), Inches(6), Inches(2), Inches(1), Inches(1))
+    table = slide.shapes.add_table(2, 2, Inches(1), Inches(5), Inches(4), Inches(1)).table
+    table.cell(0, 0).text = "cell"
+    group = slide.shapes.add_group_shape()
+    group.shapes.add_textbox(Inches(6), Inches(4), Inches(1), Inches(1)).text = "grouped"
+    group.shapes.add_shape(MSO_SHAPE.OVAL, Inches(7), Inches(4), Inches(1), Inches(1))
+    slide.shapes.add_movie(str(image), Inches(7), Inches(6), Inches(1), Inches(1),
+                           poster_frame_image=str(image), mime_type="video/mp4")
+    data = assert_same(save(prs, tmp_path))
+    types = [s["type"] for s in data[1]["shapes"]]
+    assert {"Shape", "Connector", "Picture", "GraphicFrame", "GroupShape", "Movie"} <= set(types)
+
+
+def test_picture_placeholder(tmp_path):
+    image = tmp_path / "pixel.png"
+    image.write_bytes(png_bytes(8, 8))
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[8])  # Picture with Caption
+    for ph in slide.placeholders:
+        if ph.placeholder_format.type == 18:  # PICTURE
+            ph.insert_picture(str(image))
+        elif ph.has_text_frame:
+            ph.text = "caption"
+    data = assert_same(save(prs, tmp_path))
+    assert "PlaceholderPicture" in [s["type"] for s in data[1]["shapes"]]
+
+
+def test_shape_without_text_body(tmp_path):
+    from pptx.enum.shapes import MSO_SHAPE
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, Inches(1), Inches(1), Inches(1), Inches(1))
+    shape._element.remove(shape._element.txBody)
+    data = assert_same(save(prs, tmp_path))
+    assert data[1]["shapes"][0]["text"] == ""
+
+
+def test_no_title_and_empty_slide(tmp_path):
+    prs = Presentation()
+    prs.slides.add_slide(prs.slide_layouts[6])
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    slide.shapes.add_textbox(Inches(1), Inches(1), Inches(1), Inches(1)).text = "not a title"
+    data = assert_same(save(prs, tmp_path))
+    assert data[1] == {"slide_number": 1, "title": None, "shapes": []}
+    assert data[2]["title"] is None
+
+
+def test_repo_sample_deck(tmp_path):
+    path = str(tmp_path / "test.pptx")
+    PPTCreator(path).main()
+    assert_same(path)
+
+
+def test_lazy_access_matches(tmp_path):
+    prs = Presentation()
+    for i in range(5):
+        prs.slides.add_slide(prs.slide_layouts[1]).shapes.title.text = f"Slide {i + 1}"
+    path = save(prs, tmp_path)
+    expected = PPTParser(path).parse()
+    fast = FastPPTParser(path)
+    assert fast.get_slide(4) == expected[4]
+    assert list(fast.iter_slides(start=3)) == expected[3:]
+    with pytest.raises(IndexError):
+        fast.get_slide(6)
+
+
+def test_unsupported_xml_falls_back_to_python_pptx(tmp_path):
+    # A title placeholder that is a picture: python-pptx's answer is an error, and so is ours
+    image = tmp_path / "pixel.png"
+    image.write_bytes(png_bytes())
+    prs = Presentation()
+    slide = prs.slides.add_slide(prs.slide_layouts[6])
+    pic = slide.shapes.add_picture(str(image), Inches(1), Inches(1))
+    nv_pr = pic._element.nvPicPr.nvPr
+    etree.SubElement(nv_pr, nv_pr.tag.replace("nvPr", "ph"), type="title")
+    path = save(prs, tmp_path)
+    with pytest.raises(AttributeError):
+        PPTParser(path).parse()
+    fast = FastPPTParser(path)
+    with pytest.raises(AttributeError):
+        fast.parse()
+    assert fast.fallbacks == 1
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_decks(tmp_path, seed):
+    from pptx.enum.shapes import MSO_SHAPE
+    rng = random.Random(seed)
+    words = ["alpha", "beta", "café", "x<y", "a&b", "", " ", "日本", "end."]
+    prs = Presentation()
+    layouts = list(prs.slide_layouts)
+    for _ in range(rng.randint(3, 12)):
+        slide = prs.slides.add_slide(rng.choice(layouts))
+        for ph in slide.placeholders:
+            if ph.has_text_frame and rng.random() < 0.7:
+                ph.text_frame.text = "\n".join(" ".join(rng.choices(words, k=rng.randint(0, 5)))
+                                               for _ in range(rng.randint(1, 3)))
+            if rng.random() < 0.2:
+                ph.left = Inches(rng.uniform(0, 5))
+        for _ in range(rng.randint(0, 6)):
+            x, y, w, h = (Inches(rng.uniform(0, 8)) for _ in range(4))
+            if rng.random() < 0.5:
+                shape = slide.shapes.add_textbox(x, y, w, h)
+            else:
+                shape = slide.shapes.add_shape(rng.choice(list(MSO_SHAPE)[:40]), x, y, w, h)
+            shape.text_frame.text = rng.choice(words) + "\v" * rng.randint(0, 1) + rng.choice(words)
+    assert_same(save(prs, tmp_path))
@@ -0,0 +1,55 @@
+"""
+SlideSearchIndex.update fed from CachedPPTParser as the deck is edited.
+
+    python -m pytest test_search.py
+"""
+from pptx import Presentation
+
+from parse_cache import CachedPPTParser
+from search import SlideSearchIndex
+
+TITLES = ["Welcome", "Quarterly revenue", "Product roadmap", "Customer stories", "Closing remarks"]
+
+
+def build(path, titles):
+    prs = Presentation()
+    for title in titles:
+        slide = prs.slides.add_slide(prs.slide_layouts[5])  # title only
+        slide.shapes.title.text = title
+    prs.save(path)
+
+
+def test_update_after_mid_deck_insert(tmp_path):
+    deck = str(tmp_path / "deck.pptx")
+    parser = CachedPPTParser(deck, cache_dir=str(tmp_path / "cache"))
+    index = SlideSearchIndex()
+    build(deck, TITLES)
+    index.update(parser.parse())
+    assert index.best_slide("closing remarks") == 5
+
+    build(deck, TITLES[:1] + ["Hiring plan"] + TITLES[1:])
+    slides = parser.parse()
+    assert parser.changed == [2]  # the later slides moved but were not re-extracted
+    assert index.update(slides) == [2, 3, 4, 5, 6]
+    assert index.best_slide("closing remarks") == 6
+    assert index.best_slide("hiring") == 2
+    assert index.best_slide("revenue") == 3
+
+    rebuilt = SlideSearchIndex()
+    rebuilt.update(slides)
+    assert (index.postings, index.fuzzy_keys, index.lengths) == (rebuilt.postings, rebuilt.fuzzy_keys, rebuilt.lengths)
+
+
+def test_update_after_delete_and_unchanged_reload(tmp_path):
+    deck = str(tmp_path / "deck.pptx")
+    parser = CachedPPTParser(deck, cache_dir=str(tmp_path / "cache"))
+    index = SlideSearchIndex()
+    build(deck, TITLES)
+    index.update(parser.parse())
+    assert index.update(parser.parse()) == []
+
+    build(deck, TITLES[:1] + TITLES[2:])
+    assert index.update(parser.parse()) == [2, 3, 4]
+    assert len(index) == 4
+    assert index.best_slide("revenue") is None
+    assert index.best_slide("closing remarks") == 4
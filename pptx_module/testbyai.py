@@ -20,6 +20,7 @@ except ImportError:
 try:
     from parser import PPTParser
     from controller import PPTController
+    from backends import make_backend
     from create import PPTCreator
 except ImportError as e:
     print(f"CRITICAL ERROR: Could not import your modules. {e}")
@@ -198,7 +199,8 @@ def main():
     controller = None
     try:
         runner.log_info("Initializing Controller...")
-        controller = PPTController()
+        # PPT_BACKEND=sim runs this phase headless (no PowerPoint)
+        controller = PPTController(make_backend(os.environ.get("PPT_BACKEND", "com")))
         
         runner.log_info("Opening presentation...")
         controller.open_presentation(absolute_path)
@@ -0,0 +1,95 @@
+"""
+Speaker index: identification throughput by enrolled speakers and embedding size.
+
+For every (speakers, dim) pair, enrolls seeded synthetic speakers (a random
+direction each, several noisy windows per enrollment), then identifies
+noisy windows of known speakers one at a time and in batches, reporting
+queries per second, p50 latency per call and top-1 accuracy. Also times
+incremental enrollment and deletion, and save() / open() of the snapshot.
+
+    python bench_speaker_index.py --speakers 10 100 1000 10000 --dims 192 256 512
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from speaker_index import SpeakerIndex
+
+NOISE = 0.6  # per-dimension noise relative to the speaker direction's (unit) scale
+
+
+def windows(centers, labels, rng):
+    """Noisy embeddings of the speakers in `labels`, as an audio window would give."""
+    dim = centers.shape[1]
+    return centers[labels] + rng.normal(0, NOISE / np.sqrt(dim), (len(labels), dim)).astype(np.float32)
+
+
+def timed(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--speakers", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    ap.add_argument("--dims", type=int, nargs="+", default=[192, 256, 512])
+    ap.add_argument("--batch", type=int, default=64, help="windows per batched search")
+    ap.add_argument("--queries", type=int, default=2048)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+
+    print(f"{'speakers':>8s} {'dim':>4s}  {'single q/s':>10s} {'p50 us':>7s}  "
+          f"{'batch q/s':>10s} {'p50 us':>8s}  {'top-1':>6s}  {'enroll us':>9s} {'delete us':>9s}  "
+          f"{'save ms':>7s} {'open ms':>7s}")
+    for dim in args.dims:
+        for n in args.speakers:
+            rng = np.random.default_rng(args.seed)
+            centers = rng.normal(size=(n, dim)).astype(np.float32)
+            centers /= np.linalg.norm(centers, axis=1, keepdims=True)
+            index = SpeakerIndex(dim)
+            for i in range(n):
+                index.enroll(f"speaker-{i}", windows(centers, [i] * 3, rng))
+
+            labels = rng.integers(0, n, args.queries)
+            queries = windows(centers, labels, rng)
+            expected = [f"speaker-{i}" for i in labels]
+
+            single = [q for q in queries[:256]]
+            it = iter(single * 4)
+            one = timed(lambda: index.identify(next(it)), len(single) * 4)
+            batches = [queries[i:i + args.batch] for i in range(0, len(queries), args.batch)]
+            it = iter(batches)
+            many = timed(lambda: index.identify(next(it)), len(batches))
+            accuracy = np.mean(np.array(index.identify(queries, threshold=-1.0)) == np.array(expected))
+
+            # Incremental enrollment of new speakers and deletion of them again
+            extra = rng.normal(size=(200, dim)).astype(np.float32)
+            it = iter(range(200))
+            enroll = timed(lambda: index.enroll(f"new-{next(it)}", extra[:3]), 200)
+            it = iter(range(200))
+            delete = timed(lambda: index.delete(f"new-{next(it)}"), 200)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "speakers.idx")
+                save = timed(lambda: index.save(path), 3)
+                opened = []
+                load = timed(lambda: opened.append(SpeakerIndex.open(path)), 3)
+                assert opened[-1].identify(queries[:32], threshold=-1.0) == index.identify(queries[:32], threshold=-1.0)
+                del opened
+
+            print(f"{n:8d} {dim:4d}  {len(one) / sum(one):10.0f} {1e6 * statistics.median(one):7.1f}  "
+                  f"{len(queries) / sum(many):10.0f} {1e6 * statistics.median(many):8.1f}  {accuracy:6.1%}  "
+                  f"{1e6 * statistics.median(enroll):9.1f} {1e6 * statistics.median(delete):9.1f}  "
+                  f"{1e3 * min(save):7.2f} {1e3 * min(load):7.2f}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+import json
+import mmap
+import os
+import struct
+import threading
+
+import numpy as np
+
+# Snapshot layout, all little-endian, each array starting on an 8-byte boundary:
+#   header   (MAGIC, version, speakers, dim, bytes of the id list)
+#   matrix   float32[speakers, dim]  unit-length centroid of each speaker
+#   norms    float32[speakers]       length of the summed enrollments
+#   counts   int32[speakers]         embeddings enrolled per speaker
+#   ids      UTF-8 JSON list of speaker ids, one per row
+MAGIC = b"SPKIDX\0\0"
+VERSION = 1
+HEADER = struct.Struct("<8sIIII")
+EPS = 1e-12
+
+
+def _align(n):
+    return -(-n // 8) * 8
+
+
+def normalize(vectors):
+    """Rows scaled to unit length (float32); all-zero rows stay zero."""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, EPS)
+
+
+class SpeakerIndex:
+    """
+    Enrolled speakers as rows of one contiguous, unit-normalized float32
+    matrix, so cosine similarity against a batch of audio windows is a
+    single matrix product.
+
+    enroll() adds embeddings to a speaker: each row is the normalized sum
+    of everything enrolled for it (the sum's length is kept in `norms`, so
+    more samples can be folded in later). delete() moves the last row into
+    the hole, keeping the matrix dense. search() returns the top-k speakers
+    for every query row. Mutations and searches share a lock, so enrolling
+    from one thread while another identifies is safe.
+
+    save() writes a snapshot that open() maps back without copying; the
+    first change after open() copies the arrays into memory. sync() keeps
+    the index in step with a PgVectorStore (or anything with its methods).
+    """
+
+    def __init__(self, dim, capacity=64):
+        self.dim = dim
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.norms = np.zeros(capacity, dtype=np.float32)
+        self.counts = np.zeros(capacity, dtype=np.int32)
+        self.ids = []
+        self.rows = {}
+        self.lock = threading.Lock()
+        # Local changes not yet pushed to a store (speaker id -> edit number, so a
+        # change made while a sync is pushing stays pending), and the store's
+        # clock at the last pull
+        self.dirty = {}
+        self.deleted = {}
+        self.edits = 0
+        self.synced_at = None
+        self._mmap = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, speaker_id):
+        return speaker_id in self.rows
+
+    # --- Storage ---
+    def _reserve(self, n):
+        """Room for `n` rows in writable arrays, growing capacity by doubling."""
+        capacity = max(len(self.matrix), 1)
+        if n <= len(self.matrix) and self.matrix.flags.writeable:
+            return
+        while capacity < n:
+            capacity *= 2
+        size = len(self.ids)
+        for name in ("matrix", "norms", "counts"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:size] = old[:size]
+            setattr(self, name, new)
+        self._mmap = None
+
+    def _set(self, speaker_id, total, count):
+        """Store the summed embedding `total` for a speaker, adding a row if it is new."""
+        row = self.rows.get(speaker_id)
+        if row is None:
+            row = len(self.ids)
+            self._reserve(row + 1)
+            self.ids.append(speaker_id)
+            self.rows[speaker_id] = row
+        else:
+            self._reserve(len(self.ids))
+        norm = float(np.linalg.norm(total))
+        self.matrix[row] = total / max(norm, EPS)
+        self.norms[row] = norm
+        self.counts[row] = count
+
+    def _remove(self, speaker_id):
+        row = self.rows.pop(speaker_id)
+        last = len(self.ids) - 1
+        self._reserve(last + 1)
+        if row != last:
+            moved = self.ids[last]
+            self.matrix[row] = self.matrix[last]
+            self.norms[row] = self.norms[last]
+            self.counts[row] = self.counts[last]
+            self.ids[row] = moved
+            self.rows[moved] = row
+        self.ids.pop()
+
+    # --- Enrollment ---
+    def enroll(self, speaker_id, embeddings):
+        """
+        Add one embedding (dim,) or a batch (n, dim) to `speaker_id`,
+        enrolling it if it is new; returns how many it now has. Embeddings
+        are normalized first, so every window weighs the same.
+        """
+        embeddings = normalize(np.reshape(embeddings, (-1, self.dim)))
+        with self.lock:
+            row = self.rows.get(speaker_id)
+            total = embeddings.sum(axis=0)
+            count = len(embeddings)
+            if row is not None:
+                total += self.matrix[row] * self.norms[row]
+                count += int(self.counts[row])
+            self._set(speaker_id, total, count)
+            self.edits += 1
+            self.dirty[speaker_id] = self.edits
+            self.deleted.pop(speaker_id, None)
+        return count
+
+    def delete(self, speaker_id):
+        """Forget a speaker; KeyError if it isn't enrolled."""
+        with self.lock:
+            self._remove(speaker_id)
+            self.edits += 1
+            self.dirty.pop(speaker_id, None)
+            self.deleted[speaker_id] = self.edits
+
+    def centroid(self, speaker_id):
+        """The unit-length embedding a speaker is matched against."""
+        with self.lock:
+            return self.matrix[self.rows[speaker_id]].copy()
+
+    # --- Search ---
+    def search(self, queries, k=1):
+        """
+        Top-k speakers by cosine similarity for each query row: (ids, scores),
+        a list of id lists and a (queries, k) float32 array, best first. k is
+        capped at the number of enrolled speakers.
+        """
+        queries = normalize(np.reshape(queries, (-1, self.dim)))
+        with self.lock:
+            n = len(self.ids)
+            k = min(k, n)
+            if k == 0:
+                return [[] for _ in queries], np.zeros((len(queries), 0), dtype=np.float32)
+            scores = queries @ self.matrix[:n].T
+            ids = self.ids
+            if k < n:
+                top = np.argpartition(scores, n - k, axis=1)[:, n - k:]
+            else:
+                top = np.broadcast_to(np.arange(n), scores.shape)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            return [[ids[i] for i in row] for row in top], np.take_along_axis(top_scores, order, axis=1)
+
+    def identify(self, queries, threshold=0.5):
+        """Best speaker id per query row, or None where the best score is under `threshold`."""
+        ids, scores = self.search(queries, k=1)
+        return [row[0] if row and score[0] >= threshold else None for row, score in zip(ids, scores)]
+
+    # --- Snapshot ---
+    def save(self, path):
+        """Write a snapshot; it replaces `path` atomically, so indexes mapping the old one keep working."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with self.lock:
+            n = len(self.ids)
+            ids = json.dumps(self.ids, ensure_ascii=False).encode("utf-8")
+            arrays = [self.matrix[:n], self.norms[:n], self.counts[:n]]
+            with open(tmp, "wb") as f:
+                header = HEADER.pack(MAGIC, VERSION, n, self.dim, len(ids))
+                f.write(header + b"\0" * (_align(len(header)) - len(header)))
+                for array in arrays:
+                    data = np.ascontiguousarray(array, dtype=array.dtype.newbyteorder("<")).tobytes()
+                    f.write(data + b"\0" * (_align(len(data)) - len(data)))
+                f.write(ids)
+        os.replace(tmp, path)
+
+    @classmethod
+    def open(cls, path):
+        """Map a snapshot written by save(); the arrays are read-only views of the file until changed."""
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, n, dim, ids_bytes = HEADER.unpack_from(mm)
+        if magic != MAGIC or version != VERSION:
+            mm.close()
+            raise ValueError(f"{path} is not a version {VERSION} speaker index")
+        offset = _align(HEADER.size)
+
+        def take(dtype, count):
+            nonlocal offset
+            array = np.frombuffer(mm, dtype=dtype, count=count, offset=offset)
+            offset += _align(array.nbytes)
+            return array
+
+        index = cls(dim, capacity=1)
+        index.matrix = take("<f4", n * dim).reshape(n, dim)
+        index.norms = take("<f4", n)
+        index.counts = take("<i4", n)
+        index.ids = json.loads(bytes(mm[offset:offset + ids_bytes]).decode("utf-8"))
+        index.rows = {speaker_id: row for row, speaker_id in enumerate(index.ids)}
+        index._mmap = mm
+        return index
+
+    # --- pgvector ---
+    def sync(self, store):
+        """
+        Push local enrollments and deletions to `store`, then pull the rows
+        it changed since the last sync and drop speakers it no longer has.
+        Returns (pushed, pulled, removed) counts.
+
+        Changes count as pushed only once the store accepted them, so a
+        failed sync leaves them pending for the next one. A pulled row never
+        overwrites a speaker with local changes still pending: the next
+        push sends the local version.
+        """
+        with self.lock:
+            dirty, deleted = dict(self.dirty), dict(self.deleted)
+            rows = [(sid, self.matrix[self.rows[sid]] * self.norms[self.rows[sid]],
+                     int(self.counts[self.rows[sid]])) for sid in sorted(dirty)]
+        if deleted:
+            store.delete(sorted(deleted))
+            self._pushed(self.deleted, deleted)
+        if rows:
+            store.upsert(rows)
+            self._pushed(self.dirty, dirty)
+        pulled = 0
+        for speaker_id, total, count, updated in store.changes(self.synced_at):
+            with self.lock:
+                if speaker_id not in self.dirty and speaker_id not in self.deleted:
+                    self._set(speaker_id, np.asarray(total, dtype=np.float32), count)
+                    pulled += 1
+            self.synced_at = updated if self.synced_at is None else max(self.synced_at, updated)
+        remote = set(store.ids())
+        with self.lock:
+            removed = [sid for sid in self.ids if sid not in remote and sid not in self.dirty]
+            for speaker_id in removed:
+                self._remove(speaker_id)
+        return len(rows) + len(deleted), pulled, len(removed)
+
+    def _pushed(self, pending, pushed):
+        """Drop pushed changes from `pending`, unless the speaker changed again since."""
+        with self.lock:
+            for speaker_id, edit in pushed.items():
+                if pending.get(speaker_id) == edit:
+                    del pending[speaker_id]
+
+
+class PgVectorStore:
+    """
+    Speaker embeddings in PostgreSQL with the pgvector extension, one row
+    per speaker: the summed (unnormalized) embedding, which pgvector's
+    cosine operators treat like the centroid, and the sample count. Needs
+    psycopg 3; the table is created on first use.
+    """
+
+    def __init__(self, dsn, dim, table="speaker_embeddings"):
+        import psycopg  # only needed when the database is in use
+        from psycopg import sql
+        self.dim = dim
+        self.conn = psycopg.connect(dsn, autocommit=True)
+        self.table = sql.Identifier(table)
+        self.sql = sql
+        self.conn.execute("CREATE EXTENSION IF NOT EXISTS vector")
+        self.conn.execute(sql.SQL(
+            "CREATE TABLE IF NOT EXISTS {} (speaker_id text PRIMARY KEY, embedding vector({}) NOT NULL, "
+            "samples integer NOT NULL, updated_at timestamptz NOT NULL DEFAULT clock_timestamp())"
+        ).format(self.table, sql.Literal(dim)))
+
+    @staticmethod
+    def _vector(values):
+        return "[" + ",".join(f"{v:.8g}" for v in values) + "]"
+
+    def upsert(self, rows):
+        """rows: (speaker_id, summed embedding, samples)."""
+        with self.conn.cursor() as cur:
+            cur.executemany(self.sql.SQL(
+                "INSERT INTO {} (speaker_id, embedding, samples) VALUES (%s, %s::vector, %s) "
+                "ON CONFLICT (speaker_id) DO UPDATE SET embedding = excluded.embedding, "
+                "samples = excluded.samples, updated_at = clock_timestamp()"
+            ).format(self.table), [(sid, self._vector(total), count) for sid, total, count in rows])
+
+    def delete(self, speaker_ids):
+        self.conn.execute(self.sql.SQL("DELETE FROM {} WHERE speaker_id = ANY(%s)").format(self.table),
+                          (list(speaker_ids),))
+
+    def changes(self, since=None):
+        """(speaker_id, summed embedding, samples, updated_at) changed after `since`, oldest first."""
+        rows = self.conn.execute(self.sql.SQL(
+            "SELECT speaker_id, embedding::text, samples, updated_at FROM {} "
+            "WHERE %s::timestamptz IS NULL OR updated_at > %s ORDER BY updated_at"
+        ).format(self.table), (since, since))
+        for speaker_id, embedding, samples, updated in rows:
+            yield speaker_id, np.array(json.loads(embedding), dtype=np.float32), samples, updated
+
+    def ids(self):
+        return [row[0] for row in self.conn.execute(self.sql.SQL("SELECT speaker_id FROM {}").format(self.table))]
+
+    def search(self, embedding, k=1):
+        """Server-side top-k by cosine similarity, for when no local index is loaded: [(id, score)]."""
+        vector = self._vector(normalize(embedding))
+        return self.conn.execute(self.sql.SQL(
+            "SELECT speaker_id, 1 - (embedding <=> %s::vector) FROM {} ORDER BY embedding <=> %s::vector LIMIT %s"
+        ).format(self.table), (vector, vector, k)).fetchall()
+
+    def close(self):
+        self.conn.close()
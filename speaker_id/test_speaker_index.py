@@ -0,0 +1,106 @@
+"""
+SpeakerIndex.sync against an in-memory store, no database needed.
+
+    python -m pytest test_speaker_index.py
+"""
+import numpy as np
+import pytest
+
+from speaker_index import SpeakerIndex
+
+DIM = 8
+
+
+class MemoryStore:
+    """The PgVectorStore methods over a dict; `fail` makes the next push raise."""
+
+    def __init__(self):
+        self.rows = {}
+        self.clock = 0
+        self.fail = False
+
+    def _check(self):
+        if self.fail:
+            raise ConnectionError("database unavailable")
+
+    def upsert(self, rows):
+        self._check()
+        for speaker_id, total, count in rows:
+            self.clock += 1
+            self.rows[speaker_id] = (np.array(total), count, self.clock)
+
+    def delete(self, speaker_ids):
+        self._check()
+        for speaker_id in speaker_ids:
+            self.rows.pop(speaker_id, None)
+
+    def changes(self, since=None):
+        return [(sid, total, count, at) for sid, (total, count, at) in sorted(self.rows.items(), key=lambda r: r[1][2])
+                if since is None or at > since]
+
+    def ids(self):
+        return list(self.rows)
+
+
+def embedding(seed):
+    return np.random.default_rng(seed).normal(size=DIM)
+
+
+def test_sync_pushes_and_pulls():
+    store = MemoryStore()
+    a, b = SpeakerIndex(DIM), SpeakerIndex(DIM)
+    a.enroll("alice", embedding(1))
+    assert a.sync(store) == (1, 1, 0)
+    assert b.sync(store) == (0, 1, 0)
+    assert np.allclose(b.centroid("alice"), a.centroid("alice"))
+
+
+def test_failed_sync_keeps_changes_for_the_retry():
+    store = MemoryStore()
+    index = SpeakerIndex(DIM)
+    index.enroll("alice", embedding(1))
+    store.fail = True
+    with pytest.raises(ConnectionError):
+        index.sync(store)
+    store.fail = False
+    assert index.sync(store) == (1, 1, 0)
+    assert index.ids == ["alice"]
+    assert "alice" in store.rows
+
+
+def test_failed_sync_keeps_deletions_for_the_retry():
+    store = MemoryStore()
+    index = SpeakerIndex(DIM)
+    index.enroll("alice", embedding(1))
+    index.sync(store)
+    index.delete("alice")
+    store.fail = True
+    with pytest.raises(ConnectionError):
+        index.sync(store)
+    store.fail = False
+    index.sync(store)
+    assert "alice" not in store.rows
+
+
+def test_pull_does_not_overwrite_enrollment_made_during_sync():
+    store = MemoryStore()
+    a, b = SpeakerIndex(DIM), SpeakerIndex(DIM)
+    a.enroll("alice", embedding(1))
+    a.sync(store)
+    b.sync(store)
+    a.enroll("alice", embedding(3))
+    a.sync(store)
+    changes = store.changes
+
+    def enroll_meanwhile(since=None):
+        b.enroll("alice", embedding(2))  # another thread, while b pulls
+        return changes(since)
+
+    store.changes = enroll_meanwhile
+    assert b.sync(store) == (0, 0, 0)
+    local = b.centroid("alice")
+    assert b.counts[b.rows["alice"]] == 2
+    store.changes = changes
+    b.sync(store)  # the local version is pushed, not replaced
+    assert np.allclose(b.centroid("alice"), local)
+    assert store.rows["alice"][1] == 2